@@ -1,11 +1,17 @@
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import chess
-import math
+import threading
+import queue
+import time
+import chess_engine as engine
+import chess_state
+from chess_engine import best_move_for_ai, search_info, stop_search, set_search_deadline, clear_stop
 # -----------------------------
 # CONFIG
 # -----------------------------
-AI_DEPTH = 2                 
+AI_TIME_MS = engine.AI_TIME_MS
+AI_PLAYER = "minimax"          # or "mcts": Monte Carlo tree search (chess_state.py)
 SQUARE_SIZE = 72
 SELECT_COLOR = "#FFD54F"
 LEGAL_MOVE_COLOR = "#90CAF9"
@@ -14,81 +20,6 @@ DARK_COLOR = "#B58863"
 FONT_FAMILY = "Segoe UI Symbol"   
 FONT_SIZE = 40
 # -----------------------------
-# EVALUATION / AI (Minimax + Alpha-Beta)
-# -----------------------------
-piece_values = {
-    chess.PAWN: 100,
-    chess.KNIGHT: 320,
-    chess.BISHOP: 330,
-    chess.ROOK: 500,
-    chess.QUEEN: 900,
-    chess.KING: 20000
-}
-
-def evaluate_board(board):
-    score = 0
-    for pt, val in piece_values.items():
-        score += val * len(board.pieces(pt, chess.BLACK))
-        score -= val * len(board.pieces(pt, chess.WHITE))
-    return score
-
-def evaluate_terminal(board, depth):
-    if board.is_checkmate():
-        winner_is_black = (board.turn == chess.WHITE)
-        if winner_is_black:
-            return 5000 - depth   
-        else:
-            return -5000 + depth  
-    if board.is_stalemate() or board.is_insufficient_material() or board.can_claim_draw():
-        return 0
-    return None
-
-def minimax(board, depth, alpha, beta, maximizing_player):
-    term = evaluate_terminal(board, depth)
-    if term is not None:
-        return term
-    if depth == 0:
-        return evaluate_board(board)
-
-    if maximizing_player:
-        max_eval = -math.inf
-        for mv in board.legal_moves:
-            board.push(mv)
-            val = minimax(board, depth-1, alpha, beta, False)
-            board.pop()
-            if val > max_eval:
-                max_eval = val
-            if val > alpha:
-                alpha = val
-            if beta <= alpha:
-                break
-        return max_eval
-    else:
-        min_eval = math.inf
-        for mv in board.legal_moves:
-            board.push(mv)
-            val = minimax(board, depth-1, alpha, beta, True)
-            board.pop()
-            if val < min_eval:
-                min_eval = val
-            if val < beta:
-                beta = val
-            if beta <= alpha:
-                break
-        return min_eval
-
-def best_move_for_ai(board, depth=AI_DEPTH):
-    best_mv = None
-    best_score = -math.inf
-    for mv in board.legal_moves:
-        board.push(mv)
-        score = minimax(board, depth-1, -math.inf, math.inf, False)
-        board.pop()
-        if score > best_score:
-            best_score = score
-            best_mv = mv
-    return best_mv
-# -----------------------------
 # GLOBAL STATE (procedural style)
 # -----------------------------
 board = chess.Board()
@@ -96,12 +27,19 @@ selected_square = None
 legal_destinations = []
 
 # Tkinter setup
-root = tk.Tk()
-root.title("Human vs AI Chess (procedural)")
-canvas = tk.Canvas(root, width=8*SQUARE_SIZE, height=8*SQUARE_SIZE, highlightthickness=0)
-canvas.pack()
-status_lbl = tk.Label(root, text="You: White  —  AI: Black", font=("Arial", 12))
-status_lbl.pack(fill="x")
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Human vs AI Chess (procedural)")
+    canvas = tk.Canvas(root, width=8*SQUARE_SIZE, height=8*SQUARE_SIZE, highlightthickness=0)
+    canvas.pack()
+    status_lbl = tk.Label(root, text="You: White  —  AI: Black", font=("Arial", 12))
+    status_lbl.pack(fill="x")
+    info_frame = tk.Frame(root)
+    info_frame.pack(fill="x")
+    info_lbl = tk.Label(info_frame, text="", font=("Consolas", 10), anchor="w")
+    info_lbl.pack(side="left", fill="x", expand=True)
+    move_now_btn = tk.Button(info_frame, text="Move now", command=lambda: move_now(), state="disabled")
+    move_now_btn.pack(side="right")
 
 # piece symbols
 piece_symbols = {
@@ -123,34 +61,84 @@ def coord_to_square(x, y):
         return chess.square(col, row)
     return None
 
-def draw_board():
-    canvas.delete("all")
-    for r in range(8):
-        for c in range(8):
-            sq = chess.square(c, 7-r)
-            x1 = c * SQUARE_SIZE
-            y1 = r * SQUARE_SIZE
-            x2 = x1 + SQUARE_SIZE
-            y2 = y1 + SQUARE_SIZE
-            color = LIGHT_COLOR if (r + c) % 2 == 0 else DARK_COLOR
-            if selected_square == sq:
-                color = SELECT_COLOR
-            elif sq in legal_destinations:
-                color = LEGAL_MOVE_COLOR
-            canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-
-            piece = board.piece_at(sq)
-            if piece:
-                sym = piece_symbols[piece.piece_type][0 if piece.color == chess.WHITE else 1]
-                fillcol = "black" if (r + c) % 2 == 0 else "white"
-                canvas.create_text(x1 + SQUARE_SIZE//2, y1 + SQUARE_SIZE//2,
-                                   text=sym, font=(FONT_FAMILY, FONT_SIZE), fill=fillcol)
+# The canvas keeps one rectangle and one glyph item per square, created
+# once; draw_board() only reconfigures squares whose colour or piece changed.
+square_items = {}
+piece_items = {}
+drawn = {}      # square -> (fill colour, glyph) currently on the canvas
+redraw_stats = {"redraws": 0, "updated": 0, "ms": 0.0}
+
+def square_xy(sq):
+    return chess.square_file(sq) * SQUARE_SIZE, (7 - chess.square_rank(sq)) * SQUARE_SIZE
+
+def is_light(sq):
+    return (chess.square_file(sq) + chess.square_rank(sq)) % 2 == 1
+
+def square_state(sq):
+    color = LIGHT_COLOR if is_light(sq) else DARK_COLOR
+    if selected_square == sq:
+        color = SELECT_COLOR
+    elif sq in legal_destinations:
+        color = LEGAL_MOVE_COLOR
+    piece = board.piece_at(sq)
+    sym = piece_symbols[piece.piece_type][0 if piece.color == chess.WHITE else 1] if piece else ""
+    return color, sym
 
+def create_board_items():
+    for sq in chess.SQUARES:
+        x1, y1 = square_xy(sq)
+        square_items[sq] = canvas.create_rectangle(x1, y1, x1 + SQUARE_SIZE, y1 + SQUARE_SIZE, outline="")
+    for sq in chess.SQUARES:
+        x1, y1 = square_xy(sq)
+        fillcol = "black" if is_light(sq) else "white"
+        piece_items[sq] = canvas.create_text(x1 + SQUARE_SIZE//2, y1 + SQUARE_SIZE//2, text="",
+                                             font=(FONT_FAMILY, FONT_SIZE), fill=fillcol)
     # optional: file letters (a-h) at bottom
     for i, ch in enumerate("abcdefgh"):
         x = i * SQUARE_SIZE + 4
         y = 8 * SQUARE_SIZE - 14
         canvas.create_text(x, y, text=ch, anchor="w", font=("Arial", 9))
+
+def draw_board(squares=None):
+    # squares: the ones that may have changed (None = check all 64)
+    start = time.perf_counter()
+    if not square_items:
+        create_board_items()
+    updated = 0
+    for sq in (chess.SQUARES if squares is None else squares):
+        state = square_state(sq)
+        old = drawn.get(sq, (None, None))
+        if state == old:
+            continue
+        if state[0] != old[0]:
+            canvas.itemconfig(square_items[sq], fill=state[0])
+        if state[1] != old[1]:
+            canvas.itemconfig(piece_items[sq], text=state[1])
+        drawn[sq] = state
+        updated += 1
+    redraw_stats["redraws"] += 1
+    redraw_stats["updated"] += updated
+    redraw_stats["ms"] += (time.perf_counter() - start) * 1000
+
+def move_squares(mv):
+    # squares mv changes, including en-passant victims and castling rooks;
+    # call before board.push(mv)
+    squares = {mv.from_square, mv.to_square}
+    if board.is_en_passant(mv):
+        squares.add(chess.square(chess.square_file(mv.to_square), chess.square_rank(mv.from_square)))
+    elif board.is_castling(mv):
+        rank = chess.square_rank(mv.from_square)
+        if board.is_kingside_castling(mv):
+            squares |= {chess.square(7, rank), chess.square(5, rank)}
+        else:
+            squares |= {chess.square(0, rank), chess.square(3, rank)}
+    return squares
+
+def highlight_squares():
+    squares = set(legal_destinations)
+    if selected_square is not None:
+        squares.add(selected_square)
+    return squares
 # -----------------------------
 # Result display
 # -----------------------------
@@ -171,7 +159,7 @@ def show_result():
 def on_click(event):
     global selected_square, legal_destinations
     sq = coord_to_square(event.x, event.y)
-    if sq is None:
+    if sq is None or board.turn != chess.WHITE or board.is_game_over():
         return
 
     # select a white piece if none selected
@@ -181,7 +169,7 @@ def on_click(event):
             selected_square = sq
             # gather legal destinations for highlight
             legal_destinations = [mv.to_square for mv in board.legal_moves if mv.from_square == sq]
-            draw_board()
+            draw_board(highlight_squares())
     else:
         # attempt move selected_square -> sq (handle promotion)
         mv = None
@@ -196,42 +184,145 @@ def on_click(event):
             mv = chess.Move(selected_square, sq)
 
         if mv in board.legal_moves:
+            changed = move_squares(mv) | highlight_squares()
             board.push(mv)
             # reset selection
             selected_square = None
             legal_destinations = []
-            draw_board()
+            draw_board(changed)
             root.update_idletasks()
             # check game over after human move
             if board.is_game_over():
                 show_result()
                 return
             # AI move
-            root.after(200, do_ai_move)
+            do_ai_move(mv)
         else:
             # cancel selection
+            changed = highlight_squares()
             selected_square = None
             legal_destinations = []
-            draw_board()
+            draw_board(changed)
 # -----------------------------
-# AI move
+# AI move (background search thread)
 # -----------------------------
-def do_ai_move():
-    global board
+# The engine runs in a worker thread on a copy of the board and reports
+# through search_queue, which the Tk loop polls with after(). Every search
+# gets a job id so results of abandoned ponder searches are ignored.
+search_queue = queue.Queue()
+search_thread = None
+search_job = 0
+ponder_move = None      # human reply the running ponder search assumes
+ponder_result = None    # move found by a ponder search that already finished
+thinking = False        # True while the AI is searching for its own move
+
+def start_search(position, time_ms):
+    global search_thread, search_job
+    search_job += 1
+    job = search_job
+
+    def run():
+        engine.search_listener = lambda info: search_queue.put(("info", job, info))
+        if AI_PLAYER == "mcts":
+            mv = chess_state.mcts_move(position, time_ms)
+            search_queue.put(("info", job, dict(chess_state.mcts.info)))
+        else:
+            mv = best_move_for_ai(position, time_ms=time_ms)
+        search_queue.put(("done", job, mv))
+
+    clear_stop()
+    search_thread = threading.Thread(target=run, daemon=True)
+    search_thread.start()
+
+def move_now():
+    stop_search()
+    chess_state.mcts.stop()
+
+def cancel_search():
+    global search_job
+    if search_thread is not None and search_thread.is_alive():
+        move_now()
+        search_thread.join()
+    search_job += 1
+
+def start_pondering():
+    # search the position after the human reply we expect (2nd PV move)
+    global ponder_move, ponder_result
+    ponder_move = ponder_result = None
+    if AI_PLAYER == "mcts":
+        return      # MCTS keeps its tree between moves instead
+    pv = search_info.get("pv", [])
+    if len(pv) < 2 or board.is_game_over() or pv[1] not in board.legal_moves:
+        return
+    ponder_move = pv[1]
+    position = board.copy()
+    position.push(ponder_move)
+    start_search(position, None)
+    info_lbl.config(text=f"pondering on {ponder_move.uci()} ...")
+
+def do_ai_move(human_mv):
+    global thinking, ponder_move
     if board.is_game_over():
+        cancel_search()
         show_result()
         return
-    mv = best_move_for_ai(board, depth=AI_DEPTH)
+    thinking = True
+    move_now_btn.config(state="normal")
+    if ponder_move is not None and human_mv == ponder_move:
+        # ponder hit: keep the running search and start its clock
+        ponder_move = None
+        if ponder_result is not None:
+            play_ai_move(ponder_result)
+            return
+        set_search_deadline(AI_TIME_MS)
+    else:
+        ponder_move = None
+        cancel_search()
+        start_search(board.copy(), AI_TIME_MS)
+
+def play_ai_move(mv):
+    global thinking
+    thinking = False
+    move_now_btn.config(state="disabled")
     if mv:
+        changed = move_squares(mv)
         board.push(mv)
-        draw_board()
+        draw_board(changed)
         if board.is_game_over():
             show_result()
+            return
+        start_pondering()
     else:
         show_result()
+
+def format_info(info):
+    best = info["pv"][0].uci() if info.get("pv") else "-"
+    if "playouts" in info:
+        return f"playouts {info['playouts']}  win {100 * info['win_rate']:.0f}%  best {best}"
+    return f"depth {info['depth']}  nodes {info['nodes']}  nps {info['nps']}  best {best}"
+
+def poll_search():
+    global ponder_result
+    try:
+        while True:
+            kind, job, payload = search_queue.get_nowait()
+            if job != search_job:
+                continue
+            if kind == "info":
+                prefix = "thinking: " if thinking else f"pondering on {ponder_move.uci()}: " if ponder_move else ""
+                info_lbl.config(text=prefix + format_info(payload))
+            elif thinking:
+                play_ai_move(payload)
+            else:
+                ponder_result = payload
+    except queue.Empty:
+        pass
+    root.after(50, poll_search)
 # -----------------------------
 # Bind & Start
 # -----------------------------
-canvas.bind("<Button-1>", on_click)
-draw_board()
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    canvas.bind("<Button-1>", on_click)
+    draw_board()
+    poll_search()
+    root.mainloop()
\ No newline at end of file
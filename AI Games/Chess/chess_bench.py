@@ -0,0 +1,225 @@
+# Engine benchmark: runs chess_engine.best_move_for_ai over an EPD suite at
+# fixed depths and fixed move times and records nodes, nps, time-to-depth,
+# effective branching factor and best-move accuracy (EPD "bm" tags).
+#   python chess_bench.py --depths 3,4 --movetime 1000 --out run.json
+#   python chess_bench.py --baseline run.json --max-regression 10
+#   python chess_bench.py --depths "" --movetime 0 --eval-repeat 20
+# Exits with status 1 when nps drops more than --max-regression percent
+# below the baseline run.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import chess
+import chess_engine as engine
+
+DEFAULT_SUITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench.epd")
+
+def load_suite(path):
+    positions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            board, ops = chess.Board.from_epd(line)
+            positions.append({"id": ops.get("id", board.fen()), "fen": board.fen(),
+                              "bm": [mv.uci() for mv in ops.get("bm", [])]})
+    return positions
+
+def effective_branching_factor(iterations):
+    # geometric mean of nodes(d) / nodes(d-1) over the completed iterations
+    nodes = [n for _, _, n in iterations if n > 0]
+    if len(nodes) < 2:
+        return None
+    return (nodes[-1] / nodes[0]) ** (1.0 / (len(nodes) - 1))
+
+def run_position(pos, time_ms, max_depth, workers):
+    engine.tt_clear()
+    engine.pawn_stats["probes"] = engine.pawn_stats["hits"] = 0
+    board = chess.Board(pos["fen"])
+    start = time.perf_counter()
+    mv = engine.best_move_for_ai(board, time_ms=time_ms, max_depth=max_depth, workers=workers)
+    elapsed = time.perf_counter() - start
+    nodes = engine.search_stats["nodes"] + engine.search_stats["qnodes"]
+    iterations = engine.search_info.get("iterations", [])
+    return {
+        "id": pos["id"],
+        "move": mv.uci() if mv else None,
+        "correct": (mv.uci() in pos["bm"]) if pos["bm"] and mv else None,
+        "depth": engine.search_info.get("depth", 0),
+        "score": engine.search_info.get("score"),
+        "nodes": engine.search_stats["nodes"],
+        "qnodes": engine.search_stats["qnodes"],
+        "time": elapsed,
+        "nps": int(nodes / elapsed) if elapsed > 0 else 0,
+        "time_to_depth": {str(d): t for d, t, _ in iterations},
+        "ebf": effective_branching_factor(iterations),
+        "pawn_hit_rate": engine.pawn_hash_hit_rate(),
+    }
+
+def summarize(results):
+    nodes = sum(r["nodes"] + r["qnodes"] for r in results)
+    secs = sum(r["time"] for r in results)
+    scored = [r["correct"] for r in results if r["correct"] is not None]
+    ebfs = [r["ebf"] for r in results if r["ebf"]]
+    pawn = [r["pawn_hit_rate"] for r in results if r.get("pawn_hit_rate")]
+    return {
+        "positions": len(results),
+        "nodes": nodes,
+        "time": secs,
+        "nps": int(nodes / secs) if secs > 0 else 0,
+        "avg_depth": sum(r["depth"] for r in results) / len(results) if results else 0,
+        "avg_ebf": sum(ebfs) / len(ebfs) if ebfs else None,
+        "pawn_hit_rate": sum(pawn) / len(pawn) if pawn else None,
+        "solved": sum(scored),
+        "with_bm": len(scored),
+    }
+
+def run_suite(positions, depths, movetime, workers):
+    runs = []
+    for w in workers:
+        for d in depths:
+            results = [run_position(p, None, d, w) for p in positions]
+            runs.append({"mode": "depth", "depth": d, "workers": w,
+                         "results": results, "summary": summarize(results)})
+        if movetime:
+            results = [run_position(p, movetime, engine.AI_MAX_DEPTH, w) for p in positions]
+            runs.append({"mode": "movetime", "movetime": movetime, "workers": w,
+                         "results": results, "summary": summarize(results)})
+    return runs
+
+def material_score(board):
+    # the material-only baseline evaluation
+    score = 0
+    for pt, val in engine.piece_values.items():
+        score += val * (chess.popcount(board.pieces_mask(pt, chess.BLACK)) -
+                        chess.popcount(board.pieces_mask(pt, chess.WHITE)))
+    return score
+
+def bench_eval(positions, repeat):
+    # cost per call of each evaluation, over the suite positions and their children
+    boards = []
+    for pos in positions:
+        board = chess.Board(pos["fen"])
+        boards.append(board.copy())
+        for mv in board.legal_moves:
+            board.push(mv)
+            boards.append(board.copy())
+            board.pop()
+    states = [engine.evaluate_state(b) for b in boards]
+    evaluators = [
+        ("material", lambda b, st: material_score(b)),
+        ("pst (incremental)", lambda b, st: engine.tapered_score(*st)),
+        ("pst (rescan)", lambda b, st: engine.evaluate_board(b)),
+        ("pawns (cached)", lambda b, st: engine.probe_pawn_structure(
+            b.pawns & b.occupied_co[chess.WHITE], b.pawns & b.occupied_co[chess.BLACK])),
+        ("pawns (uncached)", lambda b, st: engine.pawn_structure(
+            b.pawns & b.occupied_co[chess.WHITE], b.pawns & b.occupied_co[chess.BLACK])),
+        ("pst + positional", lambda b, st: engine.tapered_score(*st) + engine.positional_score(b, st[2])),
+    ]
+    engine.pawn_stats["probes"] = engine.pawn_stats["hits"] = 0
+    results = {}
+    for name, fn in evaluators:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for b, st in zip(boards, states):
+                fn(b, st)
+        calls = repeat * len(boards)
+        results[name] = 1e6 * (time.perf_counter() - start) / calls
+    base = results["material"]
+    print(f"eval cost over {len(boards)} positions x {repeat}:")
+    for name, us in results.items():
+        print(f"  {name:>18}: {us:6.2f} us/eval ({us / base:.1f}x material)")
+    print(f"  pawn hash hit rate {100 * engine.pawn_hash_hit_rate():.1f}%")
+    return {"positions": len(boards), "repeat": repeat, "us_per_eval": results,
+            "pawn_hit_rate": engine.pawn_hash_hit_rate()}
+
+def run_key(run):
+    return (run["mode"], run.get("depth"), run.get("movetime"), run["workers"])
+
+def compare(runs, baseline, max_regression):
+    # returns a list of (run key, baseline nps, current nps, change %) that regressed
+    base = {run_key(r): r["summary"]["nps"] for r in baseline["runs"]}
+    failures = []
+    for run in runs:
+        old = base.get(run_key(run))
+        if not old:
+            continue
+        new = run["summary"]["nps"]
+        change = 100.0 * (new - old) / old
+        print(f"  {run_key(run)}: nps {old} -> {new} ({change:+.1f}%)")
+        if change < -max_regression:
+            failures.append((run_key(run), old, new, change))
+    return failures
+
+def print_run(run):
+    s = run["summary"]
+    label = f"depth {run['depth']}" if run["mode"] == "depth" else f"movetime {run['movetime']} ms"
+    ebf = f"{s['avg_ebf']:.2f}" if s["avg_ebf"] else "-"
+    pawn = f"{100 * s['pawn_hit_rate']:.0f}%" if s.get("pawn_hit_rate") else "-"
+    print(f"{label:>16}  workers {run['workers']}  nodes {s['nodes']:>9}  time {s['time']:7.2f}s  "
+          f"nps {s['nps']:>7}  avg depth {s['avg_depth']:.1f}  ebf {ebf}  bm {s['solved']}/{s['with_bm']}  "
+          f"pawn hash {pawn}")
+
+def print_scaling(runs):
+    # speedup and efficiency of each worker count against the 1-worker run
+    single = {run_key(r)[:3]: r["summary"]["time"] for r in runs if r["workers"] == 1 and r["mode"] == "depth"}
+    for run in runs:
+        base = single.get(run_key(run)[:3])
+        if run["mode"] != "depth" or run["workers"] == 1 or not base:
+            continue
+        speedup = base / run["summary"]["time"]
+        print(f"  depth {run['depth']} workers {run['workers']}: speedup {speedup:.2f}, "
+              f"efficiency {100 * speedup / run['workers']:.0f}%")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark chess_engine on an EPD suite")
+    parser.add_argument("--suite", default=DEFAULT_SUITE, help="EPD file (bm tags are optional)")
+    parser.add_argument("--depths", default="1,2,3,4", help="comma-separated fixed depths")
+    parser.add_argument("--movetime", type=int, default=1000, help="ms per position for the timed run (0 = skip)")
+    parser.add_argument("--workers", default="1", help="comma-separated worker counts, e.g. 1,2,4,8")
+    parser.add_argument("--eval-repeat", type=int, default=0, help="passes of the evaluation cost benchmark (0 = skip)")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare nps against")
+    parser.add_argument("--max-regression", type=float, default=10.0, help="allowed nps drop in percent")
+    args = parser.parse_args(argv)
+
+    engine.open_book(None)
+    engine.open_tablebase(None)
+    positions = load_suite(args.suite)
+    depths = [int(d) for d in args.depths.split(",") if d]
+    workers = [int(w) for w in args.workers.split(",") if w]
+    runs = run_suite(positions, depths, args.movetime, workers)
+    engine.shutdown_search_pool()
+    evals = bench_eval(positions, args.eval_repeat) if args.eval_repeat else None
+
+    for run in runs:
+        print_run(run)
+    if len(workers) > 1:
+        print("scaling:")
+        print_scaling(runs)
+
+    report = {"meta": {"suite": os.path.basename(args.suite), "python": platform.python_version(),
+                       "machine": platform.machine(), "cpus": os.cpu_count(),
+                       "date": time.strftime("%Y-%m-%d %H:%M:%S")},
+              "runs": runs, "eval": evals}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("against baseline:")
+        failures = compare(runs, baseline, args.max_regression)
+        if failures:
+            for key, old, new, change in failures:
+                print(f"NPS REGRESSION {key}: {old} -> {new} ({change:+.1f}%)")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
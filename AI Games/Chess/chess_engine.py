@@ -0,0 +1,1098 @@
+# Chess engine used by chess-ai.py (Tk GUI) and chess_uci.py (UCI protocol).
+# Importable without a display: call best_move_for_ai(board). The tree search
+# is the shared game_search package (PVS, null move, LMR and check extensions
+# through its optional hooks); this module provides the position (ChessState),
+# evaluation, move ordering, quiescence, transposition tables, book and
+# tablebases around it.
+import chess
+import chess.polyglot
+import chess.syzygy
+import os
+import sys
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+AI_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if AI_GAMES_DIR not in sys.path:
+    sys.path.insert(0, AI_GAMES_DIR)
+from game_search import Search, SearchTimeout, WIN, WIN_BOUND
+# -----------------------------
+# CONFIG
+# -----------------------------
+AI_TIME_MS = 2000             # thinking time per AI move
+AI_MAX_DEPTH = 32
+DELTA_MARGIN = 200            # quiescence delta pruning safety margin
+QS_SEE = True                # skip captures that lose material (static exchange)
+QS_MAX_PLY = 8               # cap on quiescence plies (check evasions)
+NULL_MOVE_MIN_DEPTH = 3      # null-move pruning from this depth on
+LMR_MIN_DEPTH = 3            # late move reductions from this depth on
+LMR_MIN_MOVES = 3            # ... for quiet moves after the first few
+SEARCH_WORKERS = 1           # processes for the root-parallel search (1 = in-process)
+POLL_NODES = 64              # clock/stop check interval in nodes (power of two), both search layers
+REPORT_SECONDS = 1.0         # progress callback interval while an iteration runs
+TT_SIZE = 1 << 18            # entries per transposition table slot (power of two)
+EVAL_POSITIONAL = True       # mobility, pawn structure and king safety on top of the PSTs
+PAWN_HASH_SIZE = 1 << 14     # pawn-structure cache entries (power of two)
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")   # Polyglot book, skipped if missing
+BOOK_BEST_MOVE = True        # play the highest-weight book move (False: weighted random)
+SYZYGY_PATH = None           # directory with Syzygy .rtbw/.rtbz files
+SYZYGY_PROBE_LIMIT = 5       # probe positions with at most this many pieces
+TB_WIN = 3000                # tablebase win score (below the mate range)
+MATE = 5000                  # mate in n plies scores MATE - n
+MATE_BOUND = 4000            # scores beyond this are mates
+INF = 100000
+# -----------------------------
+# EVALUATION / AI (Minimax + Alpha-Beta)
+# -----------------------------
+piece_values = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 20000
+}
+
+# Piece-square tables from White's point of view, a8 first (as printed).
+# Knight/bishop/rook/queen use the same table in both phases.
+PST_MG = {
+    chess.PAWN: [
+          0,   0,   0,   0,   0,   0,   0,   0,
+         50,  50,  50,  50,  50,  50,  50,  50,
+         10,  10,  20,  30,  30,  20,  10,  10,
+          5,   5,  10,  25,  25,  10,   5,   5,
+          0,   0,   0,  20,  20,   0,   0,   0,
+          5,  -5, -10,   0,   0, -10,  -5,   5,
+          5,  10,  10, -20, -20,  10,  10,   5,
+          0,   0,   0,   0,   0,   0,   0,   0],
+    chess.KNIGHT: [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50],
+    chess.BISHOP: [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20],
+    chess.ROOK: [
+          0,   0,   0,   0,   0,   0,   0,   0,
+          5,  10,  10,  10,  10,  10,  10,   5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+          0,   0,   0,   5,   5,   0,   0,   0],
+    chess.QUEEN: [
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+         -5,   0,   5,   5,   5,   5,   0,  -5,
+          0,   0,   5,   5,   5,   5,   0,  -5,
+        -10,   5,   5,   5,   5,   5,   0, -10,
+        -10,   0,   5,   0,   0,   0,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20],
+    chess.KING: [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+         20,  20,   0,   0,   0,   0,  20,  20,
+         20,  30,  10,   0,   0,  10,  30,  20],
+}
+PST_EG = dict(PST_MG)
+PST_EG[chess.PAWN] = [
+          0,   0,   0,   0,   0,   0,   0,   0,
+         80,  80,  80,  80,  80,  80,  80,  80,
+         50,  50,  50,  50,  50,  50,  50,  50,
+         30,  30,  30,  30,  30,  30,  30,  30,
+         20,  20,  20,  20,  20,  20,  20,  20,
+         10,  10,  10,  10,  10,  10,  10,  10,
+         10,  10,  10,  10,  10,  10,  10,  10,
+          0,   0,   0,   0,   0,   0,   0,   0]
+PST_EG[chess.KING] = [
+        -50, -40, -30, -20, -20, -30, -40, -50,
+        -30, -20, -10,   0,   0, -10, -20, -30,
+        -30, -10,  20,  30,  30,  20, -10, -30,
+        -30, -10,  30,  40,  40,  30, -10, -30,
+        -30, -10,  30,  40,  40,  30, -10, -30,
+        -30, -10,  20,  30,  30,  20, -10, -30,
+        -30, -30,   0,   0,   0,   0, -30, -30,
+        -50, -30, -30, -30, -30, -30, -30, -50]
+
+# game phase: 24 with all minor/major pieces on the board, 0 in a pawn ending
+PHASE_WEIGHTS = {chess.PAWN: 0, chess.KNIGHT: 1, chess.BISHOP: 1, chess.ROOK: 2, chess.QUEEN: 4, chess.KING: 0}
+MAX_PHASE = 24
+
+# PIECE_SQ[color][piece_type][sq] = (zobrist key, midgame score, endgame score)
+# scores include piece_values and are from Black's (the AI's) point of view
+PIECE_SQ = {}
+
+def build_piece_square_tables():
+    for color in (chess.WHITE, chess.BLACK):
+        sign = 1 if color == chess.BLACK else -1
+        PIECE_SQ[color] = {}
+        for pt, val in piece_values.items():
+            entries = []
+            for sq in chess.SQUARES:
+                idx = sq ^ 56 if color == chess.WHITE else sq
+                entries.append((zobrist_piece(pt, color, sq),
+                                sign * (val + PST_MG[pt][idx]),
+                                sign * (val + PST_EG[pt][idx])))
+            PIECE_SQ[color][pt] = entries
+
+def evaluate_state(board):
+    # full rescan: (midgame, endgame, phase); the search updates it incrementally
+    mg = eg = phase = 0
+    for color in (chess.WHITE, chess.BLACK):
+        table = PIECE_SQ[color]
+        for pt in piece_values:
+            mask = board.pieces_mask(pt, color)
+            phase += PHASE_WEIGHTS[pt] * chess.popcount(mask)
+            for sq in chess.scan_reversed(mask):
+                entry = table[pt][sq]
+                mg += entry[1]
+                eg += entry[2]
+    return mg, eg, phase
+
+def tapered_score(mg, eg, phase):
+    if phase > MAX_PHASE:
+        phase = MAX_PHASE
+    return (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+
+def evaluate_board(board):
+    return tapered_score(*evaluate_state(board))
+
+def mate_score(board, ply):
+    # score for the side to move when it has no legal moves: mated or stalemate;
+    # in game_search units like ChessState.result(), so quiescence mates sort
+    # and hash like the ones the main search finds
+    if board.is_check():
+        return -WIN + ply
+    return 0
+
+def side_eval(board):
+    # current_eval() is from Black's point of view; the search is negamax
+    score = current_eval()
+    if EVAL_POSITIONAL:
+        score += positional_score(board, eval_stack[-1][2])
+    return score if board.turn == chess.BLACK else -score
+
+def has_non_pawn_material(board, color):
+    return bool(board.occupied_co[color] & ~(board.pawns | board.kings))
+
+# -----------------------------
+# POSITIONAL TERMS (bitboards)
+# -----------------------------
+# All masks are python-chess integer bitboards; scores are (midgame, endgame)
+# pairs from Black's point of view, tapered like the PSTs.
+MOBILITY = {chess.KNIGHT: (4, 4), chess.BISHOP: (5, 5), chess.ROOK: (2, 4), chess.QUEEN: (1, 2)}
+KING_ATTACK = {chess.KNIGHT: 8, chess.BISHOP: 8, chess.ROOK: 12, chess.QUEEN: 20}   # per king-zone square
+DOUBLED_PAWN = (-10, -20)
+ISOLATED_PAWN = (-10, -15)
+PASSED_PAWN = [(0, 0), (5, 10), (10, 20), (15, 35), (25, 60), (40, 100), (60, 150), (0, 0)]   # by relative rank
+PAWN_SHIELD = 12        # midgame bonus per pawn in front of the king
+
+ADJACENT_FILES = [(chess.BB_FILES[f - 1] if f > 0 else 0) | (chess.BB_FILES[f + 1] if f < 7 else 0)
+                  for f in range(8)]
+PASSED_MASK = {}        # PASSED_MASK[color][sq]: enemy pawns here stop the pawn on sq
+SHIELD_MASK = {}        # SHIELD_MASK[color][sq]: pawn shield squares for a king on sq
+
+def build_pawn_masks():
+    for color in (chess.WHITE, chess.BLACK):
+        PASSED_MASK[color] = []
+        SHIELD_MASK[color] = []
+        for sq in chess.SQUARES:
+            f, r = chess.square_file(sq), chess.square_rank(sq)
+            ahead = range(r + 1, 8) if color == chess.WHITE else range(0, r)
+            files = chess.BB_FILES[f] | ADJACENT_FILES[f]
+            front = 0
+            for rr in ahead:
+                front |= chess.BB_RANKS[rr]
+            PASSED_MASK[color].append(front & files)
+            near = 0
+            for rr in list(ahead)[:2] if color == chess.WHITE else list(ahead)[-2:]:
+                near |= chess.BB_RANKS[rr]
+            SHIELD_MASK[color].append(near & files)
+
+build_pawn_masks()
+
+def pawn_attacks(pawns, color):
+    if color == chess.WHITE:
+        return ((pawns << 7) & ~chess.BB_FILE_H | (pawns << 9) & ~chess.BB_FILE_A) & chess.BB_ALL
+    return (pawns >> 9) & ~chess.BB_FILE_H | (pawns >> 7) & ~chess.BB_FILE_A
+
+# Pawn-structure cache indexed by both pawn bitboards: entries are (white pawns, black pawns, mg, eg)
+pawn_table = [None] * PAWN_HASH_SIZE
+pawn_stats = {"probes": 0, "hits": 0}
+
+def pawn_structure(white_pawns, black_pawns):
+    # doubled, isolated and passed pawns: (mg, eg) from Black's point of view
+    mg = eg = 0
+    for color, own, enemy in ((chess.WHITE, white_pawns, black_pawns), (chess.BLACK, black_pawns, white_pawns)):
+        sign = 1 if color == chess.BLACK else -1
+        for f in range(8):
+            n = chess.popcount(own & chess.BB_FILES[f])
+            if n > 1:
+                mg += sign * DOUBLED_PAWN[0] * (n - 1)
+                eg += sign * DOUBLED_PAWN[1] * (n - 1)
+            if n and not own & ADJACENT_FILES[f]:
+                mg += sign * ISOLATED_PAWN[0] * n
+                eg += sign * ISOLATED_PAWN[1] * n
+        passed_masks = PASSED_MASK[color]
+        for sq in chess.scan_forward(own):
+            # no enemy pawn ahead on this or an adjacent file, no own pawn in front
+            if not enemy & passed_masks[sq] and not own & passed_masks[sq] & chess.BB_FILES[chess.square_file(sq)]:
+                rank = chess.square_rank(sq) if color == chess.WHITE else 7 - chess.square_rank(sq)
+                mg += sign * PASSED_PAWN[rank][0]
+                eg += sign * PASSED_PAWN[rank][1]
+    return mg, eg
+
+def probe_pawn_structure(white_pawns, black_pawns):
+    pawn_stats["probes"] += 1
+    idx = hash((white_pawns, black_pawns)) & (PAWN_HASH_SIZE - 1)
+    entry = pawn_table[idx]
+    if entry is not None and entry[0] == white_pawns and entry[1] == black_pawns:
+        pawn_stats["hits"] += 1
+        return entry[2], entry[3]
+    mg, eg = pawn_structure(white_pawns, black_pawns)
+    pawn_table[idx] = (white_pawns, black_pawns, mg, eg)
+    return mg, eg
+
+def pawn_hash_hit_rate():
+    return pawn_stats["hits"] / pawn_stats["probes"] if pawn_stats["probes"] else 0.0
+
+def piece_attacks(pt, sq, occupied):
+    # attack mask straight from python-chess's lookup tables
+    if pt == chess.KNIGHT:
+        return chess.BB_KNIGHT_ATTACKS[sq]
+    attacks = 0
+    if pt != chess.ROOK:
+        attacks = chess.BB_DIAG_ATTACKS[sq][chess.BB_DIAG_MASKS[sq] & occupied]
+    if pt != chess.BISHOP:
+        attacks |= (chess.BB_RANK_ATTACKS[sq][chess.BB_RANK_MASKS[sq] & occupied] |
+                    chess.BB_FILE_ATTACKS[sq][chess.BB_FILE_MASKS[sq] & occupied])
+    return attacks
+
+def positional_score(board, phase):
+    # mobility (attacks not on own pieces or enemy-pawn-guarded squares),
+    # king attacks and pawn shield, plus the cached pawn structure
+    white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+    black_pawns = board.pawns & board.occupied_co[chess.BLACK]
+    mg, eg = probe_pawn_structure(white_pawns, black_pawns)
+    occupied = board.occupied
+    for color, own_pawns, enemy_pawns in ((chess.WHITE, white_pawns, black_pawns),
+                                          (chess.BLACK, black_pawns, white_pawns)):
+        sign = 1 if color == chess.BLACK else -1
+        safe = ~(board.occupied_co[color] | pawn_attacks(enemy_pawns, not color))
+        enemy_king = board.king(not color)
+        zone = chess.BB_KING_ATTACKS[enemy_king] if enemy_king is not None else 0
+        attack = moves_mg = moves_eg = 0
+        own = board.occupied_co[color]
+        for pt, mask in ((chess.KNIGHT, board.knights), (chess.BISHOP, board.bishops),
+                         (chess.ROOK, board.rooks), (chess.QUEEN, board.queens)):
+            w_mg, w_eg = MOBILITY[pt]
+            for sq in chess.scan_forward(mask & own):
+                attacks = piece_attacks(pt, sq, occupied)
+                n = chess.popcount(attacks & safe)
+                moves_mg += w_mg * n
+                moves_eg += w_eg * n
+                if attacks & zone:
+                    attack += KING_ATTACK[pt] * chess.popcount(attacks & zone)
+        mg += sign * (moves_mg + attack)
+        eg += sign * moves_eg
+        king = board.king(color)
+        if king is not None:
+            mg += sign * PAWN_SHIELD * chess.popcount(own_pawns & SHIELD_MASK[color][king])
+    return tapered_score(mg, eg, phase)
+
+def full_evaluation(board):
+    # PSTs and positional terms from a full rescan (Black's point of view)
+    mg, eg, phase = evaluate_state(board)
+    return tapered_score(mg, eg, phase) + (positional_score(board, phase) if EVAL_POSITIONAL else 0)
+
+# -----------------------------
+# ZOBRIST HASHING / TRANSPOSITION TABLE
+# -----------------------------
+# Polyglot keys, so our hashes match chess.polyglot.zobrist_hash(board).
+ZOBRIST = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Two tables indexed by the same key bits: a depth-preferred slot and an
+# always-replace slot. Entries are (key, depth, score, bound, move, generation).
+tt_deep = [None] * TT_SIZE
+tt_recent = [None] * TT_SIZE
+tt_generation = 0
+tt_stats = {"probes": 0, "hits": 0, "misses": 0, "collisions": 0, "stores": 0}
+search_stats = {"nodes": 0, "qnodes": 0, "tb_hits": 0}   # main search / quiescence nodes, tablebase hits in search
+hash_stack = []
+key_history = []     # full keys of the game and search path, for repetition checks
+eval_stack = []
+
+def zobrist_piece(piece_type, color, sq):
+    return ZOBRIST[64 * ((piece_type - 1) * 2 + int(color)) + sq]
+
+def zobrist_extras(board):
+    # castling, en passant and side-to-move part of the key
+    key = 0
+    rights = board.castling_rights
+    if rights & chess.BB_H1: key ^= ZOBRIST[768]
+    if rights & chess.BB_A1: key ^= ZOBRIST[769]
+    if rights & chess.BB_H8: key ^= ZOBRIST[770]
+    if rights & chess.BB_A8: key ^= ZOBRIST[771]
+    ep = board.ep_square
+    if ep is not None:
+        if board.turn == chess.WHITE:
+            mask = chess.shift_down(chess.BB_SQUARES[ep])
+        else:
+            mask = chess.shift_up(chess.BB_SQUARES[ep])
+        mask = chess.shift_left(mask) | chess.shift_right(mask)
+        if mask & board.pawns & board.occupied_co[board.turn]:
+            key ^= ZOBRIST[772 + chess.square_file(ep)]
+    if board.turn == chess.WHITE:
+        key ^= ZOBRIST[780]
+    return key
+
+def zobrist_pieces(board):
+    key = 0
+    for sq, piece in board.piece_map().items():
+        key ^= zobrist_piece(piece.piece_type, piece.color, sq)
+    return key
+
+def move_deltas(board, mv):
+    # (key xor, midgame, endgame, phase) deltas for mv, board before the push
+    if not mv:
+        return 0, 0, 0, 0   # null move: only the extras (side to move, ep) change
+    color = board.turn
+    frm, to = mv.from_square, mv.to_square
+    pt = board.piece_type_at(frm)
+    own = PIECE_SQ[color]
+    old = own[pt][frm]
+    new = own[mv.promotion or pt][to]
+    key = old[0] ^ new[0]
+    mg = new[1] - old[1]
+    eg = new[2] - old[2]
+    phase = PHASE_WEIGHTS[mv.promotion] if mv.promotion else 0
+    if pt == chess.KING and board.is_castling(mv):
+        rank = chess.square_rank(frm)
+        if chess.square_file(to) > chess.square_file(frm):
+            old, new = own[chess.ROOK][chess.square(7, rank)], own[chess.ROOK][chess.square(5, rank)]
+        else:
+            old, new = own[chess.ROOK][chess.square(0, rank)], own[chess.ROOK][chess.square(3, rank)]
+        key ^= old[0] ^ new[0]
+        mg += new[1] - old[1]
+        eg += new[2] - old[2]
+        return key, mg, eg, phase
+    if pt == chess.PAWN and to == board.ep_square:
+        captured, cap_sq = chess.PAWN, (to - 8 if color == chess.WHITE else to + 8)
+    else:
+        captured, cap_sq = board.piece_type_at(to), to
+    if captured:
+        gone = PIECE_SQ[not color][captured][cap_sq]
+        key ^= gone[0]
+        mg -= gone[1]
+        eg -= gone[2]
+        phase -= PHASE_WEIGHTS[captured]
+    return key, mg, eg, phase
+
+def reset_search_stacks(board):
+    # hash_stack holds the piece part of the key, eval_stack the
+    # (midgame, endgame, phase) evaluation state and key_history the full
+    # keys of every position since the last capture or pawn move
+    hash_stack[:] = [zobrist_pieces(board)]
+    eval_stack[:] = [evaluate_state(board)]
+    history = []
+    undo = []
+    limit = min(board.halfmove_clock, len(board.move_stack))
+    while len(undo) < limit:
+        undo.append(board.pop())
+        history.append(chess.polyglot.zobrist_hash(board))
+    while undo:
+        board.push(undo.pop())
+    history.reverse()
+    history.append(hash_stack[0] ^ zobrist_extras(board))
+    key_history[:] = history
+
+def current_key(board):
+    return key_history[-1]
+
+def current_eval():
+    mg, eg, phase = eval_stack[-1]
+    return tapered_score(mg, eg, phase)
+
+def push_move(board, mv):
+    key, mg, eg, phase = move_deltas(board, mv)
+    hash_stack.append(hash_stack[-1] ^ key)
+    prev = eval_stack[-1]
+    eval_stack.append((prev[0] + mg, prev[1] + eg, prev[2] + phase))
+    board.push(mv)
+    key_history.append(hash_stack[-1] ^ zobrist_extras(board))
+
+def pop_move(board):
+    hash_stack.pop()
+    eval_stack.pop()
+    key_history.pop()
+    board.pop()
+
+def is_repetition(board, key):
+    # same rule as board.can_claim_threefold_repetition(), but on hashes
+    n = board.halfmove_clock + 1
+    window = key_history[-n:] if n < len(key_history) else key_history
+    if len(window) < 5:
+        return False
+    if window.count(key) >= 3:
+        return True
+    seen = set()
+    repeated = set()
+    for k in window:
+        if k in seen:
+            repeated.add(k)
+        seen.add(k)
+    if not repeated:
+        return False
+    # a legal move that reaches a position for the third time
+    for mv in board.generate_legal_moves():
+        push_move(board, mv)
+        hit = key_history[-1] in repeated
+        pop_move(board)
+        if hit:
+            return True
+    return False
+
+def is_draw(board, key):
+    if not (board.pawns | board.rooks | board.queens) and board.is_insufficient_material():
+        return True
+    if board.halfmove_clock >= 99 and board.can_claim_fifty_moves():
+        return True
+    return is_repetition(board, key)
+
+build_piece_square_tables()
+
+def tt_probe(key):
+    tt_stats["probes"] += 1
+    idx = key & (TT_SIZE - 1)
+    for entry in (tt_deep[idx], tt_recent[idx]):
+        if entry is not None and entry[0] == key:
+            tt_stats["hits"] += 1
+            return entry
+    tt_stats["misses"] += 1
+    if tt_deep[idx] is not None or tt_recent[idx] is not None:
+        tt_stats["collisions"] += 1
+    return None
+
+def tt_store(key, depth, score, bound, mv):
+    tt_stats["stores"] += 1
+    idx = key & (TT_SIZE - 1)
+    entry = (key, depth, score, bound, mv, tt_generation)
+    old = tt_deep[idx]
+    if old is None or old[0] == key or depth >= old[1] or old[5] != tt_generation:
+        tt_deep[idx] = entry
+    else:
+        tt_recent[idx] = entry
+
+def tt_clear():
+    tt_deep[:] = [None] * TT_SIZE
+    tt_recent[:] = [None] * TT_SIZE
+    for k in tt_stats:
+        tt_stats[k] = 0
+
+# -----------------------------
+# MOVE ORDERING
+# -----------------------------
+# hash/PV move, then MVV-LVA captures and promotions, then killers, then
+# quiet moves by history score
+killer_moves = [[None, None] for _ in range(AI_MAX_DEPTH + 1)]
+history_scores = {}
+
+def clear_move_ordering():
+    for slot in killer_moves:
+        slot[0] = slot[1] = None
+    history_scores.clear()
+
+def move_order_score(board, mv, tt_move, killers):
+    if mv == tt_move:
+        return 1000000
+    if board.is_capture(mv):
+        victim = chess.PAWN if board.is_en_passant(mv) else board.piece_type_at(mv.to_square)
+        attacker = board.piece_type_at(mv.from_square)
+        return 100000 + 10 * victim - attacker + (1000 if mv.promotion else 0)
+    if mv.promotion:
+        return 90000 + mv.promotion
+    if mv == killers[0]:
+        return 80001
+    if mv == killers[1]:
+        return 80000
+    return min(history_scores.get((board.turn, mv.from_square, mv.to_square), 0), 79999)
+
+def ordered_moves(board, tt_move=None, ply=0, moves=None):
+    killers = killer_moves[ply] if ply < len(killer_moves) else (None, None)
+    if moves is None:
+        moves = list(board.legal_moves)
+    moves.sort(key=lambda mv: move_order_score(board, mv, tt_move, killers), reverse=True)
+    return moves
+
+def record_cutoff(board, mv, depth, ply):
+    # quiet moves that cause a beta cutoff become killers and gain history
+    if board.is_capture(mv) or mv.promotion:
+        return
+    if ply < len(killer_moves):
+        slot = killer_moves[ply]
+        if slot[0] != mv:
+            slot[1] = slot[0]
+            slot[0] = mv
+    hkey = (board.turn, mv.from_square, mv.to_square)
+    history_scores[hkey] = history_scores.get(hkey, 0) + depth * depth
+
+# -----------------------------
+# SEARCH
+# -----------------------------
+search_deadline = None      # None = search until stopped
+search_start = 0.0
+last_report = 0.0
+search_stop = threading.Event()
+search_listener = None      # called with a progress dict during the search
+search_info = {}      # depth, score, nodes, time and pv of the last completed iteration
+
+def check_time():
+    # quiescence nodes; the main search calls poll_search() itself
+    if search_stats["qnodes"] & (POLL_NODES - 1) == 0:
+        poll_search()
+
+def poll_search():
+    # a node takes a few hundred microseconds here, so polling often is cheap
+    # and keeps short budgets (UCI movetime, clock play) from overshooting
+    search_stats["nodes"] = search.stats["nodes"]
+    if search_stop.is_set():
+        raise SearchTimeout()
+    now = time.monotonic()
+    if search_deadline is not None and now >= search_deadline:
+        raise SearchTimeout()
+    if search_listener is not None and now - last_report >= REPORT_SECONDS:
+        report_progress()
+
+def report_progress():
+    global last_report
+    last_report = time.monotonic()
+    elapsed = max(last_report - search_start, 1e-6)
+    nodes = search_stats["nodes"] + search_stats["qnodes"]
+    search_listener({"depth": search_info.get("depth", 0), "nodes": nodes,
+                     "nps": int(nodes / elapsed), "time": elapsed,
+                     "score": search_info.get("score"), "pv": search_info.get("pv", [])})
+
+def set_search_deadline(time_ms):
+    # start (or restart) the clock of a running search, e.g. on a ponder hit
+    global search_deadline
+    search_deadline = time.monotonic() + time_ms / 1000.0
+
+def stop_search():
+    search_stop.set()
+    if pool_stop is not None:
+        pool_stop.set()
+
+def clear_stop():
+    search_stop.clear()
+    if pool_stop is not None:
+        pool_stop.clear()
+
+# -----------------------------
+# QUIESCENCE SEARCH
+# -----------------------------
+# At the horizon only captures and queen promotions are searched (all
+# evasions when in check) until the position is quiet, so the search does
+# not stop in the middle of an exchange.
+def capture_gain(board, mv):
+    if board.is_en_passant(mv):
+        gain = piece_values[chess.PAWN]
+    else:
+        victim = board.piece_type_at(mv.to_square)
+        gain = piece_values[victim] if victim else 0
+    if mv.promotion:
+        gain += piece_values[mv.promotion] - piece_values[chess.PAWN]
+    return gain
+
+def see(board, mv):
+    # static exchange evaluation on mv.to_square (swap algorithm, pins ignored)
+    to = mv.to_square
+    side = not board.turn
+    occupied = board.occupied ^ chess.BB_SQUARES[mv.from_square]
+    if board.is_en_passant(mv):
+        occupied ^= chess.BB_SQUARES[to - 8 if board.turn == chess.WHITE else to + 8]
+        gain = [piece_values[chess.PAWN]]
+    else:
+        victim = board.piece_type_at(to)
+        gain = [piece_values[victim] if victim else 0]
+    attacker_value = piece_values[mv.promotion or board.piece_type_at(mv.from_square)]
+    while True:
+        gain.append(attacker_value - gain[-1])
+        if max(-gain[-2], gain[-1]) < 0:
+            break
+        attackers = board.attackers_mask(side, to, occupied) & occupied
+        if not attackers:
+            break
+        for pt in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING):
+            bb = attackers & board.pieces_mask(pt, side)
+            if bb:
+                occupied ^= chess.BB_SQUARES[chess.lsb(bb)]
+                attacker_value = piece_values[pt]
+                break
+        side = not side
+    # the last entry is a capture nobody can make; fold the rest back
+    for d in range(len(gain) - 2, 0, -1):
+        gain[d-1] = -max(-gain[d-1], gain[d])
+    return gain[0]
+
+def quiescence_moves(board):
+    moves = list(board.generate_legal_captures())
+    promo_rank = chess.BB_RANK_8 if board.turn == chess.WHITE else chess.BB_RANK_1
+    for mv in board.generate_legal_moves(board.pawns & board.occupied_co[board.turn], promo_rank & ~board.occupied):
+        if mv.promotion == chess.QUEEN:
+            moves.append(mv)
+    moves.sort(key=lambda mv: move_order_score(board, mv, None, (None, None)), reverse=True)
+    return moves
+
+def quiescence(board, alpha, beta, qply):
+    in_check = board.is_check()
+    if in_check and qply < QS_MAX_PLY:
+        moves = list(board.legal_moves)
+        if not moves:
+            return mate_score(board, len(hash_stack) - 1)
+        stand_pat = best = -INF
+    else:
+        stand_pat = best = side_eval(board)
+        if qply >= QS_MAX_PLY or stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+        moves = quiescence_moves(board)
+
+    for mv in moves:
+        if not in_check:
+            # delta pruning: even winning this piece cannot raise the score to alpha
+            if stand_pat + capture_gain(board, mv) + DELTA_MARGIN <= alpha:
+                continue
+            if QS_SEE and not mv.promotion and see(board, mv) < 0:
+                continue
+        search_stats["qnodes"] += 1
+        check_time()
+        push_move(board, mv)
+        score = -quiescence(board, -beta, -alpha, qply + 1)
+        pop_move(board)
+        if score > best:
+            best = score
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
+    return best
+
+# -----------------------------
+# GAME STATE (game_search protocol)
+# -----------------------------
+# The position for game_search: the incremental hash/eval stacks, the move
+# ordering above (TT move, MVV-LVA, killers, history), quiescence at the
+# horizon, tablebase probes, and the hooks that turn on check extensions,
+# null-move pruning and late move reductions. Mates, here and in quiescence,
+# are scored in game_search units (WIN - plies); engine_score() converts the
+# search result to MATE once.
+class ChessState:
+    def __init__(self, board):
+        self.board = board
+        reset_search_stacks(board)
+
+    # picklable for MCTS worker processes: the engine stacks are rebuilt there
+    def __getstate__(self):
+        return self.board
+
+    def __setstate__(self, board):
+        self.__init__(board)
+
+    def moves(self):
+        return list(self.board.legal_moves)
+
+    def push(self, mv):
+        push_move(self.board, mv)
+
+    def pop(self):
+        pop_move(self.board)
+
+    def result(self):
+        board = self.board
+        if is_draw(board, key_history[-1]):
+            return 0
+        if tablebase is not None and chess.popcount(board.occupied) <= SYZYGY_PROBE_LIMIT:
+            tb = probe_wdl(board)
+            if tb is not None:
+                search_stats["tb_hits"] += 1
+                ply = len(hash_stack) - 1
+                return TB_WIN - ply if tb == 2 else -TB_WIN + ply if tb == -2 else 0
+        if not any(board.generate_legal_moves()):
+            return -WIN if board.is_check() else 0
+        return None
+
+    def evaluate(self):
+        return side_eval(self.board)
+
+    def quiesce(self, alpha, beta):
+        return quiescence(self.board, alpha, beta, 0)
+
+    def key(self):
+        return key_history[-1]
+
+    def order_moves(self, moves, tt_move):
+        return ordered_moves(self.board, tt_move, len(hash_stack) - 1, moves)
+
+    def record_cutoff(self, mv, depth):
+        record_cutoff(self.board, mv, depth, len(hash_stack) - 1)
+
+    def extension(self, ply, root_depth):
+        # check extension, up to twice the nominal depth
+        return 1 if ply < 2 * root_depth and self.board.is_check() else 0
+
+    def null_move_ok(self, depth, beta):
+        # not in check and not without pieces (zugzwang)
+        board = self.board
+        return (depth >= NULL_MOVE_MIN_DEPTH and not board.is_check()
+                and has_non_pawn_material(board, board.turn) and side_eval(board) >= beta)
+
+    def push_null(self):
+        push_move(self.board, chess.Move.null())
+
+    def reduction(self, mv, index, depth):
+        # late quiet moves are searched shallower first
+        board = self.board
+        if depth < LMR_MIN_DEPTH or index < LMR_MIN_MOVES or mv.promotion or board.is_capture(mv):
+            return 0
+        ply = len(hash_stack) - 1
+        if ply < len(killer_moves) and mv in killer_moves[ply]:
+            return 0
+        if board.is_check() or board.gives_check(mv):
+            return 0
+        return min(1 if index < 8 else 2, depth - 2)
+
+class EngineTable:
+    # game_search's (depth, score, bound, move) entries in the two-tier tables
+    def get(self, key):
+        entry = tt_probe(key)
+        return None if entry is None else entry[1:5]
+
+    def __setitem__(self, key, entry):
+        tt_store(key, *entry)
+
+    def clear(self):
+        tt_clear()
+
+search = Search(check_every=POLL_NODES, pvs=True, table=EngineTable(), poll=poll_search)
+
+def engine_score(score):
+    # game_search mate scores (WIN - plies) -> MATE - plies
+    if score >= WIN_BOUND:
+        return MATE - (WIN - score)
+    if score <= -WIN_BOUND:
+        return -MATE + (WIN + score)
+    return score
+
+# -----------------------------
+# ROOT-PARALLEL SEARCH (worker processes)
+# -----------------------------
+# The PV move is searched in this process to get a bound, then the other
+# root moves are split round-robin over the pool. Workers share alpha
+# through a multiprocessing.Value and keep their own transposition table
+# between iterations and moves.
+search_pool = None
+pool_workers = 0
+pool_stop = None        # multiprocessing.Event seen by the workers
+shared_alpha = None
+
+def init_search_worker(alpha_value, stop_event):
+    global shared_alpha, search_stop
+    shared_alpha = alpha_value
+    search_stop = stop_event
+
+def get_search_pool(workers):
+    global search_pool, pool_workers, pool_stop, shared_alpha
+    if search_pool is None or pool_workers != workers:
+        shutdown_search_pool()
+        shared_alpha = multiprocessing.Value("l", -INF)
+        pool_stop = multiprocessing.Event()
+        search_pool = ProcessPoolExecutor(max_workers=workers, initializer=init_search_worker,
+                                          initargs=(shared_alpha, pool_stop))
+        pool_workers = workers
+    return search_pool
+
+def shutdown_search_pool():
+    global search_pool
+    if search_pool is not None:
+        search_pool.shutdown(cancel_futures=True)
+        search_pool = None
+
+def search_root_moves(board, moves, depth, generation):
+    # worker side: returns ([(move, score, exact)], nodes, qnodes, completed)
+    global tt_generation
+    tt_generation = generation
+    search.reset_stats()
+    search_stats["nodes"] = search_stats["qnodes"] = 0
+    state = ChessState(board)
+    search.start(state)
+    search.root_depth = depth
+    results = []
+    try:
+        for mv in moves:
+            alpha = shared_alpha.value
+            score = search.root_move_score(state, mv, depth, alpha)
+            if score > alpha:
+                with shared_alpha.get_lock():
+                    if score > shared_alpha.value:
+                        shared_alpha.value = score
+            results.append((mv, score, score > alpha))
+    except SearchTimeout:
+        return results, search.stats["nodes"], search_stats["qnodes"], False
+    return results, search.stats["nodes"], search_stats["qnodes"], True
+
+def search_root_parallel(state, depth, pv_move, workers):
+    board = state.board
+    search.root_depth = depth
+    moves = search.ordered_moves(state, pv_move)
+    if not moves:
+        return None, -WIN - 1
+    best_mv = moves[0]
+    best_score = search.root_move_score(state, best_mv, depth, -WIN - 1)
+    rest = moves[1:]
+    if rest:
+        pool = get_search_pool(workers)
+        if search_stop.is_set():
+            raise SearchTimeout()
+        pool_stop.clear()
+        shared_alpha.value = best_score
+        position = board.copy()
+        futures = [pool.submit(search_root_moves, position, rest[i::workers], depth, tt_generation)
+                   for i in range(workers) if rest[i::workers]]
+        pending = futures
+        while pending:
+            _, pending = wait(pending, timeout=0.02)
+            if search_stop.is_set() or (search_deadline is not None and time.monotonic() >= search_deadline):
+                pool_stop.set()
+        completed = True
+        for fut in futures:
+            results, nodes, qnodes, done = fut.result()
+            search.stats["nodes"] += nodes
+            search_stats["qnodes"] += qnodes
+            completed = completed and done
+            for mv, score, exact in results:
+                if exact and score > best_score:
+                    best_score = score
+                    best_mv = mv
+        if not completed:
+            raise SearchTimeout()
+    search.tt[current_key(board)] = (depth, best_score, EXACT, best_mv)
+    return best_mv, best_score
+
+def principal_variation(board, max_len):
+    # follow hash moves from the root
+    pv = []
+    root_ply = len(board.move_stack)
+    reset_search_stacks(board)
+    while len(pv) < max_len:
+        entry = tt_probe(current_key(board))
+        if entry is None or entry[4] is None or not board.is_legal(entry[4]):
+            break
+        pv.append(entry[4])
+        push_move(board, entry[4])
+    while len(board.move_stack) > root_ply:
+        pop_move(board)
+    return pv
+
+# -----------------------------
+# OPENING BOOK / ENDGAME TABLEBASES
+# -----------------------------
+# Both are looked up before any search: a hit costs microseconds and plays
+# better than a shallow search. The book is read by chess.polyglot's
+# memory-mapped reader (binary search on the Zobrist key).
+book_reader = None
+tablebase = None
+probe_stats = {}        # phase -> {"book_probes", "book_hits", "tb_probes", "tb_hits"}
+
+def open_book(path=BOOK_PATH):
+    global book_reader
+    if book_reader is not None:
+        book_reader.close()
+        book_reader = None
+    if path and os.path.isfile(path):
+        book_reader = chess.polyglot.open_reader(path)
+    return book_reader
+
+def open_tablebase(path=SYZYGY_PATH):
+    global tablebase
+    if tablebase is not None:
+        tablebase.close()
+        tablebase = None
+    if path and os.path.isdir(path):
+        tablebase = chess.syzygy.open_tablebase(path)
+    return tablebase
+
+def game_phase(board):
+    if board.fullmove_number <= 15:
+        return "opening"
+    if evaluate_state(board)[2] > 8:
+        return "middlegame"
+    return "endgame"
+
+def count_probe(board, kind, hit):
+    stats = probe_stats.setdefault(game_phase(board), {"book_probes": 0, "book_hits": 0,
+                                                      "tb_probes": 0, "tb_hits": 0})
+    stats[kind + "_probes"] += 1
+    if hit:
+        stats[kind + "_hits"] += 1
+
+def probe_hit_rates():
+    # {phase: {"book": rate or None, "tb": rate or None}}
+    rates = {}
+    for phase, st in probe_stats.items():
+        rates[phase] = {kind: (st[kind + "_hits"] / st[kind + "_probes"] if st[kind + "_probes"] else None)
+                        for kind in ("book", "tb")}
+    return rates
+
+def probe_book(board):
+    if book_reader is None:
+        return None
+    # passing the board makes the reader convert castling moves and drop illegal ones
+    try:
+        if BOOK_BEST_MOVE:
+            entry = max(book_reader.find_all(board), key=lambda e: e.weight, default=None)
+        else:
+            entry = book_reader.weighted_choice(board)
+    except IndexError:
+        entry = None
+    mv = entry.move if entry is not None else None
+    count_probe(board, "book", mv is not None)
+    return mv
+
+def probe_wdl(board):
+    # win/draw/loss for the side to move (2, 1, 0, -1, -2) or None
+    if board.castling_rights:
+        return None
+    try:
+        return tablebase.probe_wdl(board)
+    except (KeyError, chess.syzygy.MissingTableError):
+        return None
+
+def probe_root_tablebase(board):
+    # keep the tablebase result; win as fast as possible, lose as slowly as possible
+    if tablebase is None or board.castling_rights or chess.popcount(board.occupied) > SYZYGY_PROBE_LIMIT:
+        return None
+    best = None
+    best_key = None
+    try:
+        for mv in board.legal_moves:
+            board.push(mv)
+            try:
+                wdl = -tablebase.probe_wdl(board)
+                dtz = -tablebase.probe_dtz(board)
+            finally:
+                board.pop()
+            zeroing = board.is_zeroing(mv)
+            # prefer the best result, then the shortest win / longest loss
+            key = (wdl, -abs(dtz) if wdl > 0 else abs(dtz), zeroing and wdl > 0)
+            if best_key is None or key > best_key:
+                best, best_key = mv, key
+    except (KeyError, chess.syzygy.MissingTableError):
+        best = None
+    count_probe(board, "tb", best is not None)
+    return best
+
+def probe_root(board):
+    # (move, source) from the book or the tablebase, or (None, None)
+    mv = probe_book(board)
+    if mv is not None:
+        return mv, "book"
+    mv = probe_root_tablebase(board)
+    if mv is not None:
+        return mv, "tablebase"
+    return None, None
+
+CONFIG_DEFAULT = object()    # best_move_for_ai(time_ms=...) default: AI_TIME_MS at call time
+
+def best_move_for_ai(board, time_ms=CONFIG_DEFAULT, max_depth=None, workers=None):
+    # iterative deepening: returns the best move of the deepest completed
+    # iteration; each iteration searches the previous PV first via the TT.
+    # time_ms=None searches until stop_search() (or a later set_search_deadline);
+    # omitted settings read AI_TIME_MS / AI_MAX_DEPTH / SEARCH_WORKERS now, so
+    # changes made after import (UCI setoption, GUI, matches) take effect
+    global tt_generation, search_deadline, search_start, last_report
+    if time_ms is CONFIG_DEFAULT:
+        time_ms = AI_TIME_MS
+    if max_depth is None:
+        max_depth = AI_MAX_DEPTH
+    if workers is None:
+        workers = SEARCH_WORKERS
+    search_info.clear()
+    mv, source = probe_root(board)
+    if mv is not None:
+        search_info.update(depth=0, score=None, nodes=0, qnodes=0, time=0.0, pv=[mv], source=source)
+        if search_listener is not None:
+            search_listener({"depth": 0, "nodes": 0, "nps": 0, "time": 0.0, "score": None, "pv": [mv]})
+        return mv
+    tt_generation += 1
+    clear_move_ordering()
+    search.reset_stats()
+    search_stats["nodes"] = search_stats["qnodes"] = search_stats["tb_hits"] = 0
+    start = search_start = last_report = time.monotonic()
+    search_deadline = None if time_ms is None else start + time_ms / 1000.0
+    root_ply = len(board.move_stack)
+    state = ChessState(board)
+    search.start(state)
+    best_mv = None
+    pv = []
+    iterations = []     # (depth, seconds, nodes) per completed iteration
+    try:
+        for depth in range(1, max_depth + 1):
+            reset_search_stacks(board)
+            if workers > 1:
+                mv, score = search_root_parallel(state, depth, pv[0] if pv else None, workers)
+            else:
+                mv, score = search.search_root(state, depth, pv[0] if pv else None)
+            if mv is None:
+                break
+            best_mv = mv
+            score = engine_score(score)
+            search_stats["nodes"] = search.stats["nodes"]
+            now = time.monotonic()
+            pv = principal_variation(board, depth)
+            if not pv or pv[0] != mv:
+                pv = [mv]
+            iterations.append((depth, now - start, search_stats["nodes"] + search_stats["qnodes"]))
+            search_info.update(depth=depth, score=score, nodes=search_stats["nodes"],
+                               qnodes=search_stats["qnodes"], time=now - start, pv=pv,
+                               source="search", iterations=iterations)
+            if search_listener is not None:
+                report_progress()
+            # the next iteration would most likely not finish in time
+            if abs(score) >= MATE_BOUND or (search_deadline is not None and now - start > search_deadline - now):
+                break
+    except SearchTimeout:
+        # quiescence moves are not on game_search's ply count: unwind the board
+        while len(board.move_stack) > root_ply:
+            board.pop()
+        search.ply = 0
+    finally:
+        search_deadline = None
+        search_stats["nodes"] = search.stats["nodes"]
+    if best_mv is None:
+        # out of time inside the first iteration: the best-ordered move
+        moves = search.ordered_moves(ChessState(board), None)
+        best_mv = moves[0] if moves else None
+    return best_mv
+
+open_book()
+open_tablebase()
@@ -0,0 +1,267 @@
+# Headless engine-vs-engine matches between two chess_engine configurations.
+# A configuration is a comma-separated list of overrides of chess_engine
+# settings; P/N/B/R/Q change piece_values:
+#   python chess_match.py --a "N=330,B=340" --b "" --games 400 --workers 4 --movetime 100
+#   python chess_match.py --a "EVAL_POSITIONAL=0" --depth 3 --sprt 0,10 --pgn match.pgn
+# Games start from openings.txt (each opening once with each colour), are
+# adjudicated as draws after --max-plies plies or --game-time seconds, and are
+# appended to the PGN file as they finish.
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import chess
+import chess.pgn
+import chess_engine as engine
+
+DEFAULT_OPENINGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openings.txt")
+PIECE_KEYS = {"P": chess.PAWN, "N": chess.KNIGHT, "B": chess.BISHOP, "R": chess.ROOK, "Q": chess.QUEEN}
+# sizes of tables allocated when chess_engine is imported; changing them
+# afterwards would leave the tables at their old length
+FIXED_SETTINGS = {"TT_SIZE", "PAWN_HASH_SIZE", "AI_MAX_DEPTH"}
+
+# -----------------------------
+# CONFIGURATIONS
+# -----------------------------
+def parse_config(text):
+    # "N=330,EVAL_POSITIONAL=0" -> {"N": 330, "EVAL_POSITIONAL": 0}
+    config = {}
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, value = item.partition("=")
+        name = name.strip()
+        if name in FIXED_SETTINGS:
+            raise ValueError(f"{name} sizes a table built at import and cannot be overridden")
+        if name not in PIECE_KEYS and not (name.isupper() and isinstance(getattr(engine, name, None), (int, float))):
+            raise ValueError(f"unknown engine setting: {name}")
+        config[name] = float(value) if "." in value else int(value)
+    return config
+
+engine_defaults = {}   # setting -> value before any configuration was applied
+
+def apply_config(config):
+    # reset to the defaults, then apply the overrides
+    if not engine_defaults:
+        engine_defaults.update({k: getattr(engine, k) for k in dir(engine) if k.isupper()
+                                and k not in FIXED_SETTINGS and isinstance(getattr(engine, k), (int, float))})
+        engine_defaults.update({k: engine.piece_values[pt] for k, pt in PIECE_KEYS.items()})
+    values = dict(engine_defaults)
+    values.update(config)
+    changed = False
+    for name, value in values.items():
+        if name in PIECE_KEYS:
+            if engine.piece_values[PIECE_KEYS[name]] != value:
+                engine.piece_values[PIECE_KEYS[name]] = value
+                changed = True
+        else:
+            setattr(engine, name, value)
+    if changed:
+        engine.build_piece_square_tables()
+
+# -----------------------------
+# WORKER SIDE
+# -----------------------------
+def init_worker():
+    engine.open_book(None)
+    engine.open_tablebase(None)
+
+def play_game(job):
+    # job: (index, opening moves, white config, black config, white name, black name,
+    #       movetime ms, depth, max plies, game seconds)
+    index, opening, white, black, white_name, black_name, movetime, depth, max_plies, game_time = job
+    board = chess.Board()
+    for san in opening:
+        board.push_san(san)
+    start = time.monotonic()
+    termination = None
+    # configurations differ, so neither may reuse the other's TT entries: each
+    # side gets its own tables for the game, swapped in before it moves
+    tables = {color: ([None] * engine.TT_SIZE, [None] * engine.TT_SIZE) for color in chess.COLORS}
+    while not board.is_game_over(claim_draw=True):
+        if len(board.move_stack) >= max_plies:
+            termination = "move limit"
+            break
+        if game_time and time.monotonic() - start >= game_time:
+            termination = "time limit"
+            break
+        apply_config(white if board.turn == chess.WHITE else black)
+        engine.tt_deep, engine.tt_recent = tables[board.turn]
+        mv = engine.best_move_for_ai(board, time_ms=movetime, max_depth=depth, workers=1)
+        board.push(mv)
+    if termination is None:
+        outcome = board.outcome(claim_draw=True)
+        result = outcome.result()
+        termination = outcome.termination.name.lower().replace("_", " ")
+    else:
+        result = "1/2-1/2"
+
+    game = chess.pgn.Game.from_board(board)
+    game.headers["Event"] = "chess_match"
+    game.headers["Date"] = time.strftime("%Y.%m.%d")
+    game.headers["Round"] = str(index + 1)
+    game.headers["White"] = white_name
+    game.headers["Black"] = black_name
+    game.headers["Result"] = result
+    game.headers["Opening"] = " ".join(opening)
+    game.headers["Termination"] = termination
+    return index, result, str(game), len(board.move_stack), time.monotonic() - start
+
+# -----------------------------
+# STATISTICS
+# -----------------------------
+def elo_from_score(score):
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return 400.0 * math.log10(score / (1.0 - score))
+
+def elo_estimate(wins, draws, losses):
+    # (elo, 95% error) of A against B from the per-game score variance
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0, float("inf")
+    score = (wins + 0.5 * draws) / n
+    var = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / n
+    margin = 1.96 * math.sqrt(var / n)
+    elo = elo_from_score(score)
+    return elo, (elo_from_score(score + margin) - elo_from_score(score - margin)) / 2
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    # log-likelihood ratio of H1 (elo1) against H0 (elo0), normal approximation
+    n = wins + draws + losses
+    if n == 0 or wins + losses == 0:
+        return 0.0
+    score = (wins + 0.5 * draws) / n
+    var = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / n
+    if var == 0:
+        return 0.0
+    s0 = 1 / (1 + 10 ** (-elo0 / 400))
+    s1 = 1 / (1 + 10 ** (-elo1 / 400))
+    return (s1 - s0) * (2 * score - s0 - s1) * n / (2 * var)
+
+def sprt_bounds(alpha, beta):
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+# -----------------------------
+# MATCH
+# -----------------------------
+def load_openings(path):
+    openings = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                openings.append(line.split())
+    return openings
+
+def make_jobs(openings, games, config_a, config_b, movetime, depth, max_plies, game_time):
+    jobs = []
+    for i in range(games):
+        opening = openings[(i // 2) % len(openings)]
+        if i % 2 == 0:
+            jobs.append((i, opening, config_a, config_b, "A", "B", movetime, depth, max_plies, game_time))
+        else:
+            jobs.append((i, opening, config_b, config_a, "B", "A", movetime, depth, max_plies, game_time))
+    return jobs
+
+def score_for_a(job, result):
+    # 1, 0.5 or 0 from engine A's point of view
+    if result == "1/2-1/2":
+        return 0.5
+    white_won = result == "1-0"
+    return 1.0 if white_won == (job[4] == "A") else 0.0
+
+def run_match(jobs, workers, pgn_path, sprt=None):
+    wins = draws = losses = plies = 0
+    start = time.monotonic()
+    stopped = None
+    pgn = open(pgn_path, "a", encoding="utf-8") if pgn_path else None
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+    try:
+        futures = {pool.submit(play_game, job): job for job in jobs}
+        for fut in as_completed(futures):
+            job = futures[fut]
+            index, result, text, n_plies, _ = fut.result()
+            plies += n_plies
+            score = score_for_a(job, result)
+            if score == 1.0:
+                wins += 1
+            elif score == 0.5:
+                draws += 1
+            else:
+                losses += 1
+            if pgn:
+                pgn.write(text + "\n\n")
+                pgn.flush()
+            n = wins + draws + losses
+            elo, err = elo_estimate(wins, draws, losses)
+            line = f"game {n:>5}/{len(jobs)}  +{wins} ={draws} -{losses}  elo {elo:+.1f} +/- {err:.1f}"
+            if sprt:
+                llr = sprt_llr(wins, draws, losses, sprt["elo0"], sprt["elo1"])
+                line += f"  llr {llr:+.2f} [{sprt['lower']:.2f}, {sprt['upper']:.2f}]"
+                if llr >= sprt["upper"]:
+                    stopped = "H1 accepted (A is stronger by at least elo1)"
+                elif llr <= sprt["lower"]:
+                    stopped = "H0 accepted (A is not stronger by elo1)"
+            print(line, flush=True)
+            if stopped:
+                break
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        if pgn:
+            pgn.close()
+    elapsed = time.monotonic() - start
+    return {"wins": wins, "draws": draws, "losses": losses, "plies": plies,
+            "time": elapsed, "sprt": stopped}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play chess_engine configurations against each other")
+    parser.add_argument("--a", default="", help="settings of engine A, e.g. N=330,EVAL_POSITIONAL=0")
+    parser.add_argument("--b", default="", help="settings of engine B (default: engine defaults)")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="game processes")
+    parser.add_argument("--openings", default=DEFAULT_OPENINGS, help="SAN opening lines, one per row")
+    parser.add_argument("--movetime", type=int, default=100, help="ms per move (0 = depth only)")
+    parser.add_argument("--depth", type=int, default=engine.AI_MAX_DEPTH, help="maximum search depth per move")
+    parser.add_argument("--max-plies", type=int, default=300, help="adjudicate a draw after this many plies")
+    parser.add_argument("--game-time", type=float, default=0, help="adjudicate a draw after this many seconds (0 = off)")
+    parser.add_argument("--pgn", help="append finished games to this PGN file")
+    parser.add_argument("--sprt", help="elo0,elo1: stop early once either hypothesis is accepted")
+    parser.add_argument("--alpha", type=float, default=0.05, help="SPRT false positive rate")
+    parser.add_argument("--beta", type=float, default=0.05, help="SPRT false negative rate")
+    args = parser.parse_args(argv)
+
+    try:
+        config_a = parse_config(args.a)
+        config_b = parse_config(args.b)
+    except ValueError as exc:
+        parser.error(str(exc))
+    sprt = None
+    if args.sprt:
+        elo0, elo1 = (float(x) for x in args.sprt.split(","))
+        lower, upper = sprt_bounds(args.alpha, args.beta)
+        sprt = {"elo0": elo0, "elo1": elo1, "lower": lower, "upper": upper}
+
+    openings = load_openings(args.openings)
+    jobs = make_jobs(openings, args.games, config_a, config_b, args.movetime or None,
+                     args.depth, args.max_plies, args.game_time)
+    stats = run_match(jobs, args.workers, args.pgn, sprt)
+
+    n = stats["wins"] + stats["draws"] + stats["losses"]
+    elo, err = elo_estimate(stats["wins"], stats["draws"], stats["losses"])
+    hours = stats["time"] / 3600
+    # each game process is single-threaded: the cores in use are the busy
+    # workers, capped by the machine
+    cores = max(1, min(args.workers, len(jobs), os.cpu_count() or 1))
+    print(f"A vs B: +{stats['wins']} ={stats['draws']} -{stats['losses']}  "
+          f"score {100 * (stats['wins'] + 0.5 * stats['draws']) / max(n, 1):.1f}%  elo {elo:+.1f} +/- {err:.1f} (95%)")
+    if stats["sprt"]:
+        print(f"SPRT: {stats['sprt']}")
+    print(f"{n} games, {stats['plies']} plies in {stats['time']:.1f}s: "
+          f"{n / hours / cores:.0f} games/hour/core ({args.workers} workers, cores in use: {cores})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
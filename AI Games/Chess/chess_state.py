@@ -0,0 +1,22 @@
+# The chess position in the game_search protocol. ChessState lives in
+# chess_engine, whose best_move_for_ai() (GUI, UCI, matches) runs
+# game_search.Search on it; this module is kept for the benchmarks and the
+# arena, which import it from here, and holds the Monte Carlo player.
+# mcts_move() is the Monte Carlo alternative (AI_PLAYER = "mcts" in chess-ai.py).
+import chess_engine as engine
+from chess_engine import ChessState
+from game_search import MCTS
+
+# -----------------------------
+# MCTS player
+# -----------------------------
+# PUCT with the engine's move ordering as priors; leaves are scored by the
+# evaluation instead of random playouts, which mean little in chess.
+MCTS_WORKERS = 1              # > 1: root-parallel over a process pool
+mcts = MCTS(c=1.0, puct=True, policy="eval", workers=MCTS_WORKERS)
+
+def mcts_move(board, time_ms=engine.CONFIG_DEFAULT):
+    # searches a copy; the tree is kept for the next move
+    if time_ms is engine.CONFIG_DEFAULT:
+        time_ms = engine.AI_TIME_MS
+    return mcts.best_move(ChessState(board.copy()), time_ms)
@@ -0,0 +1,187 @@
+# UCI front-end for chess_engine: lets GUIs, match runners and tournament
+# managers drive the engine over stdin/stdout without a display.
+#   python chess_uci.py
+import sys
+import threading
+import chess
+import chess_engine as engine
+
+ENGINE_NAME = "AI-course chess"
+ENGINE_AUTHOR = "AI course"
+MOVE_OVERHEAD_MS = 50        # kept back from the clock for I/O latency
+
+board = chess.Board()
+search_thread = None
+# "ponder"/"infinite" searches must not answer before ponderhit/stop;
+# ponder_time_ms is the budget to use once the ponder move is played
+search_mode = {"hold": False, "ponder_time_ms": None}
+
+def send(line):
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+def send_info(info):
+    parts = [f"info depth {info['depth']}"]
+    score = info.get("score")
+    if score is not None and abs(score) >= engine.MATE_BOUND:
+        # mate in n plies -> mate in moves, negative when being mated
+        plies = engine.MATE - abs(score)
+        moves = (plies + 1) // 2
+        parts.append(f"score mate {moves if score > 0 else -moves}")
+    elif score is not None:
+        parts.append(f"score cp {int(score)}")
+    parts.append(f"nodes {info['nodes']} nps {info['nps']} time {int(info['time'] * 1000)}")
+    if info.get("pv"):
+        parts.append("pv " + " ".join(mv.uci() for mv in info["pv"]))
+    send(" ".join(parts))
+
+def set_position(tokens):
+    global board
+    if not tokens:
+        return
+    if tokens[0] == "startpos":
+        board = chess.Board()
+        rest = tokens[1:]
+    elif tokens[0] == "fen":
+        fen_end = tokens.index("moves") if "moves" in tokens else len(tokens)
+        board = chess.Board(" ".join(tokens[1:fen_end]))
+        rest = tokens[fen_end:]
+    else:
+        return
+    if rest and rest[0] == "moves":
+        for uci in rest[1:]:
+            board.push_uci(uci)
+
+def parse_go(tokens):
+    opts = {}
+    i = 0
+    while i < len(tokens):
+        name = tokens[i]
+        if name in ("infinite", "ponder"):
+            opts[name] = True
+            i += 1
+        elif i + 1 < len(tokens):
+            try:
+                opts[name] = int(tokens[i + 1])
+            except ValueError:
+                pass
+            i += 2
+        else:
+            i += 1
+    return opts
+
+def allocate_time(opts, turn):
+    # milliseconds for this move, or None to search until "stop"
+    if "infinite" in opts:
+        return None
+    if "movetime" in opts:
+        return max(1, opts["movetime"] - MOVE_OVERHEAD_MS)
+    clock = opts.get("wtime" if turn == chess.WHITE else "btime")
+    if clock is None:
+        return None if "depth" in opts else engine.AI_TIME_MS
+    inc = opts.get("winc" if turn == chess.WHITE else "binc", 0)
+    moves_to_go = opts.get("movestogo", 30)
+    budget = clock / max(moves_to_go, 1) + inc * 3 // 4
+    return max(1, int(min(budget, clock / 2) - MOVE_OVERHEAD_MS))
+
+def go(tokens):
+    global search_thread
+    opts = parse_go(tokens)
+    position = board.copy()
+    time_ms = allocate_time(opts, position.turn)
+    max_depth = opts.get("depth", engine.AI_MAX_DEPTH)
+    search_mode["hold"] = "ponder" in opts or "infinite" in opts
+    if "ponder" in opts:
+        search_mode["ponder_time_ms"] = time_ms or engine.AI_TIME_MS
+        time_ms = None
+
+    def run():
+        mv = engine.best_move_for_ai(position, time_ms=time_ms, max_depth=max_depth,
+                                     workers=engine.SEARCH_WORKERS)
+        while search_mode["hold"] and not engine.search_stop.is_set():
+            engine.search_stop.wait(0.01)
+        if mv is None:
+            send("bestmove 0000")
+            return
+        pv = engine.search_info.get("pv", [])
+        if len(pv) > 1:
+            send(f"bestmove {mv.uci()} ponder {pv[1].uci()}")
+        else:
+            send(f"bestmove {mv.uci()}")
+
+    engine.clear_stop()
+    engine.search_listener = send_info
+    search_thread = threading.Thread(target=run, daemon=True)
+    search_thread.start()
+
+def ponderhit(tokens):
+    # the opponent played the ponder move: the running search gets its clock
+    engine.set_search_deadline(search_mode["ponder_time_ms"] or engine.AI_TIME_MS)
+    search_mode["hold"] = False
+
+def wait_for_search():
+    if search_thread is not None:
+        search_thread.join()
+
+def stop():
+    engine.stop_search()
+    wait_for_search()
+
+def set_option(tokens):
+    # setoption name <name> value <value>
+    if "name" not in tokens or "value" not in tokens:
+        return
+    name = " ".join(tokens[tokens.index("name") + 1:tokens.index("value")]).lower()
+    value = " ".join(tokens[tokens.index("value") + 1:])
+    if name == "threads":
+        engine.SEARCH_WORKERS = max(1, int(value))
+    elif name == "movetime":
+        engine.AI_TIME_MS = max(1, int(value))
+    elif name == "bookfile":
+        engine.open_book(value if value != "<empty>" else None)
+    elif name == "syzygypath":
+        engine.open_tablebase(value if value != "<empty>" else None)
+
+def main():
+    # read through a second file object on fd 0: the root-parallel pool forks
+    # from the search thread while this loop blocks inside sys.stdin, and the
+    # forked workers close sys.stdin on start-up, which would wait for its lock
+    commands = open(sys.stdin.fileno(), closefd=False)
+    for line in commands:
+        tokens = line.split()
+        if not tokens:
+            continue
+        cmd, args = tokens[0], tokens[1:]
+        if cmd == "uci":
+            send(f"id name {ENGINE_NAME}")
+            send(f"id author {ENGINE_AUTHOR}")
+            send(f"option name Threads type spin default {engine.SEARCH_WORKERS} min 1 max 64")
+            send(f"option name MoveTime type spin default {engine.AI_TIME_MS} min 1 max 600000")
+            send("option name Ponder type check default false")
+            send(f"option name BookFile type string default {engine.BOOK_PATH or '<empty>'}")
+            send(f"option name SyzygyPath type string default {engine.SYZYGY_PATH or '<empty>'}")
+            send("uciok")
+        elif cmd == "isready":
+            send("readyok")
+        elif cmd == "ucinewgame":
+            stop()
+            engine.tt_clear()
+        elif cmd == "position":
+            stop()
+            set_position(args)
+        elif cmd == "go":
+            stop()
+            go(args)
+        elif cmd == "stop":
+            stop()
+        elif cmd == "ponderhit":
+            ponderhit(args)
+        elif cmd == "setoption":
+            set_option(args)
+        elif cmd == "quit":
+            stop()
+            break
+    engine.shutdown_search_pool()
+
+if __name__ == "__main__":
+    main()
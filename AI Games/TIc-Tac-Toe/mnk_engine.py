@@ -0,0 +1,263 @@
+# m,n,k-game engine (k in a row on a rows x cols board: 3,3,3 is tic-tac-toe,
+# 15,15,5 is gomoku). Used by tic-tac-toe.py for every board size.
+# Importable without a display: call best_move(board). The search itself is
+# the shared game_search package; this module is the game state. On 3x3 the
+# evaluation is tictactoe_solver's solved table, so one ply is perfect play.
+import os
+import random
+import sys
+AI_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if AI_GAMES_DIR not in sys.path:
+    sys.path.insert(0, AI_GAMES_DIR)
+from game_search import MCTS, Search, WIN
+import tictactoe_solver
+# -----------------------------
+# CONFIG
+# -----------------------------
+AI_TIME_MS = 1000      # latency ceiling for one AI move
+MAX_DEPTH = 64
+FULL_WIDTH_CELLS = 25  # boards up to this size search every empty cell,
+                       # larger ones only cells next to a stone
+TT_MAX = 1 << 20       # clear the transposition table beyond this many entries
+MCTS_POLICY = "greedy" # playouts for mcts_move(): "random", "greedy" or "eval"
+MCTS_WORKERS = 1       # > 1: root-parallel playouts over a process pool
+TABLE_SCALE = 1000     # 3x3 table evaluation: solver score (+/- cells left + 1) times this
+
+EMPTY, X, O = 0, 1, 2
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+# -----------------------------
+# BOARD
+# -----------------------------
+class MNKBoard:
+    # cells[r * cols + c] is EMPTY, X or O; X moves first. Every window of k
+    # cells in a line keeps a count of X and O stones, updated on push/pop,
+    # so wins and the evaluation only look at the windows through the last move.
+    # score is the window evaluation from X's point of view. With use_table a
+    # 3,3,3 board evaluates from tictactoe_solver's table (exact win/loss), so
+    # best_move() searches one ply; without it the search goes to the end.
+    def __init__(self, rows=3, cols=3, k=3, use_table=True):
+        self.rows, self.cols, self.k = rows, cols, k
+        self.use_table = use_table and (rows, cols, k) == (3, 3, 3)
+        self.cells = [EMPTY] * (rows * cols)
+        self.turn = X
+        self.history = []                               # cells played, in order
+        self.winner = None
+        self.zobrist_key = 0
+        self.score = 0
+        self.weights = window_weights(k)
+        self.windows = []                               # list of cell tuples
+        self.cell_windows = [[] for _ in self.cells]    # window ids through each cell
+        for r in range(rows):
+            for c in range(cols):
+                for dr, dc in DIRECTIONS:
+                    er, ec = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= er < rows and 0 <= ec < cols:
+                        w = len(self.windows)
+                        cells = tuple((r + dr * i) * cols + c + dc * i for i in range(k))
+                        self.windows.append(cells)
+                        for cell in cells:
+                            self.cell_windows[cell].append(w)
+        self.counts = {X: [0] * len(self.windows), O: [0] * len(self.windows)}
+        self.neighbors = []
+        for i in range(rows * cols):
+            r, c = divmod(i, cols)
+            self.neighbors.append([rr * cols + cc for rr in range(r - 1, r + 2) for cc in range(c - 1, c + 2)
+                                   if 0 <= rr < rows and 0 <= cc < cols and (rr, cc) != (r, c)])
+        rng = random.Random(rows * 10007 + cols * 101 + k)
+        self.zobrist = {X: [rng.getrandbits(64) for _ in self.cells],
+                        O: [rng.getrandbits(64) for _ in self.cells]}
+        self.zobrist_turn = rng.getrandbits(64)
+
+    def push(self, i):
+        player = self.turn
+        self.cells[i] = player
+        self.history.append(i)
+        self.zobrist_key ^= self.zobrist[player][i] ^ self.zobrist_turn
+        counts = self.counts[player]
+        other = self.counts[O if player == X else X]
+        weights = self.weights
+        sign = 1 if player == X else -1
+        won = False
+        for w in self.cell_windows[i]:
+            n = counts[w]
+            counts[w] = n + 1
+            if not other[w]:
+                # the window grows from n to n + 1 of our stones
+                self.score += sign * (weights[n + 1] - weights[n])
+                if n + 1 == self.k:
+                    won = True
+            elif not n:
+                # the window was theirs and is now dead
+                self.score += sign * weights[other[w]]
+        if won:
+            self.winner = player
+        self.turn = O if player == X else X
+
+    def pop(self):
+        i = self.history.pop()
+        player = self.cells[i]
+        self.cells[i] = EMPTY
+        self.zobrist_key ^= self.zobrist[player][i] ^ self.zobrist_turn
+        counts = self.counts[player]
+        other = self.counts[O if player == X else X]
+        weights = self.weights
+        sign = 1 if player == X else -1
+        for w in self.cell_windows[i]:
+            n = counts[w] - 1
+            counts[w] = n
+            if not other[w]:
+                self.score -= sign * (weights[n + 1] - weights[n])
+            elif not n:
+                self.score -= sign * weights[other[w]]
+        self.winner = None
+        self.turn = player
+
+    def is_full(self):
+        return len(self.history) == len(self.cells)
+
+    def is_over(self):
+        return self.winner is not None or self.is_full()
+
+    def wins_at(self, i, player):
+        # would player complete k in a row by playing i?
+        counts = self.counts[player]
+        return any(counts[w] == self.k - 1 for w in self.cell_windows[i]
+                   if not self.counts[X if player == O else O][w])
+
+    # game state protocol (see game_search/__init__.py)
+    def moves(self):
+        return self.candidate_cells()
+
+    def result(self):
+        if self.winner is not None:
+            return -WIN     # the previous move won
+        if self.is_full():
+            return 0
+        return None
+
+    def evaluate(self):
+        if self.use_table:
+            return table_evaluate(self)
+        return evaluate(self)
+
+    def key(self):
+        return self.zobrist_key
+
+    def order_moves(self, moves, tt_move):
+        return ordered_moves(self, tt_move, moves)
+
+    def empty_cells(self):
+        return [i for i, v in enumerate(self.cells) if v == EMPTY]
+
+    def candidate_cells(self):
+        # small boards: every empty cell; large boards: empty cells next to a stone
+        if len(self.cells) <= FULL_WIDTH_CELLS:
+            return self.empty_cells()
+        if not self.history:
+            return [(self.rows // 2) * self.cols + self.cols // 2]
+        seen = set()
+        for m in self.history:
+            for nb in self.neighbors[m]:
+                if self.cells[nb] == EMPTY:
+                    seen.add(nb)
+        return list(seen)
+
+# -----------------------------
+# EVALUATION / MOVE ORDERING
+# -----------------------------
+# A window that holds only one player's stones is worth WEIGHTS[stones] to
+# that player; scores are for the side to move.
+def window_weights(k):
+    return [0] + [4 ** c for c in range(1, k + 1)]
+
+def evaluate(b):
+    return b.score if b.turn == X else -b.score
+
+def table_evaluate(b):
+    # 3x3 only: the solver's exact score for the side to move, a lookup
+    # once its table is filled (tictactoe_solver.PRECOMPUTE)
+    own = other = 0
+    for i, v in enumerate(b.cells):
+        if v == b.turn:
+            own |= 1 << i
+        elif v != EMPTY:
+            other |= 1 << i
+    return tictactoe_solver.negamax(own, other) * TABLE_SCALE
+
+def evaluate_full(b):
+    # rescan of every window; push/pop keep b.score equal to this
+    xs, os_ = b.counts[X], b.counts[O]
+    score = 0
+    for w in range(len(b.windows)):
+        if xs[w] and not os_[w]:
+            score += b.weights[xs[w]]
+        elif os_[w] and not xs[w]:
+            score -= b.weights[os_[w]]
+    return score
+
+def threat_score(b, i, weights):
+    # how much playing i extends our open windows plus how much it blocks theirs
+    me = b.turn
+    them = O if me == X else X
+    mine, theirs = b.counts[me], b.counts[them]
+    score = 0
+    for w in b.cell_windows[i]:
+        if not theirs[w]:
+            score += weights[mine[w] + 1]
+        if not mine[w]:
+            score += weights[theirs[w] + 1]
+    return score
+
+def ordered_moves(b, tt_move=None, moves=None):
+    # TT move, then winning moves, then blocks of the opponent's win, then threats
+    weights = b.weights + [0]
+    them = O if b.turn == X else X
+    scored = []
+    for i in (b.candidate_cells() if moves is None else moves):
+        if i == tt_move:
+            s = 1 << 62
+        elif b.wins_at(i, b.turn):
+            s = 1 << 61
+        elif b.wins_at(i, them):
+            s = 1 << 60
+        else:
+            s = threat_score(b, i, weights)
+        scored.append((s, i))
+    scored.sort(reverse=True)
+    return [i for _, i in scored]
+
+# -----------------------------
+# SEARCH (game_search: negamax alpha-beta, iterative deepening, TT)
+# -----------------------------
+search = Search(tt_size=TT_MAX)
+search_info = search.info     # depth, score, nodes, time, pv of the last completed iteration
+search_stats = search.stats
+
+def best_move(b, time_ms=AI_TIME_MS, max_depth=MAX_DEPTH):
+    # the move of the deepest iteration finished within time_ms
+    search.info.clear()
+    moves = ordered_moves(b)
+    if not moves:
+        return None
+    if b.wins_at(moves[0], b.turn):
+        return moves[0]
+    if b.use_table:
+        max_depth = 1
+    return search.best_move(b, time_ms, min(max_depth, len(b.cells) - len(b.history)))
+
+# -----------------------------
+# MCTS (game_search: UCT, tree reuse, optional process pool)
+# -----------------------------
+mcts = MCTS(policy=MCTS_POLICY, workers=MCTS_WORKERS)
+
+def mcts_move(b, time_ms=AI_TIME_MS):
+    # most visited move after time_ms of playouts; a cut-off playout is
+    # scored from the evaluation, where an open k-1 window is worth 4^(k-1)
+    moves = ordered_moves(b)
+    if not moves:
+        return None
+    if b.wins_at(moves[0], b.turn):
+        return moves[0]
+    mcts.eval_scale = 4.0 ** (b.k - 1)
+    return mcts.best_move(b, time_ms)
@@ -1,96 +1,82 @@
 import tkinter as tk
 from tkinter import messagebox
-import math
+import mnk_engine
+
+# Board size and line length: 3, 3, 3 is classic tic-tac-toe (evaluated from
+# the solved table in tictactoe_solver.py); e.g. 4, 4, 4 or 15, 15, 5 (gomoku)
+# work the same way.
+ROWS, COLS, K = 3, 3, 3
+AI_TIME_MS = mnk_engine.AI_TIME_MS   # latency ceiling for the AI on larger boards
+AI_PLAYER = "minimax"                # or "mcts": Monte Carlo tree search within AI_TIME_MS
 
 # Initialize main window
 root = tk.Tk()
 root.title("Tic Tac Toe (AI - Minimax)")
-root.geometry("400x450")
 root.config(bg="#f0f0f0")
+if (ROWS, COLS) == (3, 3):
+    root.geometry("400x450")
 
 # Initialize board
-board = [" " for _ in range(9)]
+board = [" " for _ in range(ROWS * COLS)]
+game = mnk_engine.MNKBoard(ROWS, COLS, K)   # same position, for the m,n,k engine
 buttons = []
 
-# Check for winner
-def check_winner(player):
-    win_combos = [
-        [0,1,2],[3,4,5],[6,7,8],
-        [0,3,6],[1,4,7],[2,5,8],
-        [0,4,8],[2,4,6]
-    ]
-    for combo in win_combos:
-        if board[combo[0]] == board[combo[1]] == board[combo[2]] == player:
+# Check for winner: only the lines through the last move can be new
+def check_winner(player, index):
+    r, c = divmod(index, COLS)
+    for dr, dc in mnk_engine.DIRECTIONS:
+        count = 1
+        for sign in (1, -1):
+            rr, cc = r + sign * dr, c + sign * dc
+            while 0 <= rr < ROWS and 0 <= cc < COLS and board[rr * COLS + cc] == player:
+                count += 1
+                rr, cc = rr + sign * dr, cc + sign * dc
+        if count >= K:
             return True
     return False
 
 def is_draw():
     return " " not in board
 
-def minimax(is_maximizing):
-    if check_winner("O"):
-        return 1
-    elif check_winner("X"):
-        return -1
-    elif is_draw():
-        return 0
-
-    if is_maximizing:
-        best_score = -math.inf
-        for i in range(9):
-            if board[i] == " ":
-                board[i] = "O"
-                score = minimax(False)
-                board[i] = " "
-                best_score = max(score, best_score)
-        return best_score
-    else:
-        best_score = math.inf
-        for i in range(9):
-            if board[i] == " ":
-                board[i] = "X"
-                score = minimax(True)
-                board[i] = " "
-                best_score = min(score, best_score)
-        return best_score
+def place(index, player):
+    board[index] = player
+    game.push(index)
 
 def ai_move():
-    best_score = -math.inf
-    move = None
-    for i in range(9):
-        if board[i] == " ":
-            board[i] = "O"
-            score = minimax(False)
-            board[i] = " "
-            if score > best_score:
-                best_score = score
-                move = i
-    board[move] = "O"
+    if AI_PLAYER == "mcts":
+        # UCT with greedy playouts, tree kept between moves (see game_search/mcts.py)
+        move = mnk_engine.mcts_move(game, AI_TIME_MS)
+    else:
+        # game_search alpha-beta with iterative deepening within AI_TIME_MS (see
+        # mnk_engine.py); on 3x3 one ply over the solver's table is perfect play
+        move = mnk_engine.best_move(game, AI_TIME_MS)
+    place(move, "O")
     buttons[move].config(text="O", state="disabled", disabledforeground="red")
-    check_game_over()
+    check_game_over("O", move)
 
-def check_game_over():
-    if check_winner("X"):
-        messagebox.showinfo("Result", "🎉 You Win!")
-        reset_game()
-    elif check_winner("O"):
-        messagebox.showinfo("Result", "😈 AI Wins!")
-        reset_game()
+def check_game_over(player, index):
+    # True if the game ended (and was reset)
+    if check_winner(player, index):
+        messagebox.showinfo("Result", "🎉 You Win!" if player == "X" else "😈 AI Wins!")
     elif is_draw():
         messagebox.showinfo("Result", "It's a Draw!")
-        reset_game()
+    else:
+        return False
+    reset_game()
+    return True
 
 def player_move(index):
     if board[index] == " ":
-        board[index] = "X"
+        place(index, "X")
         buttons[index].config(text="X", state="disabled", disabledforeground="blue")
-        check_game_over()
-        if not check_winner("X") and not is_draw():
+        if not check_game_over("X", index):
+            root.update_idletasks()
             ai_move()
 
 def reset_game():
-    global board
-    board = [" " for _ in range(9)]
+    global board, game
+    board = [" " for _ in range(ROWS * COLS)]
+    game = mnk_engine.MNKBoard(ROWS, COLS, K)
     for btn in buttons:
         btn.config(text=" ", state="normal")
 
@@ -98,14 +84,16 @@ def reset_game():
 frame = tk.Frame(root, bg="#f0f0f0")
 frame.pack(pady=20)
 
-for i in range(9):
-    btn = tk.Button(frame, text=" ", font=("Arial", 24, "bold"), width=5, height=2,
+cell_font = ("Arial", 24 if COLS <= 5 else 12, "bold")
+cell_width = 5 if COLS <= 5 else 2
+for i in range(ROWS * COLS):
+    btn = tk.Button(frame, text=" ", font=cell_font, width=cell_width, height=2 if COLS <= 5 else 1,
                     command=lambda i=i: player_move(i), bg="#fff", relief="ridge")
-    btn.grid(row=i//3, column=i%3, padx=5, pady=5)
+    btn.grid(row=i//COLS, column=i%COLS, padx=5 if COLS <= 5 else 1, pady=5 if COLS <= 5 else 1)
     buttons.append(btn)
 
 reset_btn = tk.Button(root, text="Reset", font=("Arial", 14, "bold"),
                       bg="#007BFF", fg="white", width=10, command=reset_game)
 reset_btn.pack(pady=10)
 
-root.mainloop()
\ No newline at end of file
+root.mainloop()
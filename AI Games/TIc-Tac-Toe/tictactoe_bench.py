@@ -0,0 +1,127 @@
+# Node counts and latency of the tic-tac-toe AI: the original list-based
+# minimax (every AI move re-searches the whole tree), game_search searching
+# to the end of the game (mnk_engine without the table, fresh TT per
+# position), the player the game uses (mnk_engine: one ply over the solved
+# table), and the bitmask solver, cold (empty memo table) and after a precompute.
+#   python tictactoe_bench.py
+import math
+import time
+import mnk_engine
+import tictactoe_solver as solver
+
+WIN_COMBOS = [[0,1,2],[3,4,5],[6,7,8],
+              [0,3,6],[1,4,7],[2,5,8],
+              [0,4,8],[2,4,6]]
+
+# -----------------------------
+# Original algorithm (as it was in tic-tac-toe.py), with a node counter
+# -----------------------------
+legacy_stats = {"nodes": 0}
+
+def check_winner(board, player):
+    for combo in WIN_COMBOS:
+        if board[combo[0]] == board[combo[1]] == board[combo[2]] == player:
+            return True
+    return False
+
+def legacy_minimax(board, is_maximizing):
+    legacy_stats["nodes"] += 1
+    if check_winner(board, "O"):
+        return 1
+    elif check_winner(board, "X"):
+        return -1
+    elif " " not in board:
+        return 0
+    best_score = -math.inf if is_maximizing else math.inf
+    for i in range(9):
+        if board[i] == " ":
+            board[i] = "O" if is_maximizing else "X"
+            score = legacy_minimax(board, not is_maximizing)
+            board[i] = " "
+            best_score = max(score, best_score) if is_maximizing else min(score, best_score)
+    return best_score
+
+def legacy_ai_move(board):
+    best_score = -math.inf
+    move = None
+    for i in range(9):
+        if board[i] == " ":
+            board[i] = "O"
+            score = legacy_minimax(board, False)
+            board[i] = " "
+            if score > best_score:
+                best_score = score
+                move = i
+    return move, best_score
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def positions():
+    # the empty board, then every board the AI ("O") faces after X's first move
+    yield "empty", [" "] * 9
+    for i in range(9):
+        board = [" "] * 9
+        board[i] = "X"
+        yield f"X on {i}", board
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    print(f"{'position':>10} | {'legacy nodes':>12} {'ms':>8} | {'search nodes':>12} {'ms':>6} | "
+          f"{'table nodes':>11} {'ms':>5} | {'cold nodes':>10} {'ms':>6} | {'warm nodes':>10} {'ms':>6}")
+    totals = [0, 0.0, 0, 0.0, 0, 0.0, 0, 0.0, 0, 0.0]
+    for name, board in positions():
+        legacy_stats["nodes"] = 0
+        (move, score), legacy_ms = timed(legacy_ai_move, board)
+        legacy_nodes = legacy_stats["nodes"]
+
+        game = mnk_engine.MNKBoard(3, 3, 3, use_table=False)
+        for i, cell in enumerate(board):
+            if cell != " ":
+                game.push(i)
+        mnk_engine.search.clear()
+        mnk_engine.search.reset_stats()
+        search_move, search_ms = timed(mnk_engine.best_move, game, None)
+        search_nodes = mnk_engine.search_stats["nodes"]
+
+        # as in the game: the solver's table filled at import
+        solver.clear()
+        solver.negamax(0, 0)
+        game.use_table = True
+        mnk_engine.search.clear()
+        mnk_engine.search.reset_stats()
+        table_move, table_ms = timed(mnk_engine.best_move, game, None)
+        table_nodes = mnk_engine.search_stats["nodes"]
+
+        own, other = solver.board_masks(board, "O")
+        solver.clear()
+        cold_move, cold_ms = timed(solver.best_move, own, other)
+        cold_nodes = solver.solver_stats["nodes"]
+        solver.solver_stats["nodes"] = 0
+        warm_move, warm_ms = timed(solver.best_move, own, other)
+        warm_nodes = solver.solver_stats["nodes"]
+
+        # all must agree on the game-theoretic result of the chosen move
+        for mv in (warm_move, search_move, table_move):
+            new_score = -solver.negamax(other, own | 1 << mv)
+            assert (new_score > 0) - (new_score < 0) == score, name
+        row = (legacy_nodes, legacy_ms, search_nodes, search_ms, table_nodes, table_ms,
+               cold_nodes, cold_ms, warm_nodes, warm_ms)
+        print(f"{name:>10} | {legacy_nodes:>12} {legacy_ms:>8.1f} | {search_nodes:>12} {search_ms:>6.2f} | "
+              f"{table_nodes:>11} {table_ms:>5.2f} | {cold_nodes:>10} {cold_ms:>6.2f} | {warm_nodes:>10} {warm_ms:>6.3f}")
+        for k, v in enumerate(row):
+            totals[k] += v
+    print(f"{'total':>10} | {totals[0]:>12} {totals[1]:>8.1f} | {totals[2]:>12} {totals[3]:>6.2f} | "
+          f"{totals[4]:>11} {totals[5]:>5.2f} | {totals[6]:>10} {totals[7]:>6.2f} | {totals[8]:>10} {totals[9]:>6.3f}")
+
+    solver.clear()
+    _, ms = timed(solver.negamax, 0, 0)
+    print(f"full precompute: {len(solver.solved)} canonical positions, "
+          f"{solver.solver_stats['nodes']} nodes, {ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
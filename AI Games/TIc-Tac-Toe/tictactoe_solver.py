@@ -0,0 +1,115 @@
+# Tic-tac-toe solver behind tic-tac-toe.py: mnk_engine evaluates 3x3 boards
+# from its table, so searching one ply with game_search plays perfectly.
+# Importable without a display.
+# A position is two 9-bit masks (bit i = cell i, cells numbered like the
+# buttons: 0 1 2 / 3 4 5 / 6 7 8): the side to move and the other side.
+# Scores are for the side to move: 0 draw, otherwise +/-(empty cells + 1),
+# so quicker wins and slower losses score higher.
+# -----------------------------
+# CONFIG
+# -----------------------------
+PRECOMPUTE = True      # solve the whole game once at import: every AI move is a table lookup
+
+FULL = 0b111111111
+WIN_MASKS = [0b000000111, 0b000111000, 0b111000000,    # rows
+             0b001001001, 0b010010010, 0b100100100,    # columns
+             0b100010001, 0b001010100]                 # diagonals
+
+# HAS_LINE[mask] is 1 if mask contains three in a row
+HAS_LINE = bytearray(512)
+for m in range(512):
+    HAS_LINE[m] = any(m & w == w for w in WIN_MASKS)
+
+# -----------------------------
+# SYMMETRIES
+# -----------------------------
+# The 8 symmetries of the square as cell permutations: SYMMETRIES[s][i] is
+# where cell i goes. SYM_TABLE[s][mask] maps a whole mask at once.
+def rotate(cell):
+    r, c = divmod(cell, 3)
+    return c * 3 + (2 - r)
+
+def mirror(cell):
+    r, c = divmod(cell, 3)
+    return r * 3 + (2 - c)
+
+SYMMETRIES = []
+for flip in (False, True):
+    perm = [mirror(i) if flip else i for i in range(9)]
+    for _ in range(4):
+        SYMMETRIES.append(perm)
+        perm = [rotate(p) for p in perm]
+
+SYM_TABLE = []
+for perm in SYMMETRIES:
+    table = [0] * 512
+    for m in range(512):
+        t = 0
+        for i in range(9):
+            if m >> i & 1:
+                t |= 1 << perm[i]
+        table[m] = t
+    SYM_TABLE.append(table)
+
+def canonical(own, other):
+    # smallest (own, other) key over the 8 symmetric copies of the position
+    return min(t[own] << 9 | t[other] for t in SYM_TABLE)
+
+# -----------------------------
+# SOLVER (negamax, memoized on canonical positions)
+# -----------------------------
+solved = {}            # canonical key -> score for the side to move
+solver_stats = {"nodes": 0, "hits": 0}
+
+def negamax(own, other):
+    solver_stats["nodes"] += 1
+    if HAS_LINE[other]:
+        # the side that just moved completed a line
+        return -(9 - bin(own | other).count("1") + 1)
+    if own | other == FULL:
+        return 0
+    key = canonical(own, other)
+    score = solved.get(key)
+    if score is not None:
+        solver_stats["hits"] += 1
+        return score
+    best = -10
+    empty = FULL & ~(own | other)
+    while empty:
+        bit = empty & -empty
+        empty ^= bit
+        score = -negamax(other, own | bit)
+        if score > best:
+            best = score
+    solved[key] = best
+    return best
+
+def best_move(own, other):
+    # cell for the side to move (first cell among equally good moves), or None
+    best = None
+    best_score = -10
+    for i in range(9):
+        bit = 1 << i
+        if (own | other) & bit:
+            continue
+        score = -negamax(other, own | bit)
+        if score > best_score:
+            best, best_score = i, score
+    return best
+
+def board_masks(board, player):
+    # masks of a " "/"X"/"O" list: (player's cells, opponent's cells)
+    own = other = 0
+    for i, v in enumerate(board):
+        if v == player:
+            own |= 1 << i
+        elif v != " ":
+            other |= 1 << i
+    return own, other
+
+def clear():
+    solved.clear()
+    solver_stats["nodes"] = solver_stats["hits"] = 0
+
+if PRECOMPUTE:
+    negamax(0, 0)
@@ -0,0 +1,72 @@
+# Compares the original minimax recursion (as it was in
+# "two player subtraction.py") with the table solver for growing piles.
+#   python subtraction_bench.py
+#   python subtraction_bench.py --moves 2,5,7 --max-legacy 24
+import argparse
+import math
+import time
+from subtraction_solver import SubtractionGame
+
+legacy_stats = {"nodes": 0}
+
+def legacy_minimax(stones, is_maximizing, moves):
+    legacy_stats["nodes"] += 1
+    if stones == 0:
+        return -1 if is_maximizing else 1
+    scores = []
+    for move in moves:
+        if stones - move >= 0:
+            scores.append(legacy_minimax(stones - move, not is_maximizing, moves))
+    if not scores:
+        # no legal move (only possible without 1 in the move set)
+        return -1 if is_maximizing else 1
+    return max(scores) if is_maximizing else min(scores)
+
+def legacy_ai_move(stones, moves):
+    best_score = -math.inf
+    best_move = moves[0]
+    for move in moves:
+        if stones - move >= 0:
+            score = legacy_minimax(stones - move, False, moves)
+            if score > best_score:
+                best_score = score
+                best_move = move
+    return best_move
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Subtraction game: recursion vs table solver")
+    parser.add_argument("--moves", default="1,2,3", help="allowed moves")
+    parser.add_argument("--max-legacy", type=int, default=25, help="largest pile for the recursion")
+    args = parser.parse_args(argv)
+    moves = sorted(int(m) for m in args.moves.split(","))
+
+    print(f"moves {moves}, normal play, one AI move from a pile of n stones")
+    print(f"{'n':>4} | {'legacy nodes':>12} {'ms':>9} | {'table ms':>9}")
+    for n in range(5, args.max_legacy + 1, 5):
+        legacy_stats["nodes"] = 0
+        old, legacy_ms = timed(legacy_ai_move, n, moves)
+        game = SubtractionGame(moves)
+        new, table_ms = timed(game.best_move, n)
+        # the recursion plays its first move when every move loses
+        if game.wins(n):
+            assert game.wins(n - old) == game.wins(n - new[1]) == False, n
+        print(f"{n:>4} | {legacy_stats['nodes']:>12} {legacy_ms:>9.1f} | {table_ms:>9.3f}")
+
+    print("table build for large piles:")
+    for n in (10**6, 10**7):
+        game = SubtractionGame(moves, detect_period=False)
+        _, ms = timed(game.grundy.extend, n)
+        print(f"  {n:>9} stones, full table: {ms:8.1f} ms")
+    game = SubtractionGame(moves)
+    _, ms = timed(game.wins, 10**18)
+    _, query_ms = timed(game.wins, 10**18 + 12345)
+    print(f"  10^18 stones, periodic table: {ms:.3f} ms to build ({len(game.grundy.values)} entries, "
+          f"period {game.grundy.period}), next query {query_ms:.4f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Solver for subtraction games, used by "two player subtraction.py".
+# Players alternately remove one of the allowed amounts (e.g. 1, 2 or 3)
+# from a pile; in normal play whoever cannot move (the pile is empty or too
+# small) loses, in misere play whoever cannot move wins, so taking the last
+# stone loses.
+#
+# Single piles are solved bottom-up once per configuration. The table is
+# cut off as soon as the last max(moves) values repeat: from then on the
+# sequence is periodic, so any pile size is a constant-time lookup.
+# Several piles combine by Sprague-Grundy values (XOR) in normal play;
+# misere play with several piles is solved by memoized search.
+# SubtractionState plugs a position into the shared game_search package.
+import os
+import sys
+from functools import lru_cache
+AI_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if AI_GAMES_DIR not in sys.path:
+    sys.path.insert(0, AI_GAMES_DIR)
+from game_search import WIN
+
+class PeriodicTable:
+    # values[i] = step(i, values) for i = 0, 1, ...; step may only look at
+    # the last `span` values. Stops growing once a window of `span` values
+    # repeats (or at `limit` entries when detect_period is False).
+    def __init__(self, step, span, detect_period=True):
+        self.step = step
+        self.span = span
+        self.detect_period = detect_period
+        self.values = bytearray()
+        self.seen = {}              # window of the last `span` values -> end index
+        self.repeat_from = None     # values[n] == values[n - period] for n >= repeat_from
+        self.period = None
+
+    def extend(self, limit):
+        values, span = self.values, self.span
+        for i in range(len(values), limit + 1):
+            if self.period is not None:
+                return
+            values.append(self.step(i, values))
+            # every move is legal from pile span on, so the next value only
+            # depends on this window
+            if self.detect_period and i >= span - 1:
+                window = bytes(values[i - span + 1:i + 1])
+                j = self.seen.get(window)
+                if j is not None:
+                    self.period = i - j
+                    self.repeat_from = j + 1
+                else:
+                    self.seen[window] = i
+
+    def __getitem__(self, n):
+        if n >= len(self.values):
+            self.extend(n)
+        if n < len(self.values):
+            return self.values[n]
+        return self.values[self.repeat_from + (n - self.repeat_from) % self.period]
+
+class SubtractionGame:
+    def __init__(self, moves=(1, 2, 3), misere=False, detect_period=True):
+        self.moves = sorted(set(moves))
+        self.misere = misere
+        span = self.moves[-1]
+        self.grundy = PeriodicTable(self._grundy_step, span, detect_period)
+        self.misere_win = PeriodicTable(self._misere_step, span, detect_period)
+
+    def _grundy_step(self, i, values):
+        # mex of the Grundy values one move away
+        reachable = {values[i - m] for m in self.moves if m <= i}
+        g = 0
+        while g in reachable:
+            g += 1
+        return g
+
+    def _misere_step(self, i, values):
+        # 1 if the player to move wins a single misere pile of i
+        options = [values[i - m] for m in self.moves if m <= i]
+        return 1 if not options or 0 in options else 0
+
+    def legal_moves(self, stones):
+        return [m for m in self.moves if m <= stones]
+
+    def wins(self, piles):
+        # True if the player to move wins with correct play
+        if isinstance(piles, int):
+            piles = (piles,)
+        if not self.misere:
+            x = 0
+            for p in piles:
+                x ^= self.grundy[p]
+            return x != 0
+        live = [p for p in piles if self.legal_moves(p)]
+        if len(live) <= 1:
+            return bool(self.misere_win[live[0]]) if live else True
+        return self._misere_multi(tuple(sorted(live)))
+
+    @lru_cache(maxsize=None)
+    def _misere_multi(self, piles):
+        for i, p in enumerate(piles):
+            for m in self.legal_moves(p):
+                rest = piles[:i] + (p - m,) + piles[i + 1:]
+                if not self.wins(rest):
+                    return True
+        return False
+
+    def best_move(self, piles):
+        # (pile index, stones to take), winning if possible, otherwise the
+        # smallest legal move; None if the player to move has no move
+        if isinstance(piles, int):
+            piles = (piles,)
+        fallback = None
+        for i, p in enumerate(piles):
+            for m in self.legal_moves(p):
+                if fallback is None:
+                    fallback = (i, m)
+                rest = piles[:i] + (p - m,) + piles[i + 1:]
+                if not self.wins(rest):
+                    return i, m
+        return fallback
+
+class SubtractionState:
+    # game state protocol (see game_search/__init__.py). The game is
+    # impartial, so the sorted piles are the whole position. With
+    # use_table the evaluation is the exact win/loss from the tables, so a
+    # one-ply search already plays perfectly; without it the search has to
+    # reach the end of the game.
+    def __init__(self, game, piles, use_table=True):
+        self.game = game
+        self.piles = list(piles)
+        self.use_table = use_table
+        self.history = []
+
+    def moves(self):
+        return [(i, m) for i, p in enumerate(self.piles) for m in self.game.legal_moves(p)]
+
+    def push(self, move):
+        i, m = move
+        self.piles[i] -= m
+        self.history.append(move)
+
+    def pop(self):
+        i, m = self.history.pop()
+        self.piles[i] += m
+
+    def result(self):
+        if any(self.game.legal_moves(p) for p in self.piles):
+            return None
+        return WIN if self.game.misere else -WIN
+
+    def evaluate(self):
+        if not self.use_table:
+            return 0
+        return 1000 if self.game.wins(self.piles) else -1000
+
+    def key(self):
+        return tuple(sorted(self.piles))
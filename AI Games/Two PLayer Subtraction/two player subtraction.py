@@ -1,36 +1,21 @@
 import tkinter as tk
 from tkinter import messagebox
-import math
+from subtraction_solver import SubtractionGame, SubtractionState
+from game_search import Search
 
-# ----------------- Minimax Algorithm -----------------
-def minimax(stones, is_maximizing):
-    if stones == 0:
-        if is_maximizing:
-            return -1   
-        else:
-            return 1    
+# ----------------- Game Configuration -----------------
+MOVES = [1, 2, 3]      # stones a player may remove
+MISERE = False         # True: whoever takes the last stone loses
+STONES = 25
 
-    scores = [] 
-
-    for move in [1, 2, 3]:
-        if stones - move >= 0:
-            next_score = minimax(stones - move, not is_maximizing)
-            scores.append(next_score)
-
-    return max(scores) if is_maximizing else min(scores)
+game = SubtractionGame(MOVES, MISERE)   # win/loss table, built once
+search = Search()
 
 def ai_move(stones):
-    best_score = -math.inf
-    best_move = 1
-
-    for move in [1, 2, 3]:
-        if stones - move >= 0:
-            score = minimax(stones - move, False)
-            if score > best_score:
-                best_score = score
-                best_move = move
-
-    return best_move
+    # one ply of game_search over the exact table evaluation: a winning move
+    # if there is one, otherwise the smallest legal move
+    state = SubtractionState(game, [stones])
+    return search.best_move(state, max_depth=1)[1]
 # ----------------- Game Logic -----------------
 def update_stones_display():
     canvas.delete("all")
@@ -41,6 +26,12 @@ def update_stones_display():
         canvas.create_oval(x, y, x + 50, y + 50, fill=color, outline="#333", width=2)
         canvas.create_text(x + 25, y + 25, text=str(stones - i), fill="white", font=("Helvetica", 14, "bold"))
 
+def game_over(mover_is_ai):
+    # the last mover left no legal move: in normal play they win, in misere they lose
+    ai_wins = mover_is_ai != MISERE
+    messagebox.showinfo("Game Over", "AI wins! 🤖" if ai_wins else "You win! 🎉")
+    root.destroy()
+
 def player_move(move):
     global stones
     if move > stones:
@@ -50,9 +41,8 @@ def player_move(move):
     stones -= move
     update_stones_display()
 
-    if stones == 0:
-        messagebox.showinfo("Game Over", "You win! 🎉")
-        root.destroy()
+    if not game.legal_moves(stones):
+        game_over(False)
         return
 
     root.after(500, ai_turn)
@@ -64,12 +54,11 @@ def ai_turn():
     update_stones_display()
     ai_label.config(text=f"AI removed {move} stone{'s' if move > 1 else ''}")
 
-    if stones == 0:
-        messagebox.showinfo("Game Over", "AI wins! 🤖")
-        root.destroy()
+    if not game.legal_moves(stones):
+        game_over(True)
         return
 # ----------------- GUI Setup -----------------
-stones = 25
+stones = STONES
 root = tk.Tk()
 root.title("Subtraction Game")
 root.configure(bg="#2C3E50")
@@ -89,8 +78,8 @@ buttons_frame.pack(pady=10)
 
 btn_style = {"font": ("Helvetica", 16, "bold"), "bg": "#1ABC9C", "fg": "white", "width": 10, "height": 2, "bd": 0, "activebackground": "#16A085"}
 
-for i in [1, 2, 3]:
+for col, i in enumerate(MOVES):
     btn = tk.Button(buttons_frame, text=f"Remove {i}", **btn_style, command=lambda i=i: player_move(i))
-    btn.grid(row=0, column=i - 1, padx=15, pady=10)
+    btn.grid(row=0, column=col, padx=15, pady=10)
 
 root.mainloop()
@@ -0,0 +1,37 @@
+# Game-tree search shared by the AI games (chess, tic-tac-toe / m,n,k,
+# subtraction). A game plugs in by implementing the game state protocol:
+#
+#   state.moves()        legal moves for the side to move (hashable values)
+#   state.push(move)     play a move
+#   state.pop()          undo the last move
+#   state.result()       None while the game goes on, otherwise the score for
+#                        the side to move: -WIN lost, 0 draw, WIN won
+#   state.evaluate()     heuristic score for the side to move
+#   state.key()          hashable key of the position, for the transposition table
+#
+# and optionally
+#
+#   state.order_moves(moves, tt_move)   moves in the order to search them
+#   state.record_cutoff(move, depth)    called when move caused a beta cutoff
+#                                       (default: a history table kept by Search)
+#   state.quiesce(alpha, beta)          leaf score from a quiet-position search,
+#                                       used instead of evaluate() at the horizon
+#   state.extension(ply, root_depth)    plies to search this node deeper (e.g. in check)
+#   state.null_move_ok(depth, beta)     whether to try passing here (null-move
+#   state.push_null()                   pruning); push_null() passes, pop() undoes it
+#   state.reduction(move, index, depth) plies to search a late move shallower
+#                                       first (late move reductions)
+#
+# Then:  search = Search();  move = search.best_move(state, time_ms=500)
+# Search(pvs=True) searches every move after the first with a null window
+# (principal variation search); table= and poll= plug in a game's own
+# transposition table and stop/clock check (chess_engine uses both).
+# search.stats counts nodes, leaves, TT probes/hits and cutoffs,
+# search.info holds depth, score, nodes, time and PV of the last iteration.
+#
+# MCTS (mcts.py) is a drop-in alternative on the same protocol:
+#   mcts = MCTS(puct=True, policy="greedy");  move = mcts.best_move(state, time_ms=500)
+# python -m game_search.arena plays it against Search at equal time.
+# Games import it after adding "AI Games" to sys.path.
+from .search import Search, SearchTimeout, WIN, WIN_BOUND
+from .mcts import MCTS, PLAYOUT_POLICIES
@@ -0,0 +1,111 @@
+# MCTS against the minimax player (Search) at equal time per move, colours
+# alternating. From "AI Games":
+#   python -m game_search.arena --game mnk:7,7,4 --time 200 --games 20
+#   python -m game_search.arena --game chess --time 500 --games 10 --mcts "puct=1,policy=eval,c=1.0"
+#   python -m game_search.arena --game mnk:15,15,5 --mcts "workers=4,parallel=leaf,policy=greedy"
+import argparse
+import math
+import os
+import sys
+import time
+from .search import Search
+from .mcts import MCTS
+
+AI_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for folder in ("Chess", "TIc-Tac-Toe", "Two PLayer Subtraction"):
+    path = os.path.join(AI_GAMES_DIR, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+def parse_mcts(text):
+    # "c=1.0,puct=1,policy=greedy,workers=4,parallel=leaf" -> MCTS keyword arguments
+    types = {"c": float, "puct": lambda v: v not in ("0", "false", "False"), "policy": str,
+             "max_playout_plies": int, "eval_scale": float, "workers": int, "parallel": str,
+             "reuse_tree": lambda v: v not in ("0", "false", "False"), "seed": int}
+    config = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, value = item.partition("=")
+        if name not in types:
+            raise ValueError(f"unknown MCTS setting: {name}")
+        config[name] = types[name](value)
+    return config
+
+def new_game(spec):
+    # "mnk:R,C,K", "chess" or "chess:<fen>"; returns (state, MCTS defaults)
+    name, _, arg = spec.partition(":")
+    if name == "mnk":
+        import mnk_engine
+        rows, cols, k = (int(x) for x in (arg or "7,7,4").split(","))
+        return mnk_engine.MNKBoard(rows, cols, k), {"policy": "greedy", "eval_scale": 4.0 ** (k - 1)}
+    if name == "chess":
+        import chess
+        import chess_engine
+        from chess_state import ChessState
+        chess_engine.open_book(None)
+        chess_engine.open_tablebase(None)
+        return ChessState(chess.Board(arg) if arg else chess.Board()), {"policy": "eval", "puct": True, "c": 1.0}
+    raise ValueError(f"unknown game: {spec}")
+
+def play(spec, players, time_ms, max_plies):
+    # players[0] moves first; returns (index of the winner or None, plies)
+    state, _ = new_game(spec)
+    plies = 0
+    while state.result() is None and plies < max_plies:
+        mv = players[plies % 2].best_move(state, time_ms)
+        if mv is None:
+            break
+        state.push(mv)
+        plies += 1
+    result = state.result()
+    if not result:
+        return None, plies
+    # result is for the side to move
+    mover = plies % 2
+    return (mover if result > 0 else 1 - mover), plies
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MCTS vs minimax at equal time per move")
+    parser.add_argument("--game", default="mnk:7,7,4", help="mnk:R,C,K or chess[:fen]")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--time", type=int, default=200, help="ms per move for both players")
+    parser.add_argument("--mcts", default="", help="MCTS settings, e.g. puct=1,policy=greedy,workers=4")
+    parser.add_argument("--max-plies", type=int, default=300, help="adjudicate a draw after this many plies")
+    args = parser.parse_args(argv)
+
+    _, defaults = new_game(args.game)
+    config = dict(defaults, **parse_mcts(args.mcts))
+    mcts = MCTS(**config)
+    wins = draws = losses = 0
+    playouts = nodes = 0
+    start = time.monotonic()
+    try:
+        for i in range(args.games):
+            # a fresh minimax player per game; MCTS keeps its pool and reuses its tree
+            minimax = Search()
+            mcts.clear()
+            players = [mcts, minimax] if i % 2 == 0 else [minimax, mcts]
+            winner, plies = play(args.game, players, args.time, args.max_plies)
+            playouts += mcts.stats["playouts"]
+            nodes += minimax.stats["nodes"]
+            mcts.reset_stats()
+            if winner is None:
+                draws += 1
+            elif players[winner] is mcts:
+                wins += 1
+            else:
+                losses += 1
+            n = wins + draws + losses
+            score = (wins + 0.5 * draws) / n
+            err = 1.96 * math.sqrt(max(score * (1 - score), 0.0) / n)
+            first = "MCTS" if i % 2 == 0 else "minimax"
+            print(f"game {n:>3}/{args.games}  {first:>7} first  {plies:>3} plies  "
+                  f"MCTS +{wins} ={draws} -{losses}  score {100 * score:5.1f}% +/- {100 * err:.1f}")
+    finally:
+        mcts.close()
+    elapsed = time.monotonic() - start
+    print(f"MCTS settings: {config}")
+    print(f"MCTS playouts {playouts}, minimax nodes {nodes}, {elapsed:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
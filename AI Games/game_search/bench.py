@@ -0,0 +1,90 @@
+# Side-by-side benchmark of every game on the shared search. From "AI Games":
+#   python -m game_search.bench
+#   python -m game_search.bench --time 2000 --chess-depth 4
+import argparse
+import os
+import sys
+import time
+from .search import Search
+
+AI_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for folder in ("Chess", "TIc-Tac-Toe", "Two PLayer Subtraction"):
+    path = os.path.join(AI_GAMES_DIR, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+def run(name, state, time_ms=None, max_depth=64):
+    search = Search()
+    start = time.perf_counter()
+    mv = search.best_move(state, time_ms=time_ms, max_depth=max_depth)
+    secs = time.perf_counter() - start
+    s = search.stats
+    return {"name": name, "move": mv, "depth": search.info.get("depth", 0), "nodes": s["nodes"],
+            "time": secs, "nps": int(s["nodes"] / secs) if secs > 0 else 0,
+            "tt_hit": s["tt_hits"] / s["tt_probes"] if s["tt_probes"] else 0.0,
+            "first_cut": s["first_move_cutoffs"] / s["cutoffs"] if s["cutoffs"] else 0.0}
+
+def mnk_cases(time_ms):
+    import mnk_engine
+    cases = [("tic-tac-toe 3x3 (solve)", mnk_engine.MNKBoard(3, 3, 3, use_table=False), None, 9),
+             ("tic-tac-toe 3x3 (table eval)", mnk_engine.MNKBoard(3, 3, 3), None, 1)]
+    cases.append(("m,n,k 4x4x4", mnk_engine.MNKBoard(4, 4, 4), time_ms, 16))
+    board = mnk_engine.MNKBoard(15, 15, 5)
+    for cell in (112, 113, 97, 127, 98, 96):
+        board.push(cell)
+    cases.append(("gomoku 15x15x5, 6 stones", board, time_ms, 64))
+    return cases
+
+def subtraction_cases():
+    from subtraction_solver import SubtractionGame, SubtractionState
+    game = SubtractionGame([1, 2, 3])
+    return [("subtraction 25 (search)", SubtractionState(game, [25], use_table=False), None, 64),
+            ("subtraction 7,9,12 (search)", SubtractionState(game, [7, 9, 12], use_table=False), None, 64),
+            ("subtraction 10^9 (table eval)", SubtractionState(game, [10 ** 9]), None, 1)]
+
+def chess_cases(depth):
+    import chess
+    import chess_bench
+    import chess_engine
+    from chess_state import ChessState
+    chess_engine.open_book(None)
+    chess_engine.open_tablebase(None)
+    cases = []
+    for pos in chess_bench.load_suite(chess_bench.DEFAULT_SUITE)[:4]:
+        cases.append((f"chess {pos['id']}", pos["fen"]))
+    results = []
+    for name, fen in cases:
+        chess_engine.clear_move_ordering()
+        generic = run(f"{name} (plain Search)", ChessState(chess.Board(fen)), max_depth=depth)
+        # the engine's Search: PVS, its own hash tables, and the time/stop polling
+        chess_engine.tt_clear()
+        board = chess.Board(fen)
+        start = time.perf_counter()
+        mv = chess_engine.best_move_for_ai(board, time_ms=None, max_depth=depth)
+        secs = time.perf_counter() - start
+        nodes = chess_engine.search_stats["nodes"]
+        own = {"name": f"{name} (chess_engine pvs)", "move": mv, "depth": depth, "nodes": nodes,
+               "time": secs, "nps": int(nodes / secs) if secs > 0 else 0,
+               "tt_hit": None, "first_cut": None}
+        results += [generic, own]
+    return results
+
+def print_result(r):
+    tt = f"{100 * r['tt_hit']:5.1f}%" if r["tt_hit"] is not None else "    -"
+    cut = f"{100 * r['first_cut']:5.1f}%" if r["first_cut"] is not None else "    -"
+    print(f"{r['name']:<44} depth {r['depth']:>2}  nodes {r['nodes']:>8}  time {r['time']:7.3f}s  "
+          f"nps {r['nps']:>7}  tt hits {tt}  1st-move cutoffs {cut}  move {r['move']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark all games on game_search")
+    parser.add_argument("--time", type=int, default=1000, help="ms per timed position")
+    parser.add_argument("--chess-depth", type=int, default=3, help="fixed depth for the chess positions")
+    args = parser.parse_args(argv)
+    for name, state, time_ms, max_depth in mnk_cases(args.time) + subtraction_cases():
+        print_result(run(name, state, time_ms, max_depth))
+    for r in chess_cases(args.chess_depth):
+        print_result(r)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# Monte Carlo Tree Search for any game that implements the game state
+# protocol described in __init__.py. Sampling instead of a full-width
+# search: every playout costs about the same, so the time (or playout)
+# budget is kept to the millisecond whatever the branching factor.
+#
+# Selection is UCT (UCB1) or PUCT (priors from the move ordering); the tree
+# is kept between moves and reused when the new position was already in it.
+# Playouts are random, greedy (first move of state.order_moves, with some
+# randomness) or replaced by the evaluation ("eval"). With workers > 1 the
+# playouts run in a process pool: "root" parallel searches independent
+# trees and adds up their root visits, "leaf" parallel runs a batch of
+# playouts from every new leaf. The state must then be picklable.
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# -----------------------------
+# Playout policies
+# -----------------------------
+# policy(state, moves, rng) -> move to play in a playout
+def random_policy(state, moves, rng):
+    return rng.choice(moves)
+
+def greedy_policy(state, moves, rng, epsilon=0.25):
+    if rng.random() < epsilon or not hasattr(state, "order_moves"):
+        return rng.choice(moves)
+    return state.order_moves(moves, None)[0]
+
+PLAYOUT_POLICIES = {"random": random_policy, "greedy": greedy_policy, "eval": None}
+
+def outcome(result):
+    # game result for the side to move -> reward in [0, 1]
+    return 1.0 if result > 0 else 0.0 if result < 0 else 0.5
+
+def squash(score, scale):
+    # evaluation for the side to move -> expected reward, Elo-style logistic
+    return 1.0 / (1.0 + 10.0 ** (-score / scale))
+
+def playout(state, policy, max_plies, eval_scale, rng):
+    # reward for the side to move in state; state is restored afterwards
+    result = state.result()
+    plies = 0
+    while result is None and plies < max_plies and policy is not None:
+        moves = list(state.moves())
+        if not moves:
+            break
+        state.push(policy(state, moves, rng))
+        plies += 1
+        result = state.result()
+    reward = outcome(result) if result is not None else squash(state.evaluate(), eval_scale)
+    for _ in range(plies):
+        state.pop()
+    # the reward is for whoever is to move at the end of the playout
+    return reward if plies % 2 == 0 else 1.0 - reward
+
+# -----------------------------
+# Tree
+# -----------------------------
+UNKNOWN = object()
+
+class Node:
+    # wins: reward summed over the playouts through this node, for the
+    # player who made `move` (the side to move at the parent)
+    __slots__ = ("move", "parent", "children", "visits", "wins", "prior", "key", "result")
+
+    def __init__(self, move=None, parent=None, prior=1.0):
+        self.move = move
+        self.parent = parent
+        self.children = None        # None until expanded
+        self.visits = 0
+        self.wins = 0.0
+        self.prior = prior
+        self.key = None
+        self.result = UNKNOWN
+
+    def size(self):
+        n, stack = 0, [self]
+        while stack:
+            node = stack.pop()
+            n += 1
+            if node.children:
+                stack.extend(node.children)
+        return n
+
+def move_priors(state, moves):
+    # PUCT priors: state.move_priors(moves) if the game has it, otherwise
+    # falling with the rank in state.order_moves, otherwise uniform
+    if hasattr(state, "move_priors"):
+        return moves, state.move_priors(moves)
+    if hasattr(state, "order_moves"):
+        moves = state.order_moves(moves, None)
+        weights = [1.0 / (rank + 1) for rank in range(len(moves))]
+    else:
+        weights = [1.0] * len(moves)
+    total = sum(weights)
+    return moves, [w / total for w in weights]
+
+# -----------------------------
+# Search
+# -----------------------------
+class MCTS:
+    # One MCTS per game, like Search: the tree and the process pool are kept
+    # between moves. stats is cumulative until reset_stats(); info describes
+    # the last best_move() call.
+    def __init__(self, c=1.4, puct=False, policy="random", max_playout_plies=200, eval_scale=400.0,
+                 workers=1, parallel="root", reuse_tree=True, seed=None):
+        self.c = c
+        self.puct = puct
+        self.policy_name = policy if isinstance(policy, str) else None
+        self.policy = PLAYOUT_POLICIES[policy] if isinstance(policy, str) else policy
+        self.max_playout_plies = max_playout_plies
+        self.eval_scale = eval_scale
+        self.workers = workers
+        self.parallel = parallel
+        self.reuse_tree = reuse_tree
+        self.rng = random.Random(seed)
+        self.root = None
+        self.pool = None
+        self.stopped = False
+        self.stats = {}
+        self.info = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats.update(playouts=0, expansions=0, reused=0)
+
+    def clear(self):
+        self.root = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def stop(self):
+        # ends a running best_move() after the current playout (any thread)
+        self.stopped = True
+
+    def config(self):
+        # settings for a worker process; only named policies can be sent
+        return dict(c=self.c, puct=self.puct, policy=self.policy_name or "random",
+                    max_playout_plies=self.max_playout_plies, eval_scale=self.eval_scale)
+
+    def get_pool(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self.pool
+
+    # -----------------------------
+    # Selection / expansion
+    # -----------------------------
+    def select(self, node):
+        log_n = math.log(node.visits) if node.visits else 0.0
+        sqrt_n = math.sqrt(node.visits)
+        best, best_score = None, -1.0
+        for child in node.children:
+            if self.puct:
+                q = child.wins / child.visits if child.visits else 0.5
+                score = q + self.c * child.prior * sqrt_n / (1 + child.visits)
+            elif not child.visits:
+                return child        # UCT: every move once, in the game's move order
+            else:
+                score = child.wins / child.visits + self.c * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def expand(self, node, state):
+        moves = list(state.moves())
+        if self.puct:
+            moves, priors = move_priors(state, moves)
+        else:
+            if hasattr(state, "order_moves"):
+                moves = state.order_moves(moves, None)
+            priors = [1.0] * len(moves)
+        node.children = [Node(mv, node, p) for mv, p in zip(moves, priors)]
+        self.stats["expansions"] += 1
+
+    def node_result(self, node, state):
+        if node.result is UNKNOWN:
+            node.result = state.result()
+            node.key = state.key()
+        return node.result
+
+    def iterate(self, state, leaf_batch=None):
+        # one selection / expansion / playout / backup; returns the depth reached
+        node, depth = self.root, 0
+        while node.children and self.node_result(node, state) is None:
+            node = self.select(node)
+            state.push(node.move)
+            depth += 1
+        result = self.node_result(node, state)
+        if result is None and node.children is None and (node.visits or node is self.root):
+            self.expand(node, state)
+            if node.children:
+                node = self.select(node)
+                state.push(node.move)
+                depth += 1
+                result = self.node_result(node, state)
+        # reward for the side to move at node
+        if result is not None:
+            rewards, n = outcome(result), 1
+        elif leaf_batch is not None:
+            rewards, n = leaf_batch(state)
+        else:
+            rewards, n = playout(state, self.policy, self.max_playout_plies, self.eval_scale, self.rng), 1
+        self.stats["playouts"] += n
+        # back up: the player who moved into node gets n - rewards
+        reward = n - rewards
+        for _ in range(depth):
+            node.visits += n
+            node.wins += reward
+            reward = n - reward
+            node = node.parent
+            state.pop()
+        node.visits += n
+        node.wins += reward
+        return depth
+
+    # -----------------------------
+    # Tree reuse
+    # -----------------------------
+    def find_root(self, state):
+        # the node for state among the last root and its first two plies
+        # (our move and the reply), if it was visited
+        key = state.key()
+        level = [self.root] if self.root is not None else []
+        for _ in range(3):
+            for node in level:
+                if node.key == key:
+                    return node
+            level = [child for node in level if node.children for child in node.children if child.key is not None]
+        return None
+
+    # -----------------------------
+    # Driver
+    # -----------------------------
+    def best_move(self, state, time_ms=None, playouts=None):
+        # the most visited root move after time_ms or `playouts` playouts,
+        # whichever comes first (at least one of them should be given; with
+        # neither, the search runs until stop())
+        self.info.clear()
+        self.stopped = False
+        moves = list(state.moves())
+        if not moves or state.result() is not None:
+            return None
+        if len(moves) == 1:
+            return moves[0]
+        start = time.monotonic()
+        deadline = None if time_ms is None else start + time_ms / 1000.0
+        if self.workers > 1 and self.parallel == "root":
+            return self.root_parallel(state, start, time_ms, playouts)
+
+        root = self.find_root(state) if self.reuse_tree else None
+        if root is not None:
+            self.stats["reused"] += root.visits
+            root.parent = None
+            root.move = None
+        else:
+            root = Node()
+        self.root = root
+        leaf_batch = self.leaf_batch if self.workers > 1 and self.parallel == "leaf" else None
+        done, max_depth = 0, 0
+        before = self.stats["playouts"]
+        while not self.stopped:
+            if playouts is not None and done >= playouts:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            max_depth = max(max_depth, self.iterate(state, leaf_batch))
+            done = self.stats["playouts"] - before
+        best = max(root.children, key=lambda ch: ch.visits) if root.children else None
+        self.report(start, done, max_depth, [(ch.move, ch.visits, ch.wins) for ch in root.children or []])
+        return best.move if best is not None else moves[0]
+
+    def report(self, start, done, max_depth, children):
+        elapsed = time.monotonic() - start
+        children = sorted(children, key=lambda c: c[1], reverse=True)
+        pv = [children[0][0]] if children else []
+        score = children[0][2] / children[0][1] if children and children[0][1] else 0.5
+        self.info.update(playouts=done, time=elapsed, depth=max_depth,
+                         pps=int(done / elapsed) if elapsed > 0 else 0,
+                         win_rate=score, pv=pv, children=children,
+                         tree_size=self.root.size() if self.root is not None else 0)
+
+    def leaf_batch(self, state):
+        # one playout per worker from this leaf; returns (reward sum, count)
+        pool = self.get_pool()
+        seeds = [self.rng.getrandbits(32) for _ in range(self.workers)]
+        jobs = [pool.submit(run_playout, state, self.config(), seed) for seed in seeds]
+        return sum(job.result() for job in jobs), len(jobs)
+
+    def root_parallel(self, state, start, time_ms, playouts):
+        # independent trees in every worker, root statistics added up; the
+        # trees stay in the workers, so there is no tree reuse here. Needs a
+        # time or playout budget: stop() does not reach the workers.
+        pool = self.get_pool()
+        if time_ms is not None:
+            time_ms = max(1, time_ms - 1000 * (time.monotonic() - start))
+        share = None if playouts is None else max(1, playouts // self.workers)
+        jobs = [pool.submit(run_tree, state, self.config(), time_ms, share, self.rng.getrandbits(32))
+                for _ in range(self.workers)]
+        merged, done, max_depth = {}, 0, 0
+        for job in jobs:
+            children, n, depth = job.result()
+            done += n
+            max_depth = max(max_depth, depth)
+            for mv, visits, wins in children:
+                v, w = merged.get(mv, (0, 0.0))
+                merged[mv] = (v + visits, w + wins)
+        self.stats["playouts"] += done
+        self.root = None
+        children = [(mv, v, w) for mv, (v, w) in merged.items()]
+        self.report(start, done, max_depth, children)
+        if not children:
+            return next(iter(state.moves()))
+        return max(children, key=lambda c: c[1])[0]
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def run_playout(state, config, seed):
+    policy = PLAYOUT_POLICIES[config["policy"]]
+    return playout(state, policy, config["max_playout_plies"], config["eval_scale"], random.Random(seed))
+
+def run_tree(state, config, time_ms, playouts, seed):
+    mcts = MCTS(seed=seed, reuse_tree=False, **config)
+    mcts.best_move(state, time_ms, playouts)
+    return mcts.info.get("children", []), mcts.info.get("playouts", 0), mcts.info.get("depth", 0)
@@ -0,0 +1,256 @@
+# Negamax alpha-beta with iterative deepening, a transposition table, move
+# ordering hooks and node counters, for any game that implements the game
+# state protocol described in __init__.py. Principal variation search is a
+# switch (pvs=True); null-move pruning, late move reductions and extensions
+# are used when the state provides the optional hooks for them.
+import time
+
+WIN = 1000000             # a win in n plies scores WIN - n
+WIN_BOUND = WIN - 10000   # scores beyond this are forced wins / losses
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class SearchTimeout(Exception):
+    pass
+
+class Search:
+    # One Search per game: the TT, history table and counters are kept
+    # between moves. stats is cumulative until reset_stats(); info describes
+    # the last completed iteration of the last best_move() call.
+    # table: anything with get(key), table[key] = entry and clear() to use
+    # instead of a dict (e.g. a game's fixed-size tables); poll: called every
+    # check_every nodes, may raise SearchTimeout to stop the search.
+    def __init__(self, tt_size=1 << 20, check_every=256, pvs=False, table=None, poll=None):
+        self.tt = {} if table is None else table    # key -> (depth, score, bound, move)
+        self.tt_size = tt_size
+        self.check_mask = check_every - 1
+        self.pvs = pvs
+        self.poll = poll
+        self.root_depth = 0             # nominal depth of the current iteration
+        self.history = {}               # move -> cutoff score, for move ordering
+        self.stats = {}
+        self.info = {}
+        self.deadline = None
+        self.ply = 0
+        self.quiesce = False            # set per search by start(): the state has quiesce(),
+        self.extensions = False         # extension(), null_move_ok() / push_null(),
+        self.null_moves = False         # reduction()
+        self.reductions = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats.update(nodes=0, leaves=0, tt_probes=0, tt_hits=0, cutoffs=0, first_move_cutoffs=0,
+                          null_cutoffs=0, reductions=0, researches=0)
+
+    def clear(self):
+        self.tt.clear()
+        self.history.clear()
+
+    # -----------------------------
+    # Move ordering
+    # -----------------------------
+    def ordered_moves(self, state, tt_move):
+        moves = list(state.moves())
+        if hasattr(state, "order_moves"):
+            moves = state.order_moves(moves, tt_move)
+        else:
+            history = self.history
+            moves.sort(key=lambda mv: history.get(mv, 0), reverse=True)
+        if tt_move is not None and tt_move in moves and moves[0] != tt_move:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        return moves
+
+    def record_cutoff(self, state, mv, depth, index):
+        self.stats["cutoffs"] += 1
+        if index == 0:
+            self.stats["first_move_cutoffs"] += 1
+        if hasattr(state, "record_cutoff"):
+            state.record_cutoff(mv, depth)
+        else:
+            self.history[mv] = self.history.get(mv, 0) + depth * depth
+
+    # -----------------------------
+    # Search
+    # -----------------------------
+    def push(self, state, mv):
+        state.push(mv)
+        self.ply += 1
+
+    def pop(self, state):
+        state.pop()
+        self.ply -= 1
+
+    def negamax(self, state, depth, alpha, beta, allow_null=True):
+        stats = self.stats
+        stats["nodes"] += 1
+        if stats["nodes"] & self.check_mask == 0:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                raise SearchTimeout()
+            if self.poll is not None:
+                self.poll()
+        ply = self.ply
+        result = state.result()
+        if result is not None:
+            # terminal: prefer quick wins and slow losses
+            if result >= WIN_BOUND:
+                return result - ply
+            if result <= -WIN_BOUND:
+                return result + ply
+            return result
+        if self.extensions:
+            depth += state.extension(ply, self.root_depth)
+        if depth <= 0:
+            stats["leaves"] += 1
+            if self.quiesce:
+                return state.quiesce(alpha, beta)
+            return state.evaluate()
+
+        alpha_orig = alpha
+        pv_node = beta - alpha > 1
+        key = state.key()
+        tt_move = None
+        stats["tt_probes"] += 1
+        entry = self.tt.get(key)
+        if entry is not None:
+            tt_move = entry[3]
+            if entry[0] >= depth:
+                stats["tt_hits"] += 1
+                score = entry[1]
+                if score >= WIN_BOUND:
+                    score -= ply
+                elif score <= -WIN_BOUND:
+                    score += ply
+                bound = entry[2]
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    return score
+
+        # null move: if passing still fails high, a real move would too
+        if allow_null and not pv_node and self.null_moves and state.null_move_ok(depth, beta):
+            r = 2 if depth < 7 else 3
+            state.push_null()
+            self.ply += 1
+            score = -self.negamax(state, depth - 1 - r, -beta, -beta + 1, False)
+            self.pop(state)
+            if score >= beta:
+                stats["null_cutoffs"] += 1
+                return beta if score >= WIN_BOUND else score
+
+        best, best_mv = -WIN - 1, None
+        for index, mv in enumerate(self.ordered_moves(state, tt_move)):
+            reduction = state.reduction(mv, index, depth) if self.reductions and index else 0
+            self.push(state, mv)
+            score = self.search_move(state, index, depth, alpha, beta, reduction)
+            self.pop(state)
+            if score > best:
+                best, best_mv = score, mv
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.record_cutoff(state, mv, depth, index)
+                break
+        if best_mv is None:
+            # no moves but not terminal: treat like a leaf
+            return state.evaluate()
+
+        bound = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+        stored = best + ply if best >= WIN_BOUND else best - ply if best <= -WIN_BOUND else best
+        self.tt[key] = (depth, stored, bound, best_mv)
+        return best
+
+    def search_move(self, state, index, depth, alpha, beta, reduction=0):
+        # score of the move just pushed. With pvs, moves after the first get a
+        # null window and are searched again only if they beat alpha; a
+        # reduced move that beats alpha is searched again at full depth.
+        if index == 0 or not (self.pvs or reduction):
+            return -self.negamax(state, depth - 1, -beta, -alpha)
+        low = -alpha - 1 if self.pvs else -beta
+        if reduction:
+            self.stats["reductions"] += 1
+        score = -self.negamax(state, depth - 1 - reduction, low, -alpha)
+        if score > alpha and reduction:
+            self.stats["researches"] += 1
+            score = -self.negamax(state, depth - 1, low, -alpha)
+        if self.pvs and alpha < score < beta:
+            self.stats["researches"] += 1
+            score = -self.negamax(state, depth - 1, -beta, -alpha)
+        return score
+
+    def root_move_score(self, state, mv, depth, alpha):
+        # one root move against the best score so far (full window while
+        # there is none), e.g. for root moves split over processes
+        self.push(state, mv)
+        if alpha <= -WIN:
+            score = -self.negamax(state, depth - 1, -WIN - 1, WIN + 1)
+        else:
+            score = self.search_move(state, 1, depth, alpha, WIN + 1)
+        self.pop(state)
+        return score
+
+    def start(self, state):
+        # per-search setup: which optional hooks the state has
+        self.quiesce = hasattr(state, "quiesce")
+        self.extensions = hasattr(state, "extension")
+        self.null_moves = hasattr(state, "null_move_ok")
+        self.reductions = hasattr(state, "reduction")
+
+    def search_root(self, state, depth, pv_move):
+        self.root_depth = depth
+        best, best_score = None, -WIN - 1
+        for mv in self.ordered_moves(state, pv_move):
+            score = self.root_move_score(state, mv, depth, best_score)
+            if score > best_score:
+                best, best_score = mv, score
+        if best is not None:
+            self.tt[state.key()] = (depth, best_score, EXACT, best)
+        return best, best_score
+
+    def principal_variation(self, state, max_len):
+        pv = []
+        seen = set()
+        while len(pv) < max_len:
+            key = state.key()
+            entry = self.tt.get(key)
+            if entry is None or entry[3] is None or key in seen or state.result() is not None:
+                break
+            seen.add(key)
+            pv.append(entry[3])
+            state.push(entry[3])
+        for _ in pv:
+            state.pop()
+        return pv
+
+    def best_move(self, state, time_ms=None, max_depth=64):
+        # iterative deepening: the best move of the deepest completed iteration.
+        # time_ms=None searches to max_depth without a clock.
+        self.info.clear()
+        if isinstance(self.tt, dict) and len(self.tt) > self.tt_size:
+            self.tt.clear()
+        moves = list(state.moves())
+        if not moves or state.result() is not None:
+            return None
+        if len(moves) == 1:
+            return moves[0]
+        start = time.monotonic()
+        self.deadline = None if time_ms is None else start + time_ms / 1000.0
+        self.start(state)
+        nodes_before = self.stats["nodes"]
+        best = None
+        iterations = []
+        try:
+            for depth in range(1, max_depth + 1):
+                mv, score = self.search_root(state, depth, best)
+                best = mv
+                now = time.monotonic()
+                iterations.append((depth, now - start, self.stats["nodes"] - nodes_before))
+                self.info.update(depth=depth, score=score, nodes=self.stats["nodes"] - nodes_before,
+                                 time=now - start, pv=self.principal_variation(state, depth),
+                                 iterations=iterations)
+                # a forced result, or the next iteration would most likely not finish
+                if abs(score) >= WIN_BOUND or (self.deadline is not None and now - start > self.deadline - now):
+                    break
+        except SearchTimeout:
+            while self.ply > 0:
+                self.pop(state)
+        finally:
+            self.deadline = None
+        return best if best is not None else moves[0]
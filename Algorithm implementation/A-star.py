@@ -1,53 +1,40 @@
-def a_star(graph, heuristic, start, goal):
-    open_list = [(start, 0)]  
-    parent = {start: None}
-    g = {start: 0}
-
-    while open_list:
-        current = min(open_list, key=lambda x: g[x[0]] + heuristic[x[0]])
-        open_list.remove(current)
-        node = current[0]
-
-        if node == goal:
-            break
-
-        for neighbor, cost in graph.get(node, []):
-            new_g = g[node] + cost
-            if neighbor not in g or new_g < g[neighbor]:
-                g[neighbor] = new_g
-                parent[neighbor] = node
-                open_list.append((neighbor, new_g))
-
-    path = []
-    n = goal
-    while n is not None:
-        path.append(n)
-        n = parent[n]
-    path.reverse()
-    return path,g[goal]
-
-graph = {}
-nodes = input("Enter all nodes (space separated): ").split()
-m = int(input("Enter number of edges: "))
-
-print("Enter edges (u v cost):")
-for _ in range(m):
-    u, v, w = input().split()
-    w = float(w)
-    if u not in graph: graph[u] = []
-    if v not in graph: graph[v] = []
-    graph[u].append((v, w))
-    graph[v].append((u, w))
-
-heuristic = {}
-for node in nodes:
-    heuristic[node] = float(input("h("+node+") = "))
+import sys
+from csr_graph import GraphBuilder, open_graph, load_heuristic
+from graph_search import a_star, search_stats
+
+# a_star() is the binary-heap A* in graph_search.py
+# python A-star.py edges.tsv [heuristic.txt]  loads the graph (and "node h"
+# lines, default 0) from files instead (see csr_graph.py)
+if len(sys.argv) > 1:
+    graph = open_graph(sys.argv[1], weighted=True)
+    heuristic = load_heuristic(sys.argv[2], graph) if len(sys.argv) > 2 else [0.0] * len(graph)
+else:
+    builder = GraphBuilder(weighted=True)
+    nodes = input("Enter all nodes (space separated): ").split()
+    # ids in name order: the heap breaks ties on the id, as it did on the name
+    for node in sorted(nodes):
+        builder.add_node(node)
+    m = int(input("Enter number of edges: "))
+
+    print("Enter edges (u v cost):")
+    for _ in range(m):
+        u, v, w = input().split()
+        builder.add_edge(u, v, float(w))
+    graph = builder.build()
+
+    heuristic = [0.0] * len(graph)
+    for node in nodes:
+        heuristic[graph.id_of(node)] = float(input("h("+node+") = "))
 
 start = input("Enter start node: ")
 goal = input("Enter goal node: ")
 
-path, cost = a_star(graph, heuristic, start, goal)
+path, cost = a_star(graph, heuristic, graph.id_of(start), graph.id_of(goal))
 
 print("\n===== RESULT =====")
-print("Path:", " -> ".join(path))
-print("Cost:", cost)
+if path:
+    print("Path:", " -> ".join(graph.path_names(path)))
+    print("Cost:", cost)
+else:
+    print("No path from", start, "to", goal)
+print("Expanded:", search_stats["expanded"], " Generated:", search_stats["generated"])
@@ -1,55 +1,41 @@
-from queue import PriorityQueue
-
-def best_first_search(graph, start, goal, heuristic):
-    frontier = PriorityQueue()
-    frontier.put((heuristic[start], start))  
-    visited = set()
-    parent = {start: None}
-    
-    while not frontier.empty():
-        i,current = frontier.get()
-        
-        if current in visited:
-            continue
-        visited.add(current)
-        
-        print("Visiting:", current)
-        
-        if current == goal:
-
-            path = []
-            node = goal
-            while node is not None:
-                path.append(node)
-                node = parent[node]
-            return path[::-1]
-        
-        for neighbor in graph.get(current, []):
-            if neighbor not in visited:
-                parent[neighbor] = current
-                frontier.put((heuristic[neighbor], neighbor))
-    
-    return None  
-
-graph = {}
-nodes = input("Enter all nodes (separated by space): ").split()
-
-for node in nodes:
-    neighbors = input("Enter neighbors of "+ node + " (separated by space, empty if none): ").split()
-    graph[node] = neighbors
-
-heuristic = {}
-for node in nodes:
-    h = int(input("Enter heuristic value h("+ node + "): "))
-    heuristic[node] = h
+import sys
+from csr_graph import GraphBuilder, open_graph, load_heuristic
+from graph_search import best_first_search, search_stats
+
+# python "BFS(best first).py" edges.tsv [heuristic.txt]  loads the graph (and
+# "node h" lines, default 0) from files instead (see csr_graph.py)
+if len(sys.argv) > 1:
+    graph = open_graph(sys.argv[1], weighted=False, directed=True)
+    heuristic = load_heuristic(sys.argv[2], graph) if len(sys.argv) > 2 else [0] * len(graph)
+else:
+    builder = GraphBuilder(weighted=False, directed=True)
+    nodes = input("Enter all nodes (separated by space): ").split()
+    # ids in name order: the heap breaks ties on the id, as it did on the name
+    for node in sorted(nodes):
+        builder.add_node(node)
+
+    for node in nodes:
+        neighbors = input("Enter neighbors of "+ node + " (separated by space, empty if none): ").split()
+        for neighbor in neighbors:
+            builder.add_edge(node, neighbor)
+    graph = builder.build()
+
+    heuristic = [0] * len(graph)
+    for node in nodes:
+        h = int(input("Enter heuristic value h("+ node + "): "))
+        heuristic[graph.id_of(node)] = h
 
 start = input("Enter start node: ")
 goal = input("Enter goal node: ")
 
-path = best_first_search(graph, start, goal, heuristic)
+def show_visit(node):
+    print("Visiting:", graph.names[node])
+
+path = best_first_search(graph, graph.id_of(start), graph.id_of(goal), heuristic, show_visit)
 
 print("\n===== RESULT =====")
 if path:
-    print("Final Path:", " -> ".join(path))
+    print("Final Path:", " -> ".join(graph.path_names(path)))
 else:
     print("Goal note found")
+print("Expanded:", search_stats["expanded"], " Generated:", search_stats["generated"])
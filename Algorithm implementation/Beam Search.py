@@ -1,57 +1,43 @@
-from queue import PriorityQueue
+import sys
+from csr_graph import GraphBuilder, open_graph, load_heuristic
+from graph_search import beam_search, search_stats
 
-def beam_search(graph, start, goal, heuristic, beam_width):
-    frontier = PriorityQueue()
-    frontier.put((heuristic[start], start))  
-    parent = {start: None}
 
-    while not frontier.empty():
-        
-        current_level = []
-        while not frontier.empty():
-            current_level.append(frontier.get())
-
-        current_level = current_level[:beam_width]
-        print(current_level)
-
-        for i,current in current_level:
-            if current == goal:
-                path = []
-                node = goal
-                while node is not None:
-                    path.append(node)
-                    node = parent[node]
-                path.reverse()
-                return path
-
-            for neighbor in graph.get(current, []):
-                if neighbor not in parent: 
-                    parent[neighbor] = current
-                    frontier.put((heuristic[neighbor], neighbor))
-
-    return None
-
-
-graph = {}
-nodes = input("Enter all nodes (separated by space): ").split()
-
-for node in nodes:
-    neighbors = input("Enter neighbors of " +node+" (separated by space, empty if none): ").split()
-    graph[node] = neighbors
-
-heuristic = {}
-for node in nodes:
-    h = int(input("Enter heuristic value h("+node+"): "))
-    heuristic[node] = h
+# python "Beam Search.py" edges.tsv [heuristic.txt]  loads the graph (and
+# "node h" lines, default 0) from files instead (see csr_graph.py)
+if len(sys.argv) > 1:
+    graph = open_graph(sys.argv[1], weighted=False, directed=True)
+    heuristic = load_heuristic(sys.argv[2], graph) if len(sys.argv) > 2 else [0] * len(graph)
+else:
+    builder = GraphBuilder(weighted=False, directed=True)
+    nodes = input("Enter all nodes (separated by space): ").split()
+    # ids in name order: the heap breaks ties on the id, as it did on the name
+    for node in sorted(nodes):
+        builder.add_node(node)
+
+    for node in nodes:
+        neighbors = input("Enter neighbors of " +node+" (separated by space, empty if none): ").split()
+        for neighbor in neighbors:
+            builder.add_edge(node, neighbor)
+    graph = builder.build()
+
+    heuristic = [0] * len(graph)
+    for node in nodes:
+        h = int(input("Enter heuristic value h("+node+"): "))
+        heuristic[graph.id_of(node)] = h
 
 start = input("Enter start node: ")
 goal = input("Enter goal node: ")
 beam_width = int(input("Enter beam width (k): "))
 
-path = beam_search(graph, start, goal, heuristic, beam_width)
+def show_level(level):
+    print([(h, graph.names[node]) for h, node in level])
+
+path = beam_search(graph, graph.id_of(start), graph.id_of(goal), heuristic, beam_width, show_level)
 
 print("\n===== RESULT =====")
 if path:
-    print("Final Path:", " -> ".join(path))
+    print("Final Path:", " -> ".join(graph.path_names(path)))
 else:
     print("Goal not found")
+print("Expanded:", search_stats["expanded"], " Generated:", search_stats["generated"])
@@ -1,41 +1,36 @@
-from collections import deque
-
-def bfs(graph, start_node):
-    visited = set()
-    queue = deque([start_node])
-
-    print("\nBFS Traversal:")
-    while queue:
-        current = queue.popleft()
-        if current not in visited:
-            print(current, end=' ')
-            visited.add(current)
-            queue.extend(neighbor for neighbor in graph[current] if neighbor not in visited)
+import sys
+from csr_graph import GraphBuilder, open_graph
+from graph_search import bfs
 
 # ----- User Input -----
-graph = {}
-num_nodes = int(input("Enter number of nodes: "))
-num_edges = int(input("Enter number of edges: "))
+# python Bfs.py edges.tsv  loads the graph from a file instead (see csr_graph.py)
+if len(sys.argv) > 1:
+    graph = open_graph(sys.argv[1], weighted=False)
+else:
+    builder = GraphBuilder(weighted=False)
+    num_nodes = int(input("Enter number of nodes: "))
+    num_edges = int(input("Enter number of edges: "))
+
 
+    for i in range(num_nodes):
+        builder.add_node(input(f"Enter name of node {i+1}: "))
 
-for i in range(num_nodes):
-    node = input(f"Enter name of node {i+1}: ")
-    graph[node] = []
 
-print("\nEnter edges (node1 node2):")
-for _ in range(num_edges):
-    u, v = input().split()
-    graph[u].append(v)
-    graph[v].append(u)  
+    print("\nEnter edges (node1 node2):")
+    for _ in range(num_edges):
+        u, v = input().split()
+        builder.add_edge(u, v)
+    graph = builder.build()
 
 
-print("\nGraph Adjacency List:")
-for node in graph:
-    print(f"{node}: {graph[node]}")
+    print("\nGraph Adjacency List:")
+    for node in range(len(graph)):
+        print(f"{graph.names[node]}: {graph.path_names(graph.neighbors(node))}")
 
 
 start_node = input("\nEnter starting node for BFS: ")
 if start_node in graph:
-    bfs(graph, start_node)
+    print("\nBFS Traversal:")
+    print(" ".join(graph.path_names(bfs(graph, graph.id_of(start_node)))))
 else:
     print("Start node not found in graph.")
@@ -1,51 +1,40 @@
-def depth_limited_search(graph, start, goal, limit):
-    def recursive_dls(node, goal, limit, visited):
-        print(f"Visiting: {node}, Remaining depth: {limit}")
-        if node == goal:
-            return [node] 
-        
-        if limit <= 0:
-            return None  
-        
-        visited.add(node)
-        
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                path = recursive_dls(neighbor, goal, limit - 1, visited)
-                if path:
-                    return [node] + path
-        
-        return None  
-
-    return recursive_dls(start, goal, limit, set())
+import sys
+from csr_graph import GraphBuilder, open_graph
+from graph_search import depth_limited_search
 
 
 # -------- User Input --------
-graph = {}
-num_nodes = int(input("Enter number of nodes: "))
-num_edges = int(input("Enter number of edges: "))
+# python DLS.py edges.tsv  loads the graph from a file instead (see csr_graph.py)
+if len(sys.argv) > 1:
+    graph = open_graph(sys.argv[1], weighted=False)
+else:
+    builder = GraphBuilder(weighted=False)
+    num_nodes = int(input("Enter number of nodes: "))
+    num_edges = int(input("Enter number of edges: "))
 
 
-for _ in range(num_nodes):
-    node = input("Enter node name: ")
-    graph[node] = []
+    for _ in range(num_nodes):
+        builder.add_node(input("Enter node name: "))
 
 
-print("\nEnter edges (node1 node2):")
-for _ in range(num_edges):
-    u, v = input().split()
-    graph[u].append(v)
-    graph[v].append(u)
+    print("\nEnter edges (node1 node2):")
+    for _ in range(num_edges):
+        u, v = input().split()
+        builder.add_edge(u, v)
+    graph = builder.build()
 
 start_node = input("\nEnter start node: ")
 goal_node = input("Enter goal node: ")
 depth_limit = int(input("Enter depth limit: "))
 
 
-path = depth_limited_search(graph, start_node, goal_node, depth_limit)
+def show_visit(node, limit):
+    print(f"Visiting: {graph.names[node]}, Remaining depth: {limit}")
+
+path = depth_limited_search(graph, graph.id_of(start_node), graph.id_of(goal_node), depth_limit, show_visit)
 
 if path:
     print("\nPath found:")
-    print(" -> ".join(path))
+    print(" -> ".join(graph.path_names(path)))
 else:
     print("\nNo path found within depth limit")
@@ -0,0 +1,41 @@
+import sys
+from csr_graph import GraphBuilder, open_graph, load_heuristic
+from graph_search import ida_star, search_stats
+
+# IDA*: A* as iterative deepening on f = g + h, same input as A-star.py;
+# memory is the current path only. ida_star() is in graph_search.py
+# python IDA-star.py edges.tsv [heuristic.txt]  loads the graph (and "node h"
+# lines, default 0) from files instead (see csr_graph.py)
+if len(sys.argv) > 1:
+    graph = open_graph(sys.argv[1], weighted=True)
+    heuristic = load_heuristic(sys.argv[2], graph) if len(sys.argv) > 2 else [0.0] * len(graph)
+else:
+    builder = GraphBuilder(weighted=True)
+    nodes = input("Enter all nodes (space separated): ").split()
+    for node in nodes:
+        builder.add_node(node)
+    m = int(input("Enter number of edges: "))
+
+    print("Enter edges (u v cost):")
+    for _ in range(m):
+        u, v, w = input().split()
+        builder.add_edge(u, v, float(w))
+    graph = builder.build()
+
+    heuristic = [0.0] * len(graph)
+    for node in nodes:
+        heuristic[graph.id_of(node)] = float(input("h("+node+") = "))
+
+start = input("Enter start node: ")
+goal = input("Enter goal node: ")
+
+path, cost = ida_star(graph, heuristic, graph.id_of(start), graph.id_of(goal))
+
+print("\n===== RESULT =====")
+if path:
+    print("Path:", " -> ".join(graph.path_names(path)))
+    print("Cost:", cost)
+else:
+    print("No path from", start, "to", goal)
+print("Expanded:", search_stats["expanded"], " Generated:", search_stats["generated"])
+print("Expanded per f-bound:", ", ".join(f"{bound:g}: {expanded}" for bound, expanded, _ in search_stats["iterations"]))
@@ -1,51 +1,43 @@
-def depth_limited_search(graph, start, goal, limit, visited=None):
-    if visited is None:
-        visited = set()
-    if limit < 0:
-        return None
-    print(f"Visiting: {start}, Remaining depth: {limit}")
-    if start == goal:
-        return [start]
-    visited.add(start)
-    for neighbor in graph.get(start, []):
-        if neighbor not in visited:
-            path = depth_limited_search(graph, neighbor, goal, limit - 1, visited)
-            if path:
-                return [start] + path
-    visited.remove(start)
-    return None
-
-def iterative_deepening_search(graph, start, goal, max_depth):
-    for depth in range(max_depth + 1):
-        print(f"\n--- Searching with depth limit = {depth} ---")
-        path = depth_limited_search(graph, start, goal, depth)
-        if path:
-            return path
-    return None
+import sys
+from csr_graph import GraphBuilder, open_graph
+from graph_search import iterative_deepening_search, search_stats
+
+PRUNE_REVISITS = False   # True: skip nodes already reached at the same or a smaller depth
 
 # -------- User Input --------
-graph = {}
-num_nodes = int(input("Enter number of nodes: "))
-num_edges = int(input("Enter number of edges: "))
+# python IDS.py edges.tsv  loads the graph from a file instead (see csr_graph.py)
+if len(sys.argv) > 1:
+    graph = open_graph(sys.argv[1], weighted=False)
+else:
+    builder = GraphBuilder(weighted=False)
+    num_nodes = int(input("Enter number of nodes: "))
+    num_edges = int(input("Enter number of edges: "))
 
-for _ in range(num_nodes):
-    node = input("Enter node name: ")
-    graph[node] = []
+    for _ in range(num_nodes):
+        builder.add_node(input("Enter node name: "))
 
-print("\nEnter edges (node1 node2):")
-for _ in range(num_edges):
-    u, v = input().split()
-    graph[u].append(v)
-    graph[v].append(u)
+    print("\nEnter edges (node1 node2):")
+    for _ in range(num_edges):
+        u, v = input().split()
+        builder.add_edge(u, v)
+    graph = builder.build()
 
 start_node = input("\nEnter start node: ")
 goal_node = input("Enter goal node: ")
 max_depth = int(input("Enter maximum depth limit: "))
 
-path = iterative_deepening_search(graph, start_node, goal_node, max_depth)
+def show_depth(depth):
+    print(f"\n--- Searching with depth limit = {depth} ---")
+
+def show_visit(node, limit):
+    print(f"Visiting: {graph.names[node]}, Remaining depth: {limit}")
+
+path = iterative_deepening_search(graph, graph.id_of(start_node), graph.id_of(goal_node), max_depth,
+                                  show_visit, show_depth, PRUNE_REVISITS)
 
 if path:
     print("\nPath found:")
-    print(" -> ".join(path))
+    print(" -> ".join(graph.path_names(path)))
 else:
     print("\nNo path found within max depth limit")
+print("Expanded per depth limit:", ", ".join(f"{limit}: {expanded}" for limit, expanded, _ in search_stats["iterations"]))
@@ -0,0 +1,287 @@
+# Compact graph shared by the search scripts. Node names are interned to
+# integer ids 0..n-1 and the adjacency is stored in CSR form: the
+# neighbours of u are targets[offsets[u]:offsets[u + 1]] (and their costs
+# weights[...] when the graph is weighted), in flat `array` buffers, i.e.
+# 4 bytes per edge plus 8 for the cost instead of a Python list entry.
+#
+#   graph = load_edges("roads.tsv")          # u v [cost] per line, CSV or TSV
+#   graph.save("roads.csr")                  # binary copy of the buffers
+#   graph = load("roads.csr")                # memory-mapped, no parsing
+#   graph.neighbors(graph.id_of("A")), graph.edges(u), graph.names[u]
+#
+# Undirected edge lists store every edge in both directions.
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import repeat
+
+MAGIC = b"CSRG"
+HEADER = struct.Struct("<4sIqq")     # magic, weighted flag, nodes, directed edges
+HEADER_SIZE = 32                     # header padded so the buffers are 8-byte aligned
+
+class CSRGraph:
+    def __init__(self, names, offsets, targets, weights=None):
+        self.names = names          # id -> name
+        self.offsets = offsets      # n + 1 entries
+        self.targets = targets      # m entries
+        self.weights = weights      # m entries, or None: every edge costs 1
+        self.ids = None             # name -> id, built on first lookup
+        self.mapped = None          # open mmap when loaded from a .csr file
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def name_index(self):
+        if self.ids is None:
+            self.ids = {nm: i for i, nm in enumerate(self.names)}
+        return self.ids
+
+    def id_of(self, name):
+        return self.name_index()[name]
+
+    def __contains__(self, name):
+        return name in self.name_index()
+
+    def neighbors(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def edges(self, u):
+        # (neighbour, cost) pairs
+        a, b = self.offsets[u], self.offsets[u + 1]
+        if self.weights is None:
+            return zip(self.targets[a:b], repeat(1))
+        return zip(self.targets[a:b], self.weights[a:b])
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def nbytes(self):
+        # bytes in the offset/target/weight buffers
+        total = 0
+        for buf in (self.offsets, self.targets, self.weights):
+            if buf is not None:
+                total += len(buf) * buf.itemsize
+        return total
+
+    def names_nbytes(self):
+        # rough size of the node names and the list holding them
+        return sys.getsizeof(self.names) + sum(sys.getsizeof(nm) for nm in self.names)
+
+    def path_names(self, path):
+        return [self.names[u] for u in path]
+
+    def sorted_adjacency(self, key=None):
+        # copy with every neighbour list sorted by id (or by key(id)), so
+        # searches that want a fixed order do not sort on every visit
+        offsets = self.offsets
+        targets = array("i", self.targets)
+        weights = array("d", self.weights) if self.weights is not None else None
+        for u in range(len(self.names)):
+            a, b = offsets[u], offsets[u + 1]
+            if b - a < 2:
+                continue
+            if weights is None:
+                targets[a:b] = array("i", sorted(targets[a:b], key=key))
+            else:
+                pairs = sorted(zip(targets[a:b], weights[a:b]),
+                               key=(lambda p: p[0]) if key is None else (lambda p: key(p[0])))
+                targets[a:b] = array("i", [v for v, _ in pairs])
+                weights[a:b] = array("d", [w for _, w in pairs])
+        graph = CSRGraph(self.names, array("q", offsets), targets, weights)
+        graph.ids = self.ids
+        return graph
+
+    def reversed(self):
+        # transposed copy: u is in v's list for every edge u -> v, for
+        # searching backwards from a goal on a directed graph
+        n = len(self.names)
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        m = len(targets)
+        rev_offsets = array("q", bytes(8 * (n + 1)))
+        for v in targets:
+            rev_offsets[v + 1] += 1
+        for v in range(n):
+            rev_offsets[v + 1] += rev_offsets[v]
+        rev_targets = array("i", bytes(4 * m))
+        rev_weights = array("d", bytes(8 * m)) if weights is not None else None
+        fill = array("q", rev_offsets[:n])
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                pos = fill[v]
+                fill[v] = pos + 1
+                rev_targets[pos] = u
+                if rev_weights is not None:
+                    rev_weights[pos] = weights[e]
+        graph = CSRGraph(self.names, rev_offsets, rev_targets, rev_weights)
+        graph.ids = self.ids
+        return graph
+
+    # -----------------------------
+    # Binary format
+    # -----------------------------
+    def save(self, path):
+        # header, offsets (int64), weights (float64, if any), targets (int32),
+        # then the names, one per line; native byte order
+        weighted = self.weights is not None
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, int(weighted), len(self.names), len(self.targets)).ljust(HEADER_SIZE, b"\0"))
+            for buf in (self.offsets, self.weights, self.targets):
+                if buf is not None:
+                    f.write(buf.tobytes() if isinstance(buf, array) else bytes(buf))
+            f.write("\n".join(self.names).encode("utf-8"))
+
+    def close(self):
+        if self.mapped is not None:
+            self.offsets = self.targets = self.weights = None
+            self.mapped.close()
+            self.mapped = None
+
+# -----------------------------
+# Building
+# -----------------------------
+class GraphBuilder:
+    # collects named nodes and edges, then builds the CSR buffers in two
+    # passes (count the degrees, then place every edge)
+    def __init__(self, weighted=True, directed=False):
+        self.weighted = weighted
+        self.directed = directed
+        self.ids = {}
+        self.names = []
+        self.sources = array("i")
+        self.dests = array("i")
+        self.costs = array("d") if weighted else None
+
+    def add_node(self, name):
+        u = self.ids.get(name)
+        if u is None:
+            u = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return u
+
+    def add_edge(self, a, b, cost=1.0):
+        u, v = self.add_node(a), self.add_node(b)
+        self.sources.append(u)
+        self.dests.append(v)
+        if self.costs is not None:
+            self.costs.append(cost)
+
+    def build(self):
+        # adjacency in input order; an undirected edge is placed in both
+        # lists as it comes, like appending to two Python lists
+        n = len(self.names)
+        sources, dests, costs = self.sources, self.dests, self.costs
+        both = not self.directed
+        m = len(sources) * (2 if both else 1)
+        offsets = array("q", bytes(8 * (n + 1)))
+        for u in sources:
+            offsets[u + 1] += 1
+        if both:
+            for v in dests:
+                offsets[v + 1] += 1
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+        targets = array("i", bytes(4 * m))
+        weights = array("d", bytes(8 * m)) if costs is not None else None
+        fill = array("q", offsets[:n])
+        for e in range(len(sources)):
+            u, v = sources[e], dests[e]
+            pos = fill[u]
+            fill[u] = pos + 1
+            targets[pos] = v
+            if weights is not None:
+                weights[pos] = costs[e]
+            if both:
+                pos = fill[v]
+                fill[v] = pos + 1
+                targets[pos] = u
+                if weights is not None:
+                    weights[pos] = costs[e]
+        graph = CSRGraph(self.names, offsets, targets, weights)
+        graph.ids = self.ids
+        return graph
+
+# -----------------------------
+# Loading
+# -----------------------------
+def load_edges(path, weighted=None, directed=False, delimiter=None):
+    # edge list "u v" or "u v cost" per line; lines starting with # are
+    # skipped. The delimiter defaults to "," for .csv and tab otherwise;
+    # weighted=None decides from the first edge.
+    if delimiter is None:
+        delimiter = "," if path.lower().endswith(".csv") else "\t"
+    builder = None
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f, delimiter=delimiter):
+            if not row or row[0].startswith("#"):
+                continue
+            if builder is None:
+                if weighted is None:
+                    weighted = len(row) > 2
+                builder = GraphBuilder(weighted, directed)
+                add_node, sources, dests, costs = builder.add_node, builder.sources, builder.dests, builder.costs
+            # builder.add_edge, inlined for speed
+            sources.append(add_node(row[0]))
+            dests.append(add_node(row[1]))
+            if weighted:
+                costs.append(float(row[2]))
+    if builder is None:
+        builder = GraphBuilder(bool(weighted), directed)
+    return builder.build()
+
+def load(path, use_mmap=True):
+    # a graph written by CSRGraph.save(); with use_mmap the buffers are views
+    # of the file, so loading is constant time and pages are read on demand
+    with open(path, "rb") as f:
+        if use_mmap:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+    magic, weighted, n, m = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a CSR graph file")
+    view = memoryview(data)
+    pos = HEADER_SIZE
+
+    def take(typecode, count):
+        nonlocal pos
+        size = array(typecode).itemsize * count
+        chunk = view[pos:pos + size]
+        pos += size
+        if use_mmap:
+            return chunk.cast(typecode)
+        buf = array(typecode)
+        buf.frombytes(chunk)
+        return buf
+
+    offsets = take("q", n + 1)
+    weights = take("d", m) if weighted else None
+    targets = take("i", m)
+    names = bytes(view[pos:]).decode("utf-8").split("\n") if n else []
+    graph = CSRGraph(names, offsets, targets, weights)
+    if use_mmap:
+        graph.mapped = data
+    return graph
+
+def open_graph(path, **kwargs):
+    # .csr files are loaded (memory-mapped), anything else parsed as an edge list
+    if os.path.splitext(path)[1].lower() == ".csr":
+        return load(path)
+    return load_edges(path, **kwargs)
+
+def load_heuristic(path, graph):
+    # "node h" per line -> list indexed by node id (0 for nodes not listed)
+    h = [0.0] * len(graph)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and not parts[0].startswith("#") and parts[0] in graph:
+                h[graph.id_of(parts[0])] = float(parts[1])
+    return h
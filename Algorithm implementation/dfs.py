@@ -1,41 +1,39 @@
-def dfs(graph, start_node, visited=None):
-    if visited is None:
-        visited =[]
-    
-    if start_node not in visited:
-        print(start_node, end=' ')  
-        visited.append(start_node)    
-        
-        for neighbor in sorted(graph[start_node]):  
-            dfs(graph, neighbor, visited)
-
+import sys
+from csr_graph import GraphBuilder, open_graph
+from graph_search import dfs
 
 # ----- User Input -----
-graph = {}
-num_nodes = int(input("Enter number of nodes: "))
-num_edges = int(input("Enter number of edges: "))
+# python dfs.py edges.tsv  loads the graph from a file instead (see csr_graph.py)
+if len(sys.argv) > 1:
+    graph = open_graph(sys.argv[1], weighted=False)
+else:
+    builder = GraphBuilder(weighted=False)
+    num_nodes = int(input("Enter number of nodes: "))
+    num_edges = int(input("Enter number of edges: "))
 
 
-for i in range(num_nodes):
-    node = input(f"Enter name of node {i+1}: ")
-    graph[node] = []
+    for i in range(num_nodes):
+        builder.add_node(input(f"Enter name of node {i+1}: "))
 
 
-print("\nEnter edges (node1 node2):")
-for _ in range(num_edges):
-    u, v = input().split()
-    graph[u].append(v)
-    graph[v].append(u)  
+    print("\nEnter edges (node1 node2):")
+    for _ in range(num_edges):
+        u, v = input().split()
+        builder.add_edge(u, v)
+    graph = builder.build()
 
 
-print("\nGraph Adjacency List:")
-for node in graph:
-    print(f"{node}: {graph[node]}")
+    print("\nGraph Adjacency List:")
+    for node in range(len(graph)):
+        print(f"{graph.names[node]}: {graph.path_names(graph.neighbors(node))}")
 
 
 start_node = input("\nEnter starting node for DFS: ")
 if start_node in graph:
     print("\nDFS Traversal:")
-    dfs(graph, start_node)
+    # neighbours in alphabetical order of their names, sorted once up front
+    graph = graph.sorted_adjacency(key=graph.names.__getitem__)
+    order = dfs(graph, graph.id_of(start_node))
+    print(" ".join(graph.path_names(order)))
 else:
     print("Start node not found in graph.")
@@ -0,0 +1,570 @@
+# Graph search functions shared by the scripts in this folder (the scripts
+# read a graph from the keyboard or a file and call these). A graph is a
+# csr_graph.CSRGraph: nodes are integer ids, graph.neighbors(u) lists the
+# neighbours and graph.edges(u) gives (neighbour, cost) pairs. A heuristic
+# is anything indexable by node id (a list) or a function of the id.
+# Every search fills search_stats with the nodes it expanded and generated;
+# the optional trace callbacks feed the scripts' step-by-step output.
+import heapq
+from array import array
+from collections import deque
+
+INF = float("inf")
+
+search_stats = {"expanded": 0, "generated": 0, "reopened": 0, "iterations": []}
+
+def reset_stats():
+    # iterations: (limit or bound, expanded, generated) per iterative-deepening pass
+    search_stats.update(expanded=0, generated=0, reopened=0, iterations=[])
+
+def build_path(parent, goal):
+    path = []
+    node = goal
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+# -----------------------------
+# A*
+# -----------------------------
+def a_star(graph, heuristic, start, goal):
+    # binary-heap A*: (f, h, g, node) entries, ties on f go to the smaller h
+    # (closer to the goal). A node improved while already queued is pushed
+    # again and the stale entry skipped when popped (lazy decrease-key).
+    # With a consistent heuristic a node is final once expanded; with an
+    # inconsistent one it is reopened if a cheaper path turns up.
+    # Returns (path, cost), or (None, INF) if the goal is unreachable.
+    reset_stats()
+    h = heuristic if callable(heuristic) else heuristic.__getitem__
+    g = {start: 0}
+    parent = {start: None}
+    closed = set()
+    h_start = h(start)
+    open_heap = [(h_start, h_start, 0, start)]
+    expanded = generated = 0
+    while open_heap:
+        _, _, g_node, node = heapq.heappop(open_heap)
+        if node in closed or g_node > g[node]:
+            continue            # stale entry
+        if node == goal:
+            search_stats.update(expanded=expanded, generated=generated)
+            return build_path(parent, goal), g[goal]
+        closed.add(node)
+        expanded += 1
+        for neighbor, cost in graph.edges(node):
+            new_g = g_node + cost
+            old_g = g.get(neighbor)
+            if old_g is None or new_g < old_g:
+                if neighbor in closed:
+                    closed.discard(neighbor)
+                    search_stats["reopened"] += 1
+                g[neighbor] = new_g
+                parent[neighbor] = node
+                h_nb = h(neighbor)
+                heapq.heappush(open_heap, (new_g + h_nb, h_nb, new_g, neighbor))
+                generated += 1
+    search_stats.update(expanded=expanded, generated=generated)
+    return None, INF
+
+def ida_star(graph, heuristic, start, goal, prune_revisits=True):
+    # iterative deepening on f = g + h: each pass is a depth-first search
+    # that cuts off nodes with f above the bound; the next bound is the
+    # smallest f that was cut off. Memory is the current path only.
+    # prune_revisits skips a node reached again in the same pass without
+    # a cheaper g (otherwise only nodes on the current path are skipped).
+    # Returns (path, cost) like a_star(), or (None, INF).
+    reset_stats()
+    h = heuristic if callable(heuristic) else heuristic.__getitem__
+    iterations = search_stats["iterations"]
+    n = len(graph)
+    best_g = array("d", [INF]) * n
+    on_path = bytearray(n)
+    bound = h(start)
+    while True:
+        expanded, generated = search_stats["expanded"], search_stats["generated"]
+        path, cost, next_bound = ida_pass(graph, h, start, goal, bound, best_g if prune_revisits else None, on_path)
+        iterations.append((bound, search_stats["expanded"] - expanded, search_stats["generated"] - generated))
+        if path is not None:
+            return path, cost
+        if next_bound == INF:
+            return None, INF
+        bound = next_bound
+
+def ida_pass(graph, h, start, goal, bound, best_g, on_path):
+    # one IDA* pass; returns (path, cost, smallest f above bound)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    search_stats["generated"] += 1
+    if start == goal:
+        return [start], 0, INF
+    stack, next_edge, g_stack = [start], [offsets[start]], [0]
+    touched = [start]
+    if best_g is not None:
+        best_g[start] = 0
+    on_path[start] = 1
+    next_bound = INF
+    generated, expanded = 0, 1
+    path = cost = None
+    while stack:
+        u = stack[-1]
+        i, end = next_edge[-1], offsets[u + 1]
+        if i == end:
+            on_path[u] = 0
+            stack.pop()
+            next_edge.pop()
+            g_stack.pop()
+            continue
+        next_edge[-1] = i + 1
+        v = targets[i]
+        if on_path[v]:
+            continue
+        g_v = g_stack[-1] + (weights[i] if weights is not None else 1)
+        if best_g is not None:
+            if g_v >= best_g[v]:
+                continue
+            if best_g[v] == INF:
+                touched.append(v)
+            best_g[v] = g_v
+        generated += 1
+        f = g_v + h(v)
+        if f > bound:
+            if f < next_bound:
+                next_bound = f
+            continue
+        if v == goal:
+            path, cost = stack + [v], g_v
+            break
+        on_path[v] = 1
+        stack.append(v)
+        next_edge.append(offsets[v])
+        g_stack.append(g_v)
+        expanded += 1
+    for u in stack:
+        on_path[u] = 0
+    if best_g is not None:
+        for u in touched:
+            best_g[u] = INF
+    search_stats["generated"] += generated
+    search_stats["expanded"] += expanded
+    return path, cost, next_bound
+
+def bidirectional_a_star(graph, start, goal, heuristic=None, heuristic_to_start=None, reverse=None):
+    # Dijkstra from both ends (heuristic=None), or A* with the averaged
+    # potential p(v) = (h(v) - h_start(v)) / 2: the forward side is keyed
+    # g + p, the backward side g - p, and both see the same non-negative
+    # reduced edge costs when the heuristics are consistent. best is the
+    # cheapest start-goal path seen through a node labelled by both sides;
+    # once the two smallest keys add up to it, no shorter path is left.
+    # The side with the smaller heap is expanded. heuristic_to_start
+    # defaults to 0, reverse as in bidirectional_search().
+    # Returns (path, cost), or (None, INF).
+    reset_stats()
+    if heuristic is None:
+        potential = None
+    else:
+        h = heuristic if callable(heuristic) else heuristic.__getitem__
+        if heuristic_to_start is None:
+            potential = lambda v: 0.5 * h(v)
+        else:
+            h_start = heuristic_to_start if callable(heuristic_to_start) else heuristic_to_start.__getitem__
+            potential = lambda v: 0.5 * (h(v) - h_start(v))
+    backward = graph if reverse is None else reverse
+    p_start = potential(start) if potential else 0
+    p_goal = potential(goal) if potential else 0
+    # per side: g, parent, closed, heap of (key, g, node), key sign of p
+    sides = (({start: 0}, {start: None}, set(), [(p_start, 0, start)], 1, graph),
+             ({goal: 0}, {goal: None}, set(), [(-p_goal, 0, goal)], -1, backward))
+    best, meeting = INF, None
+    if start == goal:
+        best, meeting = 0, start
+    expanded = generated = 0
+    while True:
+        # drop stale heap tops, then stop once no shorter path can be left
+        tops = []
+        for g, _, closed, heap, _, _ in sides:
+            while heap and (heap[0][2] in closed or heap[0][1] > g[heap[0][2]]):
+                heapq.heappop(heap)
+            tops.append(heap[0][0] if heap else INF)
+        if tops[0] + tops[1] >= best:
+            break
+        side = 0 if len(sides[0][3]) <= len(sides[1][3]) else 1
+        if not sides[side][3]:
+            side = 1 - side
+        g, parent, closed, heap, sign, adj = sides[side]
+        g_other = sides[1 - side][0]
+        _, g_node, node = heapq.heappop(heap)
+        closed.add(node)
+        expanded += 1
+        for neighbor, cost in adj.edges(node):
+            new_g = g_node + cost
+            old_g = g.get(neighbor)
+            if old_g is None or new_g < old_g:
+                g[neighbor] = new_g
+                parent[neighbor] = node
+                key = new_g + sign * potential(neighbor) if potential else new_g
+                heapq.heappush(heap, (key, new_g, neighbor))
+                generated += 1
+                other_g = g_other.get(neighbor)
+                if other_g is not None and new_g + other_g < best:
+                    best, meeting = new_g + other_g, neighbor
+    search_stats.update(expanded=expanded, generated=generated)
+    if meeting is None:
+        return None, INF
+    return join_paths(sides[0][1], sides[1][1], meeting), best
+
+# -----------------------------
+# Uninformed search
+# -----------------------------
+def bfs(graph, start):
+    # nodes in breadth-first order
+    reset_stats()
+    visited = set()
+    queue = deque([start])
+    order = []
+    while queue:
+        current = queue.popleft()
+        if current not in visited:
+            order.append(current)
+            visited.add(current)
+            search_stats["expanded"] += 1
+            queue.extend(neighbor for neighbor in graph.neighbors(current) if neighbor not in visited)
+    return order
+
+def dfs(graph, start):
+    # nodes in depth-first order, neighbours in their stored order (see
+    # CSRGraph.sorted_adjacency). Explicit stack of (node, next edge) and a
+    # bytearray of visited flags, so no recursion limit and O(1) checks.
+    reset_stats()
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(len(graph))
+    visited[start] = 1
+    order = [start]
+    stack, next_edge = [start], [offsets[start]]
+    while stack:
+        u = stack[-1]
+        i, end = next_edge[-1], offsets[u + 1]
+        while i < end and visited[targets[i]]:
+            i += 1
+        if i == end:
+            stack.pop()
+            next_edge.pop()
+            continue
+        v = targets[i]
+        next_edge[-1] = i + 1
+        visited[v] = 1
+        order.append(v)
+        stack.append(v)
+        next_edge.append(offsets[v])
+    search_stats["expanded"] = len(order)
+    return order
+
+def depth_limited_search(graph, start, goal, limit, trace=None):
+    # DLS.py: a path of at most `limit` edges, or None; trace(node, remaining
+    # depth). A node is expanded at most once per search: `visited` is never
+    # cleared, so a node reached again by another path is skipped (nodes
+    # reached at the limit are not marked). For a search that only avoids
+    # the nodes of the current path, as IDS needs, see dls().
+    reset_stats()
+    if trace:
+        trace(start, limit)
+    search_stats["generated"] += 1
+    if start == goal:
+        return [start]
+    if limit <= 0:
+        return None
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(len(graph))
+    visited[start] = 1
+    stack, next_edge = [start], [offsets[start]]
+    generated, expanded = 0, 1
+    path = None
+    while stack:
+        depth = len(stack)                  # depth of the children of u
+        u = stack[-1]
+        i, end = next_edge[-1], offsets[u + 1]
+        while i < end and visited[targets[i]]:
+            i += 1
+        if i == end:
+            stack.pop()
+            next_edge.pop()
+            continue
+        v = targets[i]
+        next_edge[-1] = i + 1
+        generated += 1
+        if trace:
+            trace(v, limit - depth)
+        if v == goal:
+            path = stack + [v]
+            break
+        if depth < limit:
+            visited[v] = 1
+            stack.append(v)
+            next_edge.append(offsets[v])
+            expanded += 1
+    search_stats["generated"] += generated
+    search_stats["expanded"] += expanded
+    return path
+
+def dls(graph, start, goal, limit, on_path, trace):
+    # per-path DLS for iterative_deepening_search(): only the nodes of the
+    # current path are skipped. The stack is the current path, on_path flags its
+    # nodes (all clear again on return, so iterations can share it). Nodes
+    # at the depth limit are checked without being pushed.
+    # Returns (path or None, cutoff): cutoff is False if no node at the
+    # limit had a neighbour left to explore, so a deeper limit finds nothing new.
+    if limit < 0:
+        return None, True
+    if trace:
+        trace(start, limit)
+    search_stats["generated"] += 1
+    offsets, targets = graph.offsets, graph.targets
+    if start == goal:
+        return [start], True
+    if limit == 0:
+        return None, offsets[start + 1] > offsets[start]
+    stack, next_edge = [start], [offsets[start]]
+    on_path[start] = 1
+    generated, expanded = 0, 1
+    cutoff = False
+    path = None
+    while stack:
+        depth = len(stack)                  # depth of the children of u
+        u = stack[-1]
+        i, end = next_edge[-1], offsets[u + 1]
+        if depth == limit and trace is None:
+            # the children of u are at the limit: check them in one pass
+            for v in targets[i:end]:
+                if not on_path[v]:
+                    generated += 1
+                    if v == goal:
+                        path = stack + [v]
+                        break
+                    if not cutoff:
+                        cutoff = any(not on_path[w] for w in targets[offsets[v]:offsets[v + 1]])
+            if path is not None:
+                break
+            i = end
+        while i < end and on_path[targets[i]]:
+            i += 1
+        if i == end:
+            on_path[u] = 0
+            stack.pop()
+            next_edge.pop()
+            continue
+        v = targets[i]
+        next_edge[-1] = i + 1
+        generated += 1
+        if trace:
+            trace(v, limit - depth)
+        if v == goal:
+            path = stack + [v]
+            break
+        if depth < limit:
+            on_path[v] = 1
+            stack.append(v)
+            next_edge.append(offsets[v])
+            expanded += 1
+        elif not cutoff:
+            cutoff = any(not on_path[w] for w in targets[offsets[v]:offsets[v + 1]])
+    for u in stack:
+        on_path[u] = 0
+    search_stats["generated"] += generated
+    search_stats["expanded"] += expanded
+    return path, cutoff
+
+def dls_shallowest(graph, start, goal, limit, best, touched, trace):
+    # DLS that skips a node already reached at the same or a smaller depth
+    # in this pass (best[v] is that depth; touched lists the nodes set, so
+    # the caller can reset them). A node is expanded at most once per depth
+    # instead of once per path. Returns (path or None, cutoff) like dls().
+    if trace:
+        trace(start, limit)
+    search_stats["generated"] += 1
+    offsets, targets = graph.offsets, graph.targets
+    if start == goal:
+        return [start], True
+    if limit == 0:
+        return None, offsets[start + 1] > offsets[start]
+    best[start] = 0
+    touched.append(start)
+    stack, next_edge = [start], [offsets[start]]
+    generated, expanded = 0, 1
+    cutoff = False
+    path = None
+    while stack:
+        depth = len(stack)
+        u = stack[-1]
+        i, end = next_edge[-1], offsets[u + 1]
+        while i < end and best[targets[i]] <= depth:
+            i += 1
+        if i == end:
+            stack.pop()
+            next_edge.pop()
+            continue
+        v = targets[i]
+        next_edge[-1] = i + 1
+        if best[v] > limit:
+            touched.append(v)
+        best[v] = depth
+        generated += 1
+        if trace:
+            trace(v, limit - depth)
+        if v == goal:
+            path = stack + [v]
+            break
+        if depth < limit:
+            stack.append(v)
+            next_edge.append(offsets[v])
+            expanded += 1
+        elif not cutoff:
+            cutoff = any(best[w] > limit for w in targets[offsets[v]:offsets[v + 1]])
+    search_stats["generated"] += generated
+    search_stats["expanded"] += expanded
+    return path, cutoff
+
+def iterative_deepening_search(graph, start, goal, max_depth, trace=None, on_depth=None,
+                               prune_revisits=False):
+    # depth-limited search with limits 0..max_depth; on_depth(limit) is
+    # called before every iteration. Stops as soon as an iteration cut
+    # nothing off at the limit. prune_revisits: a node reached again at the
+    # same or a greater depth in an iteration is not searched again.
+    reset_stats()
+    iterations = search_stats["iterations"]
+    n = len(graph)
+    on_path = bytearray(n) if not prune_revisits else None
+    best = array("i", [n + 1]) * n if prune_revisits else None    # n + 1: not reached
+    touched = []
+    for depth in range(max_depth + 1):
+        if on_depth:
+            on_depth(depth)
+        expanded, generated = search_stats["expanded"], search_stats["generated"]
+        if prune_revisits:
+            path, cutoff = dls_shallowest(graph, start, goal, depth, best, touched, trace)
+            for u in touched:
+                best[u] = n + 1
+            touched.clear()
+        else:
+            path, cutoff = dls(graph, start, goal, depth, on_path, trace)
+        iterations.append((depth, search_stats["expanded"] - expanded, search_stats["generated"] - generated))
+        if path or not cutoff:
+            return path
+    return None
+
+def bidirectional_search(graph, start, goal, reverse=None):
+    # breadth-first from both ends, always expanding the whole next layer of
+    # the smaller frontier. Before a layer the two visited sets are disjoint,
+    # so start and goal are more than (depth on one side + depth on the
+    # other) apart and the first meeting found in the layer is a shortest
+    # path. reverse: the graph with its edges reversed, for the goal side
+    # of a directed graph (graph.reversed()); undirected graphs need none.
+    # The path through the meeting node, or None.
+    reset_stats()
+    if start == goal:
+        return [start]
+    backward = graph if reverse is None else reverse
+    parent_start, parent_goal = {start: None}, {goal: None}
+    layer_start, layer_goal = [start], [goal]
+    expanded = generated = 0
+    while layer_start and layer_goal:
+        forward = len(layer_start) <= len(layer_goal)
+        if forward:
+            layer, parent, other, adj = layer_start, parent_start, parent_goal, graph
+        else:
+            layer, parent, other, adj = layer_goal, parent_goal, parent_start, backward
+        offsets, targets = adj.offsets, adj.targets
+        next_layer = []
+        for current in layer:
+            expanded += 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    next_layer.append(neighbor)
+                    generated += 1
+                    if neighbor in other:
+                        search_stats.update(expanded=expanded, generated=generated)
+                        return join_paths(parent_start, parent_goal, neighbor)
+        if forward:
+            layer_start = next_layer
+        else:
+            layer_goal = next_layer
+    search_stats.update(expanded=expanded, generated=generated)
+    return None
+
+def join_paths(parent_start, parent_goal, meeting_node):
+    # start .. meeting node, then back along the goal-side parents
+    path = build_path(parent_start, meeting_node)
+    node = parent_goal[meeting_node]
+    while node is not None:
+        path.append(node)
+        node = parent_goal[node]
+    return path
+
+# -----------------------------
+# Heuristic search
+# -----------------------------
+def best_first_search(graph, start, goal, heuristic, trace=None):
+    # greedy best-first: always the queued node with the smallest h. Every
+    # node is queued once (its key h does not depend on the path); a
+    # shorter path to a node still in the queue replaces its parent.
+    reset_stats()
+    h = heuristic if callable(heuristic) else heuristic.__getitem__
+    offsets, targets = graph.offsets, graph.targets
+    frontier = [(h(start), start)]
+    depth = {start: 0}
+    parent = {start: None}
+    closed = set()
+    expanded = generated = 0
+    while frontier:
+        _, current = heapq.heappop(frontier)
+        closed.add(current)
+        if trace:
+            trace(current)
+        if current == goal:
+            search_stats.update(expanded=expanded, generated=generated)
+            return build_path(parent, goal)
+        expanded += 1
+        d = depth[current] + 1
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            old = depth.get(neighbor)
+            if old is None:
+                depth[neighbor] = d
+                parent[neighbor] = current
+                heapq.heappush(frontier, (h(neighbor), neighbor))
+                generated += 1
+            elif d < old and neighbor not in closed:
+                depth[neighbor] = d
+                parent[neighbor] = current
+    search_stats.update(expanded=expanded, generated=generated)
+    return None
+
+def beam_search(graph, start, goal, heuristic, beam_width, trace=None):
+    # level by level, keeping the beam_width children with the smallest h
+    # (heapq.nsmallest: O(n log k) per level instead of sorting them all).
+    # Only nodes that made it into a beam are closed, i.e. reached at a
+    # smaller depth already; a child pruned from one level can still come
+    # back on a later one through another parent.
+    reset_stats()
+    h = heuristic if callable(heuristic) else heuristic.__getitem__
+    offsets, targets = graph.offsets, graph.targets
+    level = [(h(start), start)]
+    parent = {start: None}
+    expanded = generated = 0
+    while level:
+        if trace:
+            trace(level)
+        children = {}
+        for _, current in level:
+            if current == goal:
+                search_stats.update(expanded=expanded, generated=generated)
+                return build_path(parent, goal)
+            expanded += 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if neighbor not in parent and neighbor not in children:
+                    children[neighbor] = current
+                    generated += 1
+        level = heapq.nsmallest(beam_width, [(h(v), v) for v in children])
+        for _, v in level:
+            parent[v] = children[v]
+    search_stats.update(expanded=expanded, generated=generated)
+    return None
@@ -0,0 +1,531 @@
+# Benchmark of the search functions in graph_search.py on synthetic road-like
+# graphs (a grid with random edge costs), against the original list-based
+# versions kept below for reference, and of csr_graph loading.
+#   python search_bench.py
+#   python search_bench.py --grid 50,200,700 --legacy-max 20000
+#   python search_bench.py --grid "" --load 10000000
+#   python search_bench.py --grid "" --load 0 --dfs 1000000 --chain 100000 --tree 20
+#   python search_bench.py --grid "" --load 0 --dfs 0 --ids 0 --bidir 1000000 --bidir-grid 500
+#   python search_bench.py --grid "" --load 0 --dfs 0 --ids 0 --bidir 0 --greedy 1000 --beam 10,100,1000
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from queue import PriorityQueue
+import csr_graph
+import graph_search
+
+# -----------------------------
+# Synthetic graphs
+# -----------------------------
+def grid_edges(side, seed=1, integer=False):
+    # side x side grid, nodes r * side + c, 4-neighbour edges with cost 1..3
+    # (1, 2 or 3 with integer); manhattan distance is a consistent heuristic
+    rng = random.Random(seed)
+    cost = (lambda: float(rng.randint(1, 3))) if integer else (lambda: 1.0 + 2.0 * rng.random())
+    for r in range(side):
+        for c in range(side):
+            i = r * side + c
+            if c + 1 < side:
+                yield i, i + 1, cost()
+            if r + 1 < side:
+                yield i, i + side, cost()
+
+def grid_graph(side, seed=1, integer=False):
+    builder = csr_graph.GraphBuilder(weighted=True)
+    for i in range(side * side):
+        builder.add_node(i)
+    for u, v, cost in grid_edges(side, seed, integer):
+        builder.add_edge(u, v, cost)
+    return builder.build()
+
+def dict_graph(graph):
+    # the scripts' old representation: node -> list of (neighbor, cost)
+    return {u: list(graph.edges(u)) for u in range(len(graph))}
+
+def random_graph(n, degree=4, seed=1, weighted=False):
+    # n nodes, n * degree / 2 undirected edges between random nodes
+    # (costs 1..3 when weighted)
+    rng = random.Random(seed)
+    builder = csr_graph.GraphBuilder(weighted=weighted)
+    for i in range(n):
+        builder.add_node(i)
+    for _ in range(n * degree // 2):
+        builder.add_edge(rng.randrange(n), rng.randrange(n), 1.0 + 2.0 * rng.random())
+    return builder.build()
+
+def chain_graph(n):
+    # 0 - 1 - ... - n-1: depth n-1 for the depth-first searches
+    builder = csr_graph.GraphBuilder(weighted=False)
+    for i in range(n):
+        builder.add_node(i)
+    for i in range(n - 1):
+        builder.add_edge(i, i + 1)
+    return builder.build()
+
+def tree_graph(depth):
+    # complete binary tree, node i has children 2i+1 and 2i+2; the last
+    # leaf is only found in the final IDS iteration, after everything else
+    builder = csr_graph.GraphBuilder(weighted=False, directed=True)
+    n = 2 ** (depth + 1) - 1
+    for i in range(n):
+        builder.add_node(i)
+    for i in range((n - 1) // 2):
+        builder.add_edge(i, 2 * i + 1)
+        builder.add_edge(i, 2 * i + 2)
+    return builder.build()
+
+def plain_graph(graph):
+    # node -> list of neighbours, as the old scripts built it
+    return {u: list(graph.neighbors(u)) for u in range(len(graph))}
+
+def manhattan(side, goal):
+    gr, gc = divmod(goal, side)
+    return [abs(i // side - gr) + abs(i % side - gc) for i in range(side * side)]
+
+# -----------------------------
+# Original implementations (reference)
+# -----------------------------
+def legacy_a_star(graph, heuristic, start, goal):
+    # A-star.py before graph_search: min() over a list, counted
+    open_list = [(start, 0)]
+    parent = {start: None}
+    g = {start: 0}
+    expanded = 0
+    while open_list:
+        current = min(open_list, key=lambda x: g[x[0]] + heuristic[x[0]])
+        open_list.remove(current)
+        node = current[0]
+        if node == goal:
+            break
+        expanded += 1
+        for neighbor, cost in graph.get(node, []):
+            new_g = g[node] + cost
+            if neighbor not in g or new_g < g[neighbor]:
+                g[neighbor] = new_g
+                parent[neighbor] = node
+                open_list.append((neighbor, new_g))
+    return g[goal], expanded
+
+def legacy_dfs(graph, start_node, visited=None):
+    # dfs.py before graph_search: recursion, a visited list, sorting per visit
+    if visited is None:
+        visited = []
+    if start_node not in visited:
+        visited.append(start_node)
+        for neighbor in sorted(graph[start_node]):
+            legacy_dfs(graph, neighbor, visited)
+    return visited
+
+def legacy_dls(graph, start, goal, limit, visited=None):
+    # IDS.py before graph_search: recursion and [node] + path
+    if visited is None:
+        visited = set()
+    if limit < 0:
+        return None
+    if start == goal:
+        return [start]
+    visited.add(start)
+    for neighbor in graph.get(start, []):
+        if neighbor not in visited:
+            path = legacy_dls(graph, neighbor, goal, limit - 1, visited)
+            if path:
+                return [start] + path
+    visited.remove(start)
+    return None
+
+def legacy_ids(graph, start, goal, max_depth):
+    for depth in range(max_depth + 1):
+        path = legacy_dls(graph, start, goal, depth)
+        if path:
+            return path
+    return None
+
+def legacy_best_first(graph, start, goal, heuristic):
+    # BFS(best first).py before graph_search: queue.PriorityQueue, a node
+    # queued again by every parent; (path length, expanded)
+    frontier = PriorityQueue()
+    frontier.put((heuristic[start], start))
+    visited = set()
+    parent = {start: None}
+    expanded = 0
+    while not frontier.empty():
+        _, current = frontier.get()
+        if current in visited:
+            continue
+        visited.add(current)
+        if current == goal:
+            return len(graph_search.build_path(parent, goal)) - 1, expanded
+        expanded += 1
+        for neighbor in graph.get(current, []):
+            if neighbor not in visited:
+                parent[neighbor] = current
+                frontier.put((heuristic[neighbor], neighbor))
+    return None, expanded
+
+def legacy_beam(graph, start, goal, heuristic, beam_width):
+    # Beam Search.py before graph_search: drain a PriorityQueue per level,
+    # a node generated once is blocked for good; (path length, expanded)
+    frontier = PriorityQueue()
+    frontier.put((heuristic[start], start))
+    parent = {start: None}
+    expanded = 0
+    while not frontier.empty():
+        current_level = []
+        while not frontier.empty():
+            current_level.append(frontier.get())
+        current_level = current_level[:beam_width]
+        for _, current in current_level:
+            if current == goal:
+                return len(graph_search.build_path(parent, goal)) - 1, expanded
+            expanded += 1
+            for neighbor in graph.get(current, []):
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    frontier.put((heuristic[neighbor], neighbor))
+    return None, expanded
+
+def alternating_bidirectional(graph, start, goal):
+    # bidirectional_search() before frontier balancing: one node from each
+    # side in turn, stop at the first meeting; (path length, expanded)
+    if start == goal:
+        return 0, 0
+    parent_start, queue_start = {start: None}, deque([start])
+    parent_goal, queue_goal = {goal: None}, deque([goal])
+    expanded = 0
+    while queue_start and queue_goal:
+        for queue, parent, other in ((queue_start, parent_start, parent_goal),
+                                     (queue_goal, parent_goal, parent_start)):
+            if not queue:
+                continue
+            current = queue.popleft()
+            expanded += 1
+            for neighbor in graph.neighbors(current):
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+                    if neighbor in other:
+                        return len(graph_search.join_paths(parent_start, parent_goal, neighbor)) - 1, expanded
+    return None, expanded
+
+def bfs_to_goal(graph, start, goal):
+    # one-directional BFS that stops at the goal; (path length, expanded)
+    depth = {start: 0}
+    queue = deque([start])
+    expanded = 0
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            return depth[current], expanded
+        expanded += 1
+        for neighbor in graph.neighbors(current):
+            if neighbor not in depth:
+                depth[neighbor] = depth[current] + 1
+                queue.append(neighbor)
+    return None, expanded
+
+# -----------------------------
+# Runs
+# -----------------------------
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def bench_a_star(side, legacy_max):
+    graph = grid_graph(side)
+    edges = graph.edge_count
+    start, goal = 0, side * side - 1
+    heuristic = manhattan(side, goal)
+    (path, cost), secs = timed(graph_search.a_star, graph, heuristic, start, goal)
+    stats = dict(graph_search.search_stats)
+    print(f"grid {side}x{side} ({side * side} nodes, {edges} edges)")
+    print(f"  heap A*    cost {cost:10.2f}  expanded {stats['expanded']:>8}  generated {stats['generated']:>8}  "
+          f"{secs:8.3f}s  {stats['expanded'] / secs:>9.0f} expansions/s")
+    if side * side <= legacy_max:
+        (old_cost, old_expanded), old_secs = timed(legacy_a_star, dict_graph(graph), heuristic, start, goal)
+        print(f"  legacy A*  cost {old_cost:10.2f}  expanded {old_expanded:>8}  generated        -  "
+              f"{old_secs:8.3f}s  {old_expanded / old_secs:>9.0f} expansions/s")
+    else:
+        print(f"  legacy A*  skipped (more than --legacy-max {legacy_max} nodes)")
+
+def run_legacy(fn, *args):
+    # "RecursionError" instead of a result when the old recursion gives up
+    try:
+        result, secs = timed(fn, *args)
+    except RecursionError:
+        return None, None
+    return result, secs
+
+def legacy_line(label, secs, extra=""):
+    if secs is None:
+        return f"  {label:<10} RecursionError"
+    return f"  {label:<10} {secs:8.3f}s{extra}"
+
+def bench_depth_first(n, chain, tree_depth, legacy_max):
+    graph = random_graph(n)
+    order, secs = timed(graph_search.dfs, graph.sorted_adjacency(), 0)
+    print(f"DFS random graph ({n} nodes, {graph.edge_count} edges)")
+    print(f"  iterative  {secs:8.3f}s  {len(order)} nodes  {len(order) / secs:>9.0f} nodes/s")
+    if n <= legacy_max:
+        old, old_secs = run_legacy(legacy_dfs, plain_graph(graph), 0)
+        print(legacy_line("legacy", old_secs, f"  {len(old)} nodes  {len(old) / old_secs:>9.0f} nodes/s" if old else ""))
+    else:
+        print(f"  legacy     skipped (more than --legacy-max {legacy_max} nodes)")
+
+    graph = chain_graph(chain)
+    path, secs = timed(graph_search.depth_limited_search, graph, 0, chain - 1, chain)
+    print(f"DLS chain of {chain} nodes, depth limit {chain}")
+    print(f"  iterative  {secs:8.3f}s  path of {len(path)} nodes")
+    _, old_secs = run_legacy(legacy_dls, plain_graph(graph), 0, chain - 1, chain)
+    print(legacy_line("legacy", old_secs))
+
+    graph = tree_graph(tree_depth)
+    goal = len(graph) - 1
+    path, secs = timed(graph_search.iterative_deepening_search, graph, 0, goal, tree_depth)
+    visits = graph_search.search_stats["generated"]
+    print(f"IDS binary tree of depth {tree_depth} ({len(graph)} nodes), goal the last leaf")
+    print(f"  iterative  {secs:8.3f}s  {visits} visits  {visits / secs:>9.0f} visits/s")
+    _, old_secs = run_legacy(legacy_ids, plain_graph(graph), 0, goal, tree_depth)
+    print(legacy_line("legacy", old_secs, f"  {visits / old_secs:>9.0f} visits/s" if old_secs else ""))
+
+def iteration_summary(iterations):
+    # "limit: expanded" for the first and last few passes
+    parts = [f"{limit:g}:{expanded}" for limit, expanded, _ in iterations]
+    if len(parts) > 8:
+        parts = parts[:4] + ["..."] + parts[-3:]
+    return " ".join(parts)
+
+def bench_deepening(side, path_side):
+    # IDS with and without revisit pruning against BFS, IDA* against A*
+    graph = grid_graph(side)
+    goal = side * side - 1
+    graph_search.bfs(graph, 0)
+    bfs_expanded = graph_search.search_stats["expanded"]
+    print(f"IDS grid {side}x{side}, corner to corner (BFS expands {bfs_expanded})")
+    path, secs = timed(graph_search.iterative_deepening_search, graph, 0, goal, 4 * side, None, None, True)
+    stats = graph_search.search_stats
+    print(f"  pruned     {secs:8.3f}s  depth {len(path) - 1}  expanded {stats['expanded']:>9}  "
+          f"({stats['expanded'] / bfs_expanded:.0f}x BFS)  per limit {iteration_summary(stats['iterations'])}")
+    small = grid_graph(path_side)
+    path, secs = timed(graph_search.iterative_deepening_search, small, 0, path_side * path_side - 1, 4 * path_side)
+    stats = graph_search.search_stats
+    print(f"  per path   {secs:8.3f}s  depth {len(path) - 1}  expanded {stats['expanded']:>9}  "
+          f"on a {path_side}x{path_side} grid only (exponential)")
+    # a goal that cannot be reached: the search stops once nothing is cut off
+    builder = csr_graph.GraphBuilder(weighted=False)
+    for i in range(side + 1):
+        builder.add_node(i)
+    for i in range(side - 1):
+        builder.add_edge(i, i + 1)
+    chain = builder.build()
+    _, secs = timed(graph_search.iterative_deepening_search, chain, 0, side, 10 * side, None, None, True)
+    print(f"  unreachable goal, chain of {side}: stopped after {len(graph_search.search_stats['iterations'])} "
+          f"of {10 * side + 1} limits, {secs:.3f}s")
+
+    graph = grid_graph(side, integer=True)
+    heuristic = manhattan(side, goal)
+    (_, cost), secs = timed(graph_search.a_star, graph, heuristic, 0, goal)
+    print(f"IDA* grid {side}x{side}, integer costs 1..3")
+    print(f"  A*         {secs:8.3f}s  cost {cost:g}  expanded {graph_search.search_stats['expanded']:>9}")
+    (_, cost), secs = timed(graph_search.ida_star, graph, heuristic, 0, goal)
+    stats = graph_search.search_stats
+    print(f"  IDA*       {secs:8.3f}s  cost {cost:g}  expanded {stats['expanded']:>9}  "
+          f"{len(stats['iterations'])} bounds  per bound {iteration_summary(stats['iterations'])}")
+
+def bench_bidirectional(n, side, queries, seed=3):
+    # expansions of the bidirectional searches against one-directional
+    # search, summed over random start/goal pairs
+    rng = random.Random(seed)
+    graph = random_graph(n)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(queries)]
+    print(f"bidirectional BFS, random graph ({n} nodes, {graph.edge_count} edges), {queries} queries")
+    rows = [("BFS", lambda s, t: bfs_to_goal(graph, s, t)),
+            ("alternating", lambda s, t: alternating_bidirectional(graph, s, t)),
+            ("balanced", lambda s, t: balanced_length(graph, s, t))]
+    shortest = None
+    for label, run in rows:
+        expanded = longer = 0
+        begin = time.perf_counter()
+        lengths = []
+        for s, t in pairs:
+            length, count = run(s, t)
+            lengths.append(length)
+            expanded += count
+        secs = time.perf_counter() - begin
+        if shortest is None:
+            shortest = lengths
+        longer = sum(1 for a, b in zip(lengths, shortest) if a != b)
+        print(f"  {label:<12} {secs:8.3f}s  expanded {expanded:>10}  {expanded / queries:>10.0f} per query  "
+              f"{longer} paths longer than BFS")
+
+    for name, graph, heuristic, to_start, pairs in weighted_cases(n, side, queries, rng):
+        print(f"{name}, {queries} queries")
+        rows = [("A*" if heuristic else "Dijkstra",
+                 lambda s, t: graph_search.a_star(graph, heuristic(t) if heuristic else [0] * len(graph), s, t)),
+                ("bidirectional", lambda s, t: graph_search.bidirectional_a_star(
+                    graph, s, t, heuristic(t) if heuristic else None, to_start(s) if to_start else None))]
+        costs = None
+        for label, run in rows:
+            expanded = 0
+            begin = time.perf_counter()
+            found = []
+            for s, t in pairs:
+                found.append(run(s, t)[1])
+                expanded += graph_search.search_stats["expanded"]
+            secs = time.perf_counter() - begin
+            if costs is None:
+                costs = found
+            wrong = sum(1 for a, b in zip(found, costs) if abs(a - b) > 1e-9)
+            print(f"  {label:<14} {secs:8.3f}s  expanded {expanded:>10}  {expanded / queries:>10.0f} per query  "
+                  f"{wrong} costs differ")
+
+def balanced_length(graph, start, goal):
+    path = graph_search.bidirectional_search(graph, start, goal)
+    return (len(path) - 1 if path else None), graph_search.search_stats["expanded"]
+
+def weighted_cases(n, side, queries, rng):
+    # (title, graph, heuristic(goal) or None, heuristic_to_start(start) or None, pairs)
+    graph = random_graph(n, weighted=True)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(queries)]
+    yield f"bidirectional Dijkstra, weighted random graph ({n} nodes)", graph, None, None, pairs
+    graph = grid_graph(side)
+    pairs = [(rng.randrange(side * side), rng.randrange(side * side)) for _ in range(queries)]
+    yield f"bidirectional Dijkstra, grid {side}x{side}", graph, None, None, pairs
+    yield (f"bidirectional A*, grid {side}x{side}, manhattan", graph,
+           lambda t: manhattan(side, t), lambda s: manhattan(side, s), pairs)
+
+def hop_distances(graph, goal):
+    # BFS depth of every node from the goal (None if unreachable)
+    depth = [None] * len(graph)
+    depth[goal] = 0
+    queue = deque([goal])
+    while queue:
+        u = queue.popleft()
+        for v in graph.neighbors(u):
+            if depth[v] is None:
+                depth[v] = depth[u] + 1
+                queue.append(v)
+    return depth
+
+def heuristic_cases(side, n, noise=20.0, seed=4):
+    # (title, graph, start, goal, heuristic): a grid with manhattan distance
+    # and a random graph with hop distance to the goal, each plus random
+    # noise (0..noise) so the greedy searches have to back up
+    rng = random.Random(seed)
+    graph = grid_graph(side)
+    goal = side * side - 1
+    heuristic = [d + noise * rng.random() for d in manhattan(side, goal)]
+    yield f"grid {side}x{side}, manhattan + noise", graph, 0, goal, heuristic
+    graph = random_graph(n, seed=seed)
+    hops = hop_distances(graph, 0)
+    start = max(range(n), key=lambda u: -1 if hops[u] is None else hops[u])
+    heuristic = [n if d is None else d + noise * rng.random() for d in hops]
+    yield f"random graph {n} nodes, hop distance + noise", graph, start, 0, heuristic
+
+def bench_heuristic(side, n, widths, legacy_max):
+    # greedy best-first and beam search against the PriorityQueue versions
+    for title, graph, start, goal, heuristic in heuristic_cases(side, n):
+        print(f"{title} ({len(graph)} nodes, {graph.edge_count} edges)")
+        plain = plain_graph(graph) if len(graph) <= legacy_max else None
+        runs = [("best-first", graph_search.best_first_search, (), legacy_best_first)]
+        runs += [(f"beam k={k}", graph_search.beam_search, (k,), legacy_beam) for k in widths]
+        for label, fn, extra, legacy in runs:
+            path, secs = timed(fn, graph, start, goal, heuristic, *extra)
+            stats = graph_search.search_stats
+            length = len(path) - 1 if path else None
+            print(f"  {label:<12} {secs:8.3f}s  length {length!s:>6}  expanded {stats['expanded']:>8}  "
+                  f"generated {stats['generated']:>8}  {stats['expanded'] / secs:>9.0f} expansions/s")
+            if plain is not None:
+                (length, expanded), secs = timed(legacy, plain, start, goal, heuristic, *extra)
+                print(f"    legacy     {secs:8.3f}s  length {length!s:>6}  expanded {expanded:>8}  "
+                      f"{'':>18}  {expanded / secs:>9.0f} expansions/s")
+
+def write_edge_file(path, edges, seed=1):
+    # random graph with road-like degree: `edges` weighted edges over edges / 2 nodes
+    rng = random.Random(seed)
+    n = max(2, edges // 2)
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(edges):
+            f.write(f"n{rng.randrange(n)}\tn{rng.randrange(n)}\t{rng.randint(1, 100)}\n")
+
+def dict_bytes_per_edge(edges):
+    # traced size of the old dict-of-lists graph (string names, (v, cost) tuples)
+    rng = random.Random(2)
+    n = max(2, edges // 2)
+    rows = [(f"n{rng.randrange(n)}", f"n{rng.randrange(n)}", float(rng.randint(1, 100))) for _ in range(edges)]
+    tracemalloc.start()
+    graph = {}
+    for u, v, w in rows:
+        graph.setdefault(u, []).append((v, w))
+        graph.setdefault(v, []).append((u, w))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / (2 * edges)
+
+def bench_load(edges):
+    folder = tempfile.mkdtemp()
+    text_path = os.path.join(folder, "edges.tsv")
+    bin_path = os.path.join(folder, "edges.csr")
+    write_edge_file(text_path, edges)
+    text_mb = os.path.getsize(text_path) / 1e6
+    graph, secs = timed(csr_graph.load_edges, text_path)
+    m = graph.edge_count
+    print(f"edge list {edges} edges, {len(graph)} nodes, {text_mb:.0f} MB text")
+    print(f"  parse + build   {secs:8.2f}s  {edges / secs:>10.0f} edges/s")
+    print(f"  CSR buffers     {graph.nbytes() / 1e6:8.1f} MB  {graph.nbytes() / m:5.1f} bytes per directed edge"
+          f"  (+ names {graph.names_nbytes() / 1e6:.1f} MB)")
+    print(f"  dict of lists   {dict_bytes_per_edge(min(edges, 200000)):5.1f} bytes per directed edge (sampled)")
+    _, secs = timed(graph.save, bin_path)
+    print(f"  save .csr       {secs:8.2f}s  {os.path.getsize(bin_path) / 1e6:.0f} MB")
+    del graph
+    for use_mmap in (True, False):
+        loaded, secs = timed(csr_graph.load, bin_path, use_mmap)
+        (order, bfs_secs) = timed(graph_search.bfs, loaded, 0)
+        print(f"  load .csr {'mmap' if use_mmap else 'read':<5} {secs:8.2f}s  then BFS over {len(order)} nodes {bfs_secs:.2f}s")
+        del order
+        loaded.close()
+    os.remove(text_path)
+    os.remove(bin_path)
+    os.rmdir(folder)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark graph_search on synthetic graphs")
+    parser.add_argument("--grid", default="30,100,300", help="grid sides, comma separated")
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="run the original functions only up to this many nodes")
+    parser.add_argument("--load", type=int, default=1000000,
+                        help="edges in the csr_graph loading benchmark (0 skips it)")
+    parser.add_argument("--dfs", type=int, default=100000, help="nodes in the DFS benchmark graph")
+    parser.add_argument("--chain", type=int, default=10000, help="length of the DLS chain (legacy recursion fails)")
+    parser.add_argument("--tree", type=int, default=16, help="depth of the IDS binary tree")
+    parser.add_argument("--ids", type=int, default=30, help="grid side for the IDS / IDA* benchmark (0 skips it)")
+    parser.add_argument("--bidir", type=int, default=100000,
+                        help="nodes in the bidirectional search random graphs (0 skips it)")
+    parser.add_argument("--bidir-grid", type=int, default=300, help="grid side for bidirectional Dijkstra / A*")
+    parser.add_argument("--queries", type=int, default=20, help="start/goal pairs per bidirectional case")
+    parser.add_argument("--greedy", type=int, default=300,
+                        help="grid side for best-first / beam search (0 skips it)")
+    parser.add_argument("--greedy-nodes", type=int, default=100000,
+                        help="nodes in the best-first / beam search random graph")
+    parser.add_argument("--beam", default="10,100", help="beam widths, comma separated")
+    args = parser.parse_args()
+    for side in (int(x) for x in args.grid.split(",") if x):
+        bench_a_star(side, args.legacy_max)
+    if args.dfs:
+        bench_depth_first(args.dfs, args.chain, args.tree, args.legacy_max)
+    if args.ids:
+        bench_deepening(args.ids, 5)
+    if args.bidir:
+        bench_bidirectional(args.bidir, args.bidir_grid, args.queries)
+    if args.greedy:
+        bench_heuristic(args.greedy, args.greedy_nodes, [int(k) for k in args.beam.split(",") if k],
+                        args.legacy_max)
+    if args.load:
+        bench_load(args.load)
+
+if __name__ == "__main__":
+    main()